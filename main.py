@@ -14,6 +14,7 @@ import appdirs
 import threading
 import time
 import platform
+import multiprocessing
 from src.utils.subprocess_utils import run_hidden
 from src.ui.app import PrintManagementApp
 from src.config import AppConfig
@@ -207,4 +208,6 @@ def main():
             input("Pressione ENTER para fechar...")
 
 if __name__ == "__main__":
+    # Necessário para o pool de rasterização (processos spawn) no executável congelado
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -334,7 +334,7 @@ elif current_platform == "linux":
 all_hiddenimports = list(set(all_hiddenimports + pyipp_hiddenimports + aiohttp_hiddenimports + wx_hiddenimports))
 
 # Módulos a excluir para reduzir tamanho
-excludes = ['tkinter', 'matplotlib', 'numpy', 'pandas', 'scipy', 'jupyter']
+excludes = ['tkinter', 'matplotlib', 'pandas', 'scipy', 'jupyter']
 
 # Exclusões específicas por plataforma
 if current_platform == "darwin":
@@ -415,6 +415,7 @@ install_requires = [
     "appdirs>=1.4.4",
     "pyyaml>=6.0.1",
     "pillow>=10.0.1",
+    "numpy>=1.24.0",  # Codificadores PWG Raster/URF
     "watchdog>=3.0.0",
     "pyipp>=0.11.0",
     "aiohttp>=3.8.0",
@@ -360,7 +360,7 @@ a = Analysis(
     hookspath=['hooks'],
     hooksconfig={{}},
     runtime_hooks=['hooks/runtime_hook.py'],
-    excludes=['tkinter', 'matplotlib', 'numpy', 'pandas'],
+    excludes=['tkinter', 'matplotlib', 'pandas'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -394,6 +394,7 @@ install_requires = [
     "appdirs>=1.4.4",
     "pyyaml>=6.0.1",
     "pillow>=10.0.1",
+    "numpy>=1.24.0",  # Codificadores PWG Raster/URF
     "watchdog>=3.0.0",
     "pyipp>=0.11.0",
     "aiohttp>=3.8.0",
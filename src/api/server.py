@@ -27,7 +27,7 @@ from src.models.document import Document
 from src.models.printer import Printer
 from src.config import AppConfig
 from src.utils.file_monitor import FileMonitor
-from src.utils.print_system import PrintSystem, PrintOptions, ColorMode, Duplex, Quality, PrintQueueManager
+from src.utils.print_system import PrintSystem, PrintOptions, ColorMode, Duplex, Quality, PrintQueueManager, parse_page_ranges
 from src.utils.pdf import PDFUtils
 
 # Configuração de logging
@@ -89,6 +89,7 @@ class PrintServerAPI:
         self.flask_app.add_url_rule('/api/print/queue', 'get_print_queue', self.get_print_queue, methods=['GET'])
         self.flask_app.add_url_rule('/api/print/job/<job_id>', 'get_print_job', self.get_print_job, methods=['GET'])
         self.flask_app.add_url_rule('/api/print/cancel/<job_id>', 'cancel_print_job', self.cancel_print_job, methods=['POST'])
+        self.flask_app.add_url_rule('/api/print/resume/<job_id>', 'resume_print_job', self.resume_print_job, methods=['POST'])
     
     def get_documents(self):
         """
@@ -457,6 +458,17 @@ class PrintServerAPI:
             if 'dpi' in data:
                 options.dpi = int(data['dpi'])
             
+            if data.get('page_ranges'):
+                # Ex.: "3-4,10"; só as páginas escolhidas são rasterizadas/enviadas
+                try:
+                    parse_page_ranges(str(data['page_ranges']))
+                except ValueError as e:
+                    return jsonify({
+                        "success": False,
+                        "error": str(e)
+                    }), 400
+                options.page_ranges = str(data['page_ranges'])
+            
             # Cria um ID único para o trabalho
             job_id = f"job_{int(datetime.now().timestamp())}_{document.id}"
             
@@ -530,10 +542,15 @@ class PrintServerAPI:
             if current_job:
                 current_job_info = current_job["info"].to_dict()
             
+            # Um trabalho em andamento por impressora
+            current_jobs = [job["info"].to_dict() for job in queue_manager.get_current_jobs()]
+            
             return jsonify({
                 "success": True,
                 "queue_size": queue_manager.get_queue_size(),
                 "current_job": current_job_info,
+                "current_jobs": current_jobs,
+                "printer_queues": queue_manager.get_lane_status(),
                 "job_history": job_history
             })
         except Exception as e:
@@ -619,6 +636,31 @@ class PrintServerAPI:
                 "error": str(e)
             }), 500
     
+    def resume_print_job(self, job_id):
+        """Retoma um trabalho interrompido, reenviando apenas as páginas que faltam"""
+        try:
+            queue_manager = PrintQueueManager.get_instance()
+            queue_manager.set_config(self.app_config)
+            
+            success, message = queue_manager.resume_job(job_id)
+            if not success:
+                return jsonify({
+                    "success": False,
+                    "error": message
+                }), 400
+            
+            return jsonify({
+                "success": True,
+                "job_id": job_id,
+                "message": message
+            })
+        except Exception as e:
+            logger.error(f"Erro ao retomar trabalho: {e}")
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 500
+    
     def start(self, initial_port=50000, max_attempts=100):
         """
         Inicia o servidor na porta especificada ou na próxima disponível
@@ -52,7 +52,42 @@ class AppConfig:
                 "jpg_quality": 85,
                 "max_dpi": 200,
                 "retry_attempts": 2,
-                "batch_processing": True
+                "batch_processing": True,
+                "stream_documents": True,
+                "stream_chunk_size_kb": 64,
+                "chunked_transfer": True,
+                "keep_alive_idle_timeout": 20,
+                "connection_pool_size": 4,
+                "multi_document_jobs": True,
+                "pipeline_window_pages": 2,
+                "pipeline_queue_depth": 4,
+                "page_memory_budget_mb": 256,
+                "page_cache_enabled": True,
+                "page_cache_max_mb": 512,
+                "printer_profile_ttl_hours": 24,
+                "validate_job": False,
+                "raster_format": "auto",
+                "track_printer_jobs": True,
+                "job_tracking_poll_interval": 1.0,
+                "adaptive_pacing": True,
+                "discovery_grace": 0.3,
+                "discovery_max_parallel": 4,
+                "max_concurrent_rasterizations": 2,
+                "printer_lane_idle_timeout": 60,
+                "durable_queue": True,
+                "raster_process_pool": True,
+                "raster_workers": 0,
+                "rasterizer": "auto",
+                "ghostscript_rendering_threads": 0,
+                "postscript_fast_path": True,
+                "poppler_stdout_streaming": True,
+                "skip_blank_pages": False,
+                "blank_page_ink_threshold": 0.0001,
+                "auto_grayscale_pages": True,
+                "grayscale_color_threshold": 0.0002,
+                "adaptive_jpeg_quality": True,
+                "page_transfer_seconds": 10.0,
+                "min_jpeg_quality": 40
             }
         }
 
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Detecção de páginas em branco no raster decodificado (antes da codificação e do envio)
+"""
+
+import logging
+
+from src.utils import raster_encoders
+
+logger = logging.getLogger("PrintManagementSystem.Utils.BlankPages")
+
+# Dados "codificados" de uma página em branco: a página não é enviada
+BLANK_PAGE = b""
+
+# Lado maior da amostra reduzida em que a tinta é medida
+SAMPLE_SIDE = 512
+
+# Um pixel da amostra conta como tinta quando é mais escuro que este nível (0-255).
+# A redução tira a média dos pixels: um traço fino de 1 px ainda fica abaixo dele.
+INK_LEVEL = 224
+
+
+def sample_pixels(image):
+    """
+    Pixels (array NumPy L ou RGB) de uma amostra reduzida da página
+
+    A redução tira a média de blocos (Image.reduce), de modo que o custo das
+    medições não depende do DPI.
+    """
+    np = raster_encoders._get_numpy()
+
+    factor = max(1, max(image.size) // SAMPLE_SIDE)
+    sample = image.reduce(factor) if factor > 1 else image
+    if sample.mode not in ("L", "RGB"):
+        sample = sample.convert("RGB")
+    return np.asarray(sample)
+
+
+def ink_coverage(image) -> float:
+    """
+    Fração da página coberta de tinta (0.0 a 1.0)
+
+    A tinta colorida conta pelo canal mais escuro (amarelo puro não some
+    como aconteceria na conversão para cinza).
+    """
+    np = raster_encoders._get_numpy()
+
+    pixels = sample_pixels(image)
+    if pixels.ndim == 3:
+        pixels = pixels.min(axis=2)
+    return np.count_nonzero(pixels < INK_LEVEL) / pixels.size
+
+
+def is_blank_page(image, threshold: float) -> bool:
+    """Indica se a tinta da página fica abaixo do limite (fração da página)"""
+    return ink_coverage(image) < threshold
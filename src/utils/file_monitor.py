@@ -200,6 +200,11 @@ class PDFHandler(FileSystemEventHandler):
 class FileMonitor:
     """Monitor para arquivos PDF em um diretório"""
     
+    # Arquivos já impressos por outro caminho (ver mark_as_printed)
+    _printed_paths = {}
+    _printed_lock = threading.Lock()
+    PRINTED_TTL = 600
+    
     def __init__(self, config, on_documents_changed=None):
         """
         Inicializa o monitor de arquivos
@@ -583,146 +588,199 @@ class FileMonitor:
         if not self.config.get("auto_print", False):
             return False
         
+        if self.was_printed(document.path):
+            logger.info(f"Auto-impressão ignorada: {document.name} já foi impresso pela impressora virtual")
+            return False
+        
         try:
-            # Obtém a impressora padrão
-            default_printer_name = self.config.get("default_printer", "")
-            if not default_printer_name:
-                logger.warning("Auto-impressão: Nenhuma impressora padrão configurada")
-                return False
-            
-            # Obtém a lista de impressoras
-            printers = self.config.get_printers()
-            if not printers:
-                logger.warning("Auto-impressão: Nenhuma impressora configurada")
+            target = self.get_auto_print_target(self.config)
+            if target is None:
                 return False
-            
-            # Encontra a impressora padrão
-            printer = None
-            for p in printers:
-                if p.get('name') == default_printer_name:
-                    from src.models.printer import Printer
-                    printer = Printer(p)
-                    break
-            
-            if not printer:
-                logger.warning(f"Auto-impressão: Impressora padrão '{default_printer_name}' não encontrada")
-                return False
-            
-            # Obtém as opções de impressão
-            options_dict = self.config.get("auto_print_options", {})
-            
-            from src.utils.print_system import PrintOptions, ColorMode, Duplex, Quality
-            
-            # Converte as opções para objetos
-            options = PrintOptions()
-            
-            # Modo de cor
-            color_mode = options_dict.get("color_mode", "auto")
-            if color_mode == "color":
-                options.color_mode = ColorMode.COLORIDO
-            elif color_mode == "monochrome":
-                options.color_mode = ColorMode.MONOCROMO
-            else:
-                options.color_mode = ColorMode.AUTO
-            
-            # Duplex
-            duplex = options_dict.get("duplex", "one-sided")
-            if duplex == "two-sided-long-edge":
-                options.duplex = Duplex.DUPLEX_LONGO
-            elif duplex == "two-sided-short-edge":
-                options.duplex = Duplex.DUPLEX_CURTO
-            else:
-                options.duplex = Duplex.SIMPLES
-            
-            # Qualidade
-            quality = options_dict.get("quality", 4)
-            if quality == 3:
-                options.quality = Quality.RASCUNHO
-            elif quality == 5:
-                options.quality = Quality.ALTA
-            else:
-                options.quality = Quality.NORMAL
-            
-            # Orientação
-            orientation = options_dict.get("orientation", "portrait")
-            options.orientation = orientation
-            
-            # Cópias
-            options.copies = options_dict.get("copies", 1)
-            
-            # Inicializa o sistema de impressão
-            from src.utils.print_system import PrintSystem
-            print_system = PrintSystem(self.config)
-            
-            # Configura o trabalho de impressão
-            import time
-            from datetime import datetime
-            from src.utils.print_system import IPPPrinter, PrintJobInfo
+            printer, options = target
             
             # Cria um ID único para o trabalho
             timestamp = int(time.time() * 1000)
             file_hash = self._get_file_hash(document.path) or "unknown"
             job_id = f"auto_{timestamp}_{file_hash[:8]}_{document.id}"
             
-            # CORREÇÃO: Usa printer.id diretamente como na impressão manual
-            job_info = PrintJobInfo(
-                job_id=job_id,
-                document_path=document.path,
-                document_name=document.name,
-                printer_name=printer.name,
-                printer_id=printer.id,  # CORREÇÃO: Usa o ID da API diretamente
-                printer_ip=getattr(printer, 'ip', ''),
-                options=options,
-                start_time=datetime.now(),
-                status="pending"
-            )
-            
-            # Cria instância da impressora
-            printer_ip = getattr(printer, 'ip', '')
-            if not printer_ip:
-                logger.error(f"Auto-impressão: A impressora '{printer.name}' não possui um endereço IP configurado")
-                return False
-            
-            # CORREÇÃO: Adiciona use_https=False como na impressão manual
-            printer_instance = IPPPrinter(
-                printer_ip=printer_ip,
-                port=631,
-                use_https=False  # Deixa detectar automaticamente
-            )
-            
-            # CORREÇÃO: Adiciona callback para tratar adequadamente o resultado
-            def auto_print_callback(job_id, status, data):
-                """Callback para auto-impressão"""
-                try:
-                    if status == "complete":
-                        logger.info(f"Auto-impressão concluída com sucesso: {job_info.document_name}")
-                        logger.info(f"Páginas processadas: {data.get('successful_pages', 0)}/{data.get('total_pages', 0)}")
-                    elif status == "canceled":
-                        logger.warning(f"Auto-impressão cancelada: {job_info.document_name}")
-                    elif status == "error":
-                        error_msg = data.get("error", "Erro desconhecido") if isinstance(data, dict) else str(data)
-                        logger.error(f"Erro na auto-impressão de '{job_info.document_name}': {error_msg}")
-                    elif status == "progress":
-                        # Log de progresso mais silencioso para auto-impressão
-                        logger.debug(f"Auto-impressão progresso: {data}")
-                except Exception as e:
-                    logger.error(f"Erro no callback de auto-impressão: {e}")
-            
-            # Adiciona o trabalho à fila
-            print_queue_manager = print_system.print_queue_manager
-            print_queue_manager.add_job(
-                job_info,
-                printer_instance,
-                auto_print_callback  # CORREÇÃO: Agora tem callback
-            )
-            
-            logger.info(f"Auto-impressão: Documento '{document.name}' enviado para impressão")
-            return True
+            return self.submit_auto_print_job(self.config, printer, options, job_id,
+                                              document.path, document.name)
             
         except Exception as e:
             logger.error(f"Erro ao processar auto-impressão: {e}")
             return False
+    
+    @staticmethod
+    def get_auto_print_target(config):
+        """
+        Impressora padrão e opções da auto-impressão
         
+        Returns:
+            tuple: (Printer, PrintOptions) ou None se a auto-impressão não puder ser feita
+        """
+        # Obtém a impressora padrão
+        default_printer_name = config.get("default_printer", "")
+        if not default_printer_name:
+            logger.warning("Auto-impressão: Nenhuma impressora padrão configurada")
+            return None
+        
+        # Obtém a lista de impressoras
+        printers = config.get_printers()
+        if not printers:
+            logger.warning("Auto-impressão: Nenhuma impressora configurada")
+            return None
+        
+        # Encontra a impressora padrão
+        printer = None
+        for p in printers:
+            if p.get('name') == default_printer_name:
+                from src.models.printer import Printer
+                printer = Printer(p)
+                break
+        
+        if not printer:
+            logger.warning(f"Auto-impressão: Impressora padrão '{default_printer_name}' não encontrada")
+            return None
+        
+        if not getattr(printer, 'ip', ''):
+            logger.error(f"Auto-impressão: A impressora '{printer.name}' não possui um endereço IP configurado")
+            return None
+        
+        # Obtém as opções de impressão
+        options_dict = config.get("auto_print_options", {})
+        
+        from src.utils.print_system import PrintOptions, ColorMode, Duplex, Quality
+        
+        # Converte as opções para objetos
+        options = PrintOptions()
+        
+        # Modo de cor
+        color_mode = options_dict.get("color_mode", "auto")
+        if color_mode == "color":
+            options.color_mode = ColorMode.COLORIDO
+        elif color_mode == "monochrome":
+            options.color_mode = ColorMode.MONOCROMO
+        else:
+            options.color_mode = ColorMode.AUTO
+        
+        # Duplex
+        duplex = options_dict.get("duplex", "one-sided")
+        if duplex == "two-sided-long-edge":
+            options.duplex = Duplex.DUPLEX_LONGO
+        elif duplex == "two-sided-short-edge":
+            options.duplex = Duplex.DUPLEX_CURTO
+        else:
+            options.duplex = Duplex.SIMPLES
+        
+        # Qualidade
+        quality = options_dict.get("quality", 4)
+        if quality == 3:
+            options.quality = Quality.RASCUNHO
+        elif quality == 5:
+            options.quality = Quality.ALTA
+        else:
+            options.quality = Quality.NORMAL
+        
+        # Orientação
+        orientation = options_dict.get("orientation", "portrait")
+        options.orientation = orientation
+        
+        # Cópias
+        options.copies = options_dict.get("copies", 1)
+        
+        return printer, options
+    
+    @staticmethod
+    def submit_auto_print_job(config, printer, options, job_id, document_path, document_name):
+        """
+        Coloca um documento na fila de impressão da auto-impressão
+        
+        Returns:
+            bool: True se o trabalho foi enfileirado
+        """
+        # Inicializa o sistema de impressão
+        from src.utils.print_system import PrintSystem
+        print_system = PrintSystem(config)
+        
+        # Configura o trabalho de impressão
+        from datetime import datetime
+        from src.utils.print_system import IPPPrinter, PrintJobInfo
+        
+        printer_ip = getattr(printer, 'ip', '')
+        
+        # CORREÇÃO: Usa printer.id diretamente como na impressão manual
+        job_info = PrintJobInfo(
+            job_id=job_id,
+            document_path=document_path,
+            document_name=document_name,
+            printer_name=printer.name,
+            printer_id=printer.id,  # CORREÇÃO: Usa o ID da API diretamente
+            printer_ip=printer_ip,
+            options=options,
+            start_time=datetime.now(),
+            status="pending"
+        )
+        
+        # CORREÇÃO: Adiciona use_https=False como na impressão manual
+        printer_instance = IPPPrinter(
+            printer_ip=printer_ip,
+            port=631,
+            use_https=False  # Deixa detectar automaticamente
+        )
+        
+        # CORREÇÃO: Adiciona callback para tratar adequadamente o resultado
+        def auto_print_callback(job_id, status, data):
+            """Callback para auto-impressão"""
+            try:
+                if status == "complete":
+                    logger.info(f"Auto-impressão concluída com sucesso: {job_info.document_name}")
+                    logger.info(f"Páginas processadas: {data.get('successful_pages', 0)}/{data.get('total_pages', 0)}")
+                elif status == "canceled":
+                    logger.warning(f"Auto-impressão cancelada: {job_info.document_name}")
+                elif status == "error":
+                    error_msg = data.get("error", "Erro desconhecido") if isinstance(data, dict) else str(data)
+                    logger.error(f"Erro na auto-impressão de '{job_info.document_name}': {error_msg}")
+                elif status == "progress":
+                    # Log de progresso mais silencioso para auto-impressão
+                    logger.debug(f"Auto-impressão progresso: {data}")
+            except Exception as e:
+                logger.error(f"Erro no callback de auto-impressão: {e}")
+        
+        # Adiciona o trabalho à fila
+        print_queue_manager = print_system.print_queue_manager
+        print_queue_manager.add_job(
+            job_info,
+            printer_instance,
+            auto_print_callback  # CORREÇÃO: Agora tem callback
+        )
+        
+        logger.info(f"Auto-impressão: Documento '{document_name}' enviado para impressão")
+        return True
+    
+    @classmethod
+    def mark_as_printed(cls, filepath):
+        """
+        Registra um arquivo que já foi impresso por outro caminho
+        
+        Usado pela impressora virtual quando o PostScript vai direto para a
+        impressora e o PDF salvo é só o arquivo: a auto-impressão o ignora.
+        Compartilhado entre todas as instâncias do monitor.
+        """
+        key = os.path.normcase(os.path.abspath(filepath))
+        with cls._printed_lock:
+            now = time.time()
+            cls._printed_paths[key] = now
+            for old_key in [k for k, t in cls._printed_paths.items() if now - t > cls.PRINTED_TTL]:
+                del cls._printed_paths[old_key]
+    
+    @classmethod
+    def was_printed(cls, filepath):
+        """Indica se o arquivo foi registrado por mark_as_printed recentemente"""
+        key = os.path.normcase(os.path.abspath(filepath))
+        with cls._printed_lock:
+            marked_at = cls._printed_paths.get(key)
+        return marked_at is not None and time.time() - marked_at <= cls.PRINTED_TTL
+    
     def set_auto_print(self, enabled):
         """
         Define se a auto-impressão está ativada
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pool de conexões HTTP/HTTPS keep-alive por impressora para o cliente IPP
+"""
+
+import ssl
+import time
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger("PrintManagementSystem.Utils.IPPConnectionPool")
+
+
+class ResumableSSLContext(ssl.SSLContext):
+    """
+    Contexto TLS que reaproveita a última sessão negociada (TLS session resumption)
+
+    O urllib3 não repassa o parâmetro ``session`` ao abrir novas conexões, então o
+    contexto guarda a sessão do último handshake e a injeta no próximo, evitando um
+    handshake completo quando uma conexão keep-alive precisa ser reaberta.
+    """
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        session = getattr(self, "_last_session", None)
+        if session is not None and "session" not in kwargs:
+            try:
+                ssl_sock = super().wrap_socket(sock, *args, session=session, **kwargs)
+            except (ValueError, ssl.SSLError) as e:
+                # Sessão expirada ou rejeitada: faz handshake completo
+                logger.debug(f"Sessão TLS não reaproveitada: {e}")
+                self._last_session = None
+                ssl_sock = super().wrap_socket(sock, *args, **kwargs)
+        else:
+            ssl_sock = super().wrap_socket(sock, *args, **kwargs)
+
+        try:
+            if ssl_sock.session is not None:
+                self._last_session = ssl_sock.session
+        except Exception:
+            pass
+
+        return ssl_sock
+
+
+class PrinterHTTPAdapter(HTTPAdapter):
+    """Adaptador HTTP que usa o contexto TLS compartilhado da impressora"""
+
+    def __init__(self, ssl_context, **kwargs):
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+class PrinterConnectionPool:
+    """
+    Sessões HTTP keep-alive compartilhadas por IP de impressora
+
+    Todas as instâncias de IPPPrinter que apontam para o mesmo IP usam a mesma
+    sessão, de modo que páginas, cópias e retentativas reaproveitam a conexão TCP
+    (e a sessão TLS no caso de IPPS). Uma thread de limpeza fecha as conexões
+    ociosas antes que a impressora as derrube.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = PrinterConnectionPool()
+            return cls._instance
+
+    def __init__(self, idle_timeout: float = 20.0, pool_size: int = 4):
+        self.idle_timeout = idle_timeout
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._reaper_thread = None
+        self._stop_event = threading.Event()
+
+    def configure(self, idle_timeout: float = None, pool_size: int = None):
+        """Atualiza os parâmetros do pool (aplicados às novas sessões)"""
+        if idle_timeout is not None:
+            self.idle_timeout = max(1.0, float(idle_timeout))
+        if pool_size is not None:
+            self.pool_size = max(1, int(pool_size))
+
+    def _create_session(self) -> requests.Session:
+        """Cria uma sessão keep-alive com contexto TLS próprio"""
+        ssl_context = ResumableSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+
+        # Apenas falhas de conexão são repetidas aqui (nunca leitura nem status HTTP):
+        # após um timeout de leitura a impressora pode já ter aceitado o Print-Job/
+        # Send-Document, e reenviar aqui imprimiria em dobro. Esses casos ficam
+        # com as tentativas por página
+        retry_strategy = Retry(
+            total=2,
+            connect=2,
+            read=0,
+            status=0,
+            allowed_methods=frozenset(["HEAD", "GET", "POST"]),
+            backoff_factor=0.2
+        )
+
+        adapter = PrinterHTTPAdapter(
+            ssl_context,
+            pool_connections=2,
+            pool_maxsize=self.pool_size,
+            max_retries=retry_strategy
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.verify = False
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+
+    def get_session(self, printer_ip: str) -> requests.Session:
+        """Obtém a sessão compartilhada de uma impressora"""
+        with self._lock:
+            entry = self._sessions.get(printer_ip)
+            if entry is None:
+                entry = {"session": self._create_session(), "last_used": time.monotonic()}
+                self._sessions[printer_ip] = entry
+                logger.debug(f"Sessão keep-alive criada para {printer_ip}")
+            entry["last_used"] = time.monotonic()
+            entry["reaped"] = False
+
+        self._ensure_reaper()
+        return entry["session"]
+
+    def _ensure_reaper(self):
+        """Inicia a thread de limpeza de conexões ociosas se necessário"""
+        if self._reaper_thread and self._reaper_thread.is_alive():
+            return
+
+        with self._lock:
+            if self._reaper_thread and self._reaper_thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._reaper_thread = threading.Thread(target=self._reap_idle_connections, daemon=True)
+            self._reaper_thread.start()
+
+    def _reap_idle_connections(self):
+        """Fecha conexões de sessões ociosas há mais que idle_timeout"""
+        while not self._stop_event.wait(max(1.0, self.idle_timeout / 2)):
+            now = time.monotonic()
+            with self._lock:
+                idle = [(ip, entry) for ip, entry in self._sessions.items()
+                        if not entry.get("reaped") and now - entry["last_used"] > self.idle_timeout]
+
+            for printer_ip, entry in idle:
+                try:
+                    # A sessão continua válida; apenas as conexões ociosas são descartadas
+                    entry["session"].close()
+                    entry["reaped"] = True
+                    logger.debug(f"Conexões ociosas fechadas para {printer_ip}")
+                except Exception as e:
+                    logger.debug(f"Erro ao fechar conexões de {printer_ip}: {e}")
+
+    def close_all(self):
+        """Fecha todas as sessões e para a thread de limpeza"""
+        self._stop_event.set()
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for entry in sessions:
+            try:
+                entry["session"].close()
+            except Exception:
+                pass
+
+        logger.info("Pool de conexões das impressoras encerrado")
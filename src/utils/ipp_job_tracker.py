@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Acompanhamento dos trabalhos na impressora (Get-Job-Attributes / Get-Jobs)
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("PrintManagementSystem.Utils.IPPJobTracker")
+
+# Valores de job-state (RFC 8011)
+JOB_STATE_PENDING = 3
+JOB_STATE_PENDING_HELD = 4
+JOB_STATE_PROCESSING = 5
+JOB_STATE_PROCESSING_STOPPED = 6
+JOB_STATE_CANCELED = 7
+JOB_STATE_ABORTED = 8
+JOB_STATE_COMPLETED = 9
+
+JOB_STATE_NAMES = {
+    JOB_STATE_PENDING: "pending",
+    JOB_STATE_PENDING_HELD: "pending-held",
+    JOB_STATE_PROCESSING: "processing",
+    JOB_STATE_PROCESSING_STOPPED: "processing-stopped",
+    JOB_STATE_CANCELED: "canceled",
+    JOB_STATE_ABORTED: "aborted",
+    JOB_STATE_COMPLETED: "completed",
+}
+
+TERMINAL_STATES = {JOB_STATE_CANCELED, JOB_STATE_ABORTED, JOB_STATE_COMPLETED}
+QUEUED_STATES = {JOB_STATE_PENDING, JOB_STATE_PENDING_HELD}
+
+
+@dataclass
+class TrackedJob:
+    """Estado de um trabalho enviado, conforme informado pela impressora"""
+    printer_ip: str
+    printer_job_id: int
+    local_job_id: Optional[str] = None
+    state: Optional[int] = None
+    state_reasons: List[str] = field(default_factory=list)
+    impressions_completed: int = 0
+    submitted_at: float = field(default_factory=time.monotonic)
+    updated_at: float = 0.0
+    gone: bool = False
+
+    @property
+    def state_name(self) -> str:
+        if self.gone:
+            return "not-found"
+        return JOB_STATE_NAMES.get(self.state, "unknown")
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.gone or self.state in TERMINAL_STATES
+
+    @property
+    def is_queued(self) -> bool:
+        """Ainda não começou a ser processado (ou o estado ainda não é conhecido)"""
+        return not self.is_terminal and (self.state is None or self.state in QUEUED_STATES)
+
+    def to_dict(self) -> Dict:
+        return {
+            "printer_ip": self.printer_ip,
+            "printer_job_id": self.printer_job_id,
+            "job_id": self.local_job_id,
+            "job_state": self.state,
+            "job_state_name": self.state_name,
+            "job_state_reasons": list(self.state_reasons),
+            "impressions_completed": self.impressions_completed,
+        }
+
+
+class IPPJobTracker:
+    """
+    Acompanha os trabalhos enviados consultando a impressora periodicamente
+
+    Cada impressora é consultada por um "cliente" (IPPPrinter) que implementa
+    get_job_attributes(job_id) e get_active_jobs(). Com vários trabalhos ativos
+    na mesma impressora é feito um único Get-Jobs; os que saíram da lista são
+    confirmados individualmente. Impressoras que não respondem às consultas
+    deixam de ser acompanhadas por um tempo (unsupported_cooldown) e os
+    chamadores voltam às pausas fixas; depois disso, o próximo trabalho aceito
+    volta a ser acompanhado.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = IPPJobTracker()
+            return cls._instance
+
+    def __init__(self, poll_interval: float = 1.0, retention_seconds: float = 600.0, max_failures: int = 3,
+                 unsupported_cooldown: float = 300.0):
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.max_failures = max_failures
+        self.unsupported_cooldown = unsupported_cooldown
+        self._jobs: Dict[tuple, TrackedJob] = {}
+        self._clients = {}
+        self._failures = {}
+        # Impressora -> instante (monotonic) em que volta a ser acompanhada
+        self._unsupported: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._poll_thread = None
+        self._stop_event = threading.Event()
+
+    def configure(self, poll_interval: Optional[float] = None):
+        """Atualiza o intervalo de consulta"""
+        if poll_interval is not None:
+            self.poll_interval = max(0.2, float(poll_interval))
+
+    def _is_unsupported(self, printer_ip: str) -> bool:
+        """Indica se a impressora está fora do acompanhamento (chamado com o lock)"""
+        until = self._unsupported.get(printer_ip)
+        if until is None:
+            return False
+        if time.monotonic() < until:
+            return True
+        # Fim da espera: uma queda ou reinício da impressora não desativa o acompanhamento para sempre
+        del self._unsupported[printer_ip]
+        return False
+
+    def is_tracking(self, printer_ip: str) -> bool:
+        """Indica se os trabalhos desta impressora podem ser acompanhados"""
+        with self._condition:
+            return printer_ip in self._clients and not self._is_unsupported(printer_ip)
+
+    def track(self, client, printer_job_id: int, local_job_id: Optional[str] = None) -> Optional[TrackedJob]:
+        """Passa a acompanhar um trabalho aceito pela impressora"""
+        if printer_job_id is None:
+            return None
+
+        printer_ip = client.printer_ip
+        with self._condition:
+            if self._is_unsupported(printer_ip):
+                return None
+            self._purge_old_jobs()
+            self._clients[printer_ip] = client
+            job = TrackedJob(printer_ip=printer_ip, printer_job_id=printer_job_id, local_job_id=local_job_id)
+            self._jobs[(printer_ip, printer_job_id)] = job
+
+        self._ensure_poller()
+        return job
+
+    def get_jobs(self, local_job_id: str) -> List[TrackedJob]:
+        """Trabalhos da impressora associados a um trabalho local"""
+        with self._condition:
+            return [job for job in self._jobs.values() if job.local_job_id == local_job_id]
+
+    def get_summary(self, local_job_id: str) -> Dict:
+        """Resumo do andamento na impressora de um trabalho local"""
+        jobs = self.get_jobs(local_job_id)
+        return {
+            "printer_jobs": [job.to_dict() for job in jobs],
+            "jobs_completed": sum(1 for job in jobs if job.state == JOB_STATE_COMPLETED),
+            "jobs_pending": sum(1 for job in jobs if not job.is_terminal),
+            "impressions_completed": sum(job.impressions_completed for job in jobs),
+        }
+
+    def queued_count(self, printer_ip: str) -> Optional[int]:
+        """Trabalhos ainda na fila da impressora (None se ela não estiver sendo acompanhada)"""
+        with self._condition:
+            if printer_ip not in self._clients or self._is_unsupported(printer_ip):
+                return None
+            return sum(1 for job in self._jobs.values() if job.printer_ip == printer_ip and job.is_queued)
+
+    def _has_room(self, printer_ip: str, max_queued: int, wait_for_completion: bool) -> bool:
+        active = [job for job in self._jobs.values() if job.printer_ip == printer_ip and not job.is_terminal]
+        if wait_for_completion:
+            return not active
+        return sum(1 for job in active if job.is_queued) < max_queued
+
+    def wait_for_capacity(self, printer_ip: str, timeout: float, max_queued: int = 1,
+                          wait_for_completion: bool = False) -> bool:
+        """
+        Aguarda até a impressora ter espaço para o próximo trabalho
+
+        Returns:
+            bool: True se a impressora confirmou espaço antes do timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._is_unsupported(printer_ip) or printer_ip not in self._clients:
+                    break
+                if self._has_room(printer_ip, max_queued, wait_for_completion):
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+
+        # Sem acompanhamento: cumpre o restante da pausa fixa
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        return False
+
+    def _ensure_poller(self):
+        """Inicia a thread de consulta se necessário"""
+        with self._condition:
+            if self._poll_thread and self._poll_thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self._poll_thread.start()
+
+    def _poll_loop(self):
+        """
+        Consulta as impressoras com trabalhos ativos até não restar nenhum
+
+        Trabalhos terminados continuam disponíveis para get_jobs até o tempo de
+        retenção, mas não mantêm a thread rodando (a limpeza também ocorre em track).
+        """
+        while not self._stop_event.wait(self.poll_interval):
+            with self._condition:
+                self._purge_old_jobs()
+                active_by_printer = {}
+                for job in self._jobs.values():
+                    if not job.is_terminal:
+                        active_by_printer.setdefault(job.printer_ip, []).append(job)
+                if not active_by_printer:
+                    self._poll_thread = None
+                    return
+
+            for printer_ip, jobs in active_by_printer.items():
+                self._poll_printer(printer_ip, jobs)
+
+    def _poll_printer(self, printer_ip: str, jobs: List[TrackedJob]):
+        """Atualiza os trabalhos ativos de uma impressora"""
+        client = self._clients.get(printer_ip)
+        if client is None:
+            return
+
+        pending = list(jobs)
+        any_response = False
+
+        if len(jobs) > 1:
+            # Um Get-Jobs cobre todos os trabalhos não concluídos de uma vez
+            active = client.get_active_jobs()
+            if active is not None:
+                any_response = True
+                still_pending = []
+                for job in pending:
+                    if job.printer_job_id in active:
+                        self._apply_status(job, active[job.printer_job_id])
+                    else:
+                        still_pending.append(job)
+                pending = still_pending
+
+        for job in pending:
+            status = client.get_job_attributes(job.printer_job_id)
+            if status is not None:
+                any_response = True
+                self._apply_status(job, status)
+
+        with self._condition:
+            if any_response:
+                self._failures.pop(printer_ip, None)
+            else:
+                self._failures[printer_ip] = self._failures.get(printer_ip, 0) + 1
+                if self._failures[printer_ip] >= self.max_failures:
+                    logger.info(f"Impressora {printer_ip} não informa o estado dos trabalhos - usando pausas fixas "
+                                f"por {self.unsupported_cooldown:.0f}s")
+                    self._unsupported[printer_ip] = time.monotonic() + self.unsupported_cooldown
+                    self._failures.pop(printer_ip, None)
+                    for job in jobs:
+                        self._jobs.pop((printer_ip, job.printer_job_id), None)
+            self._condition.notify_all()
+
+    def _apply_status(self, job: TrackedJob, status: Dict):
+        """Aplica o resultado de uma consulta a um trabalho acompanhado"""
+        previous_state = job.state_name
+        with self._condition:
+            job.gone = bool(status.get("gone"))
+            if status.get("state") is not None:
+                job.state = status["state"]
+            job.state_reasons = list(status.get("state_reasons", job.state_reasons))
+            job.impressions_completed = status.get("impressions_completed", job.impressions_completed) or 0
+            job.updated_at = time.monotonic()
+
+        if job.state_name != previous_state:
+            logger.debug(f"Trabalho {job.printer_job_id} em {job.printer_ip}: {previous_state} → {job.state_name}")
+
+    def _purge_old_jobs(self):
+        """Remove trabalhos terminados há mais que o tempo de retenção (chamado com o lock)"""
+        now = time.monotonic()
+        for key, job in list(self._jobs.items()):
+            if job.is_terminal and now - job.updated_at > self.retention_seconds:
+                del self._jobs[key]
+
+    def stop(self):
+        """Para as consultas"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Persistência da fila de impressão em SQLite (modo WAL)
+"""
+
+import os
+import json
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger("PrintManagementSystem.Utils.JobStore")
+
+# Estados gravados na tabela de trabalhos
+STATE_QUEUED = "queued"
+STATE_PROCESSING = "processing"
+STATE_COMPLETED = "completed"
+STATE_FAILED = "failed"
+STATE_CANCELED = "canceled"
+
+UNFINISHED_STATES = (STATE_QUEUED, STATE_PROCESSING)
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        job_data TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state)",
+    """CREATE TABLE IF NOT EXISTS job_pages (
+        job_id TEXT NOT NULL,
+        page_key TEXT NOT NULL,
+        completed_at REAL NOT NULL,
+        PRIMARY KEY (job_id, page_key)
+    )""",
+)
+
+
+class PrintJobStore:
+    """
+    Fila de impressão durável
+
+    Cada trabalho é uma linha (estado, tentativas e os dados do PrintJobInfo) e
+    cada página/cópia confirmada pela impressora é um checkpoint. As escritas
+    vão para uma fila em memória e uma thread as grava em lotes, uma transação
+    por lote, então enfileirar ou atualizar custa microssegundos para quem chama;
+    leituras esperam as escritas pendentes. Sem db_path configurado o armazenamento
+    fica desativado e a fila volta a ser apenas em memória.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = PrintJobStore()
+            return cls._instance
+
+    def __init__(self, db_path: Optional[str] = None, batch_interval: float = 0.05,
+                 batch_size: int = 256, retention_days: float = 7.0):
+        self.db_path = db_path
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.retention_seconds = retention_days * 86400
+        self._writes = queue.Queue()
+        self._writer_thread = None
+        self._read_conn = None
+        self._read_lock = threading.Lock()
+        self._open_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.db_path)
+
+    def configure(self, db_path: Optional[str] = None, retention_days: Optional[float] = None):
+        """Define o arquivo do banco (abre na primeira utilização)"""
+        if retention_days is not None:
+            self.retention_seconds = max(0.0, float(retention_days)) * 86400
+        if db_path and db_path != self.db_path:
+            self.close()
+            self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Com WAL, NORMAL só perde as últimas transações numa queda de energia, nunca corrompe
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_open(self) -> bool:
+        """Cria o banco e a thread de escrita sob demanda"""
+        if not self.enabled:
+            return False
+        if self._writer_thread and self._writer_thread.is_alive():
+            return True
+
+        with self._open_lock:
+            if self._writer_thread and self._writer_thread.is_alive():
+                return True
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+                conn = self._connect()
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                self._purge_finished(conn)
+                conn.commit()
+                self._read_conn = self._connect()
+            except sqlite3.Error as e:
+                logger.error(f"Não foi possível abrir a fila persistente {self.db_path}: {e}")
+                self.db_path = None
+                return False
+
+            self._writer_thread = threading.Thread(target=self._writer_loop, args=(conn,), daemon=True)
+            self._writer_thread.start()
+            logger.info(f"Fila de impressão persistente: {self.db_path}")
+            return True
+
+    def _purge_finished(self, conn: sqlite3.Connection):
+        """Remove trabalhos terminados há mais que o tempo de retenção"""
+        cutoff = time.time() - self.retention_seconds
+        conn.execute(
+            "DELETE FROM job_pages WHERE job_id IN "
+            "(SELECT job_id FROM jobs WHERE state NOT IN (?, ?) AND updated_at < ?)",
+            (*UNFINISHED_STATES, cutoff)
+        )
+        conn.execute("DELETE FROM jobs WHERE state NOT IN (?, ?) AND updated_at < ?",
+                     (*UNFINISHED_STATES, cutoff))
+
+    def _writer_loop(self, conn: sqlite3.Connection):
+        """Grava as escritas enfileiradas em lotes (uma transação por lote)"""
+        while True:
+            item = self._writes.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._writes.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                if isinstance(batch[-1], threading.Event) or batch[-1] is None:
+                    break
+
+            stop = batch[-1] is None
+            statements = [entry for entry in batch if isinstance(entry, tuple)]
+            events = [entry for entry in batch if isinstance(entry, threading.Event)]
+
+            if statements:
+                try:
+                    with conn:
+                        for sql, params in statements:
+                            conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    logger.error(f"Erro ao gravar a fila persistente ({len(statements)} operação(ões)): {e}")
+
+            for event in events:
+                event.set()
+            if stop:
+                break
+
+        conn.close()
+
+    def _write(self, sql: str, params: tuple):
+        if self._ensure_open():
+            self._writes.put((sql, params))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Aguarda até que todas as escritas enfileiradas estejam gravadas"""
+        if not self._writer_thread or not self._writer_thread.is_alive():
+            return True
+        event = threading.Event()
+        self._writes.put(event)
+        return event.wait(timeout)
+
+    # === Escritas (assíncronas) ===
+
+    def save_job(self, job_data: Dict, state: str = STATE_QUEUED):
+        """Grava (ou regrava) um trabalho na fila"""
+        now = time.time()
+        self._write(
+            "INSERT INTO jobs (job_id, state, attempts, job_data, created_at, updated_at) "
+            "VALUES (?, ?, 0, ?, ?, ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET state = excluded.state, attempts = 0, "
+            "job_data = excluded.job_data, updated_at = excluded.updated_at",
+            (job_data["job_id"], state, json.dumps(job_data), now, now)
+        )
+
+    def update_state(self, job_id: str, state: str, job_data: Optional[Dict] = None,
+                     increment_attempts: bool = False):
+        """Atualiza o estado de um trabalho (opcionalmente seus dados e a contagem de tentativas)"""
+        increment = 1 if increment_attempts else 0
+        if job_data is None:
+            self._write(
+                "UPDATE jobs SET state = ?, attempts = attempts + ?, updated_at = ? WHERE job_id = ?",
+                (state, increment, time.time(), job_id)
+            )
+        else:
+            self._write(
+                "UPDATE jobs SET state = ?, attempts = attempts + ?, job_data = ?, updated_at = ? "
+                "WHERE job_id = ?",
+                (state, increment, json.dumps(job_data), time.time(), job_id)
+            )
+
+    def checkpoint_page(self, job_id: str, page_key: str):
+        """Registra uma página/cópia confirmada pela impressora (ex.: "p3_c1")"""
+        self._write(
+            "INSERT OR IGNORE INTO job_pages (job_id, page_key, completed_at) VALUES (?, ?, ?)",
+            (job_id, page_key, time.time())
+        )
+
+    def clear_pages(self, job_id: str):
+        """Descarta os checkpoints de um trabalho"""
+        self._write("DELETE FROM job_pages WHERE job_id = ?", (job_id,))
+
+    def delete_job(self, job_id: str):
+        """Remove um trabalho e seus checkpoints"""
+        self._write("DELETE FROM job_pages WHERE job_id = ?", (job_id,))
+        self._write("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    # === Leituras (aguardam as escritas pendentes) ===
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        if not self._ensure_open():
+            return []
+        self.flush()
+        with self._read_lock:
+            try:
+                return self._read_conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao ler a fila persistente: {e}")
+                return []
+
+    @staticmethod
+    def _row_to_job(row) -> Dict:
+        job_id, state, attempts, job_data, created_at, updated_at = row
+        return {
+            "job_id": job_id,
+            "state": state,
+            "attempts": attempts,
+            "job_data": json.loads(job_data),
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Trabalho gravado (com as páginas já concluídas em "completed_pages")"""
+        rows = self._query(
+            "SELECT job_id, state, attempts, job_data, created_at, updated_at FROM jobs WHERE job_id = ?",
+            (job_id,)
+        )
+        if not rows:
+            return None
+        job = self._row_to_job(rows[0])
+        job["completed_pages"] = sorted(self.get_completed_pages(job_id))
+        return job
+
+    def get_unfinished_jobs(self) -> List[Dict]:
+        """Trabalhos que ainda estavam na fila ou em processamento, na ordem de chegada"""
+        rows = self._query(
+            "SELECT job_id, state, attempts, job_data, created_at, updated_at FROM jobs "
+            "WHERE state IN (?, ?) ORDER BY created_at",
+            UNFINISHED_STATES
+        )
+        return [self._row_to_job(row) for row in rows]
+
+    def get_completed_pages(self, job_id: str) -> Set[str]:
+        """Páginas/cópias já confirmadas de um trabalho"""
+        rows = self._query("SELECT page_key FROM job_pages WHERE job_id = ?", (job_id,))
+        return {row[0] for row in rows}
+
+    def close(self):
+        """Grava as escritas pendentes e fecha o banco"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writes.put(None)
+            self._writer_thread.join(timeout=5.0)
+        self._writer_thread = None
+
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Qualidade JPEG escolhida para caber num orçamento de bytes por página
+"""
+
+import io
+import logging
+
+logger = logging.getLogger("PrintManagementSystem.Utils.JpegBudget")
+
+# Lado maior da amostra reduzida usada nas codificações de teste
+TRIAL_SIDE = 1024
+
+# Limite de codificações de teste por página (busca binária na qualidade)
+MAX_TRIALS = 6
+
+# O orçamento é arredondado para múltiplos deste passo: a qualidade escolhida
+# (e a chave do cache de páginas) não muda a cada variação da vazão medida
+BUDGET_STEP = 256 * 1024
+
+
+def quantize_budget(byte_budget: float) -> int:
+    """Arredonda o orçamento para baixo em múltiplos de BUDGET_STEP (mínimo de um passo)"""
+    if byte_budget <= 0:
+        return 0
+    return max(BUDGET_STEP, int(byte_budget) // BUDGET_STEP * BUDGET_STEP)
+
+
+def _trial_image(image):
+    """Amostra reduzida da página e o fator de área para estimar o tamanho da página inteira"""
+    factor = max(1, max(image.size) // TRIAL_SIDE)
+    if factor == 1:
+        return image, 1.0
+    sample = image.reduce(factor)
+    return sample, (image.width * image.height) / (sample.width * sample.height)
+
+
+def fit_quality(image, byte_budget: int, max_quality: int, min_quality: int, save_kwargs: dict) -> int:
+    """
+    Maior qualidade JPEG cujo tamanho estimado da página cabe no orçamento
+
+    Cada teste codifica a amostra reduzida e multiplica o tamanho pelo fator de
+    área. A amostra tem mais detalhe por pixel que a página, então a estimativa
+    fica acima do tamanho real (erra para o lado seguro). Quando nem a
+    qualidade mínima cabe, retorna a mínima.
+
+    Args:
+        image: Imagem PIL já no modo de cor final (RGB ou L)
+        byte_budget: Tamanho máximo desejado da página codificada
+        max_quality: Qualidade usada quando a página cabe no orçamento
+        min_quality: Qualidade mais baixa aceitável
+        save_kwargs: Parâmetros de Image.save usados na codificação final
+    """
+    min_quality = min(min_quality, max_quality)
+    sample, scale = _trial_image(image)
+
+    def fits(quality: int) -> bool:
+        buffer = io.BytesIO()
+        sample.save(buffer, **dict(save_kwargs, quality=quality))
+        return buffer.tell() * scale <= byte_budget
+
+    try:
+        # Caso comum (texto, gráficos simples): um único teste na qualidade do perfil
+        if fits(max_quality):
+            return max_quality
+
+        best = min_quality
+        low, high = min_quality, max_quality - 1
+        for _ in range(MAX_TRIALS):
+            if low > high:
+                break
+            quality = (low + high) // 2
+            if fits(quality):
+                best, low = quality, quality + 1
+            else:
+                high = quality - 1
+    finally:
+        if sample is not image:
+            sample.close()
+
+    logger.debug(f"Página acima do orçamento de {byte_budget} bytes: qualidade JPEG {max_quality} → {best}")
+    return best
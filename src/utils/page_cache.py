@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache em disco de páginas rasterizadas (JPEG/PWG/URF) endereçado por conteúdo
+"""
+
+import os
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger("PrintManagementSystem.Utils.PageCache")
+
+# Incrementar quando a forma de gerar as páginas mudar, invalidando entradas antigas
+CACHE_FORMAT_VERSION = "jpeg-v1"
+
+
+class RasterPageCache:
+    """
+    Cache LRU de páginas já rasterizadas e codificadas
+
+    A chave combina o hash do conteúdo do PDF com os parâmetros que afetam a
+    imagem gerada (página, DPI, modo de cor, qualidade e perfil da impressora),
+    de modo que reimpressões, cópias e retentativas reaproveitam a página sem
+    rodar o pdftocairo de novo. O tamanho total é limitado; as entradas menos
+    usadas recentemente são removidas primeiro.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = RasterPageCache()
+            return cls._instance
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: int = 512, enabled: bool = True):
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "print_page_cache")
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.enabled = enabled
+        self._entries = None  # OrderedDict chave -> tamanho, do menos para o mais recente
+        self._total_bytes = 0
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def configure(self, cache_dir: Optional[str] = None, max_size_mb: Optional[int] = None,
+                  enabled: Optional[bool] = None):
+        """Atualiza os parâmetros do cache"""
+        with self._lock:
+            if cache_dir is not None and cache_dir != self.cache_dir:
+                self.cache_dir = cache_dir
+                self._entries = None
+            if max_size_mb is not None:
+                self.max_size_bytes = max(0, int(max_size_mb)) * 1024 * 1024
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            if self._entries is not None:
+                self._evict()
+
+    def file_digest(self, file_path: str) -> str:
+        """Calcula (e memoriza) o SHA-256 do conteúdo de um arquivo"""
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = self._digests.get(memo_key)
+        if digest:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            if len(self._digests) > 256:
+                self._digests.clear()
+            self._digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def make_key(document_digest: str, page_num: int, dpi: int, color_mode: str,
+                 jpg_quality: int, profile: str, document_format: str = "image/jpeg") -> str:
+        """Monta a chave de uma página a partir do documento e dos parâmetros de rasterização"""
+        parts = [CACHE_FORMAT_VERSION, document_digest, str(page_num), str(dpi),
+                 str(color_mode), str(jpg_quality), str(profile), document_format]
+        return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.jpg")
+
+    def _load_index(self):
+        """Carrega o índice a partir do disco (ordenado pelo último acesso)"""
+        if self._entries is not None:
+            return
+
+        found = []
+        if os.path.isdir(self.cache_dir):
+            for root, _dirs, files in os.walk(self.cache_dir):
+                for name in files:
+                    if not name.endswith(".jpg"):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                        found.append((stat.st_mtime, name[:-4], stat.st_size))
+                    except OSError:
+                        continue
+
+        found.sort()
+        self._entries = OrderedDict((key, size) for _mtime, key, size in found)
+        self._total_bytes = sum(self._entries.values())
+        logger.debug(f"Cache de páginas carregado: {len(self._entries)} entrada(s), "
+                     f"{self._total_bytes / (1024 * 1024):.1f} MB")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna os dados da página em cache ou None"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._load_index()
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            now = time.time()
+            os.utime(path, (now, now))
+            return data
+        except OSError:
+            with self._lock:
+                size = self._entries.pop(key, None)
+                if size:
+                    self._total_bytes -= size
+            return None
+
+    def put(self, key: str, data: bytes):
+        """Guarda os dados de uma página, removendo as entradas mais antigas se necessário"""
+        if not self.enabled or len(data) > self.max_size_bytes:
+            return
+
+        path = self._path_for(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Escrita atômica: outro job nunca lê uma página pela metade
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Não foi possível gravar página no cache: {e}")
+            return
+
+        with self._lock:
+            self._load_index()
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._total_bytes -= previous
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        """Remove entradas LRU até respeitar o tamanho máximo (chamado com o lock)"""
+        while self._entries and self._total_bytes > self.max_size_bytes:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path_for(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove todas as páginas do cache"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path_for(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+        logger.info("Cache de páginas limpo")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Detecção de páginas sem cor, para enviá-las em tons de cinza
+"""
+
+import logging
+
+from src.utils import raster_encoders
+from src.utils.blank_pages import sample_pixels
+
+logger = logging.getLogger("PrintManagementSystem.Utils.PageColor")
+
+# Diferença entre o maior e o menor canal a partir da qual um pixel da amostra é colorido.
+# Bordas suavizadas do texto e ruído de digitalização/JPEG ficam abaixo dela.
+CHROMA_LEVEL = 32
+
+
+def color_coverage(image) -> float:
+    """Fração da página com cor (0.0 a 1.0), medida numa amostra reduzida"""
+    np = raster_encoders._get_numpy()
+
+    pixels = sample_pixels(image)
+    if pixels.ndim != 3:
+        return 0.0
+    chroma = pixels.max(axis=2).astype(np.int16) - pixels.min(axis=2)
+    return np.count_nonzero(chroma > CHROMA_LEVEL) / chroma.size
+
+
+def is_grayscale_page(image, threshold: float) -> bool:
+    """Indica se a cor da página fica abaixo do limite (fração da página)"""
+    return image.mode in ("1", "L") or color_coverage(image) < threshold
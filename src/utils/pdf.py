@@ -2,6 +2,7 @@
 Utilitários para manipulação de PDF
 """
 
+import io
 import os
 import shutil
 import logging
@@ -113,6 +114,42 @@ class PDFUtils:
             logger.error(f"Erro ao dividir PDF: {str(e)}")
             raise ValueError(f"Erro ao processar o PDF: {str(e)}")
     
+    @staticmethod
+    def extract_pages(pdf_path, pages):
+        """
+        Gera um PDF apenas com as páginas escolhidas
+        
+        Args:
+            pdf_path (str): Caminho do arquivo PDF
+            pages (list): Números das páginas (a partir de 1), na ordem desejada
+            
+        Returns:
+            bytes: Conteúdo do PDF gerado
+            
+        Raises:
+            FileNotFoundError: Se o arquivo não for encontrado
+            ValueError: Se o arquivo não for um PDF válido ou uma página não existir
+        """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"Arquivo PDF não encontrado: {pdf_path}")
+        
+        try:
+            with open(pdf_path, 'rb') as f:
+                reader = PdfReader(f)
+                writer = PdfWriter()
+                
+                # Só as páginas copiadas (e os recursos que usam) vão para o novo arquivo
+                for page_num in pages:
+                    writer.add_page(reader.pages[page_num - 1])
+                
+                output = io.BytesIO()
+                writer.write(output)
+                return output.getvalue()
+                
+        except Exception as e:
+            logger.error(f"Erro ao extrair páginas do PDF: {str(e)}")
+            raise ValueError(f"Erro ao processar o PDF: {str(e)}")
+    
     @staticmethod
     def merge_pdfs(pdf_paths, output_path):
         """
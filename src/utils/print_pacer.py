@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Controle adaptativo do ritmo de envio de páginas por impressora (AIMD)
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger("PrintManagementSystem.Utils.PrintPacer")
+
+
+class PrinterPacer:
+    """
+    Ritmo de envio de uma impressora
+
+    Mantém o intervalo mínimo entre envios. Cada envio aceito rapidamente e com a
+    fila da impressora curta reduz o intervalo em um passo fixo (aumento aditivo
+    da vazão); uma rejeição, latência acima do alvo ou fila acima do limite
+    multiplica o intervalo (redução multiplicativa). Os limites vêm do perfil da
+    impressora: impressoras rápidas chegam a intervalo zero, modelos frágeis
+    nunca ficam abaixo do mínimo do perfil.
+
+    Os envios aceitos também alimentam a vazão observada (média móvel de
+    bytes por segundo), usada para limitar o tamanho das páginas.
+    """
+
+    # Envios menores que isto medem a latência da impressora, não a vazão do link
+    MIN_THROUGHPUT_SAMPLE = 64 * 1024
+    THROUGHPUT_SMOOTHING = 0.3
+
+    def __init__(self, printer_ip: str, min_interval: float = 0.0, max_interval: float = 5.0,
+                 initial_interval: float = 2.0, step: float = 0.25, backoff_factor: float = 2.0,
+                 target_latency: float = 3.0, max_queued: int = 1,
+                 retry_base: float = 0.5, retry_cap: float = 5.0):
+        self.printer_ip = printer_ip
+        self.min_interval = max(0.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.step = step
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.target_latency = target_latency
+        self.max_queued = max_queued
+        self.retry_base = retry_base
+        self.retry_cap = max(retry_base, retry_cap)
+        self._interval = self._clamp(initial_interval)
+        self._last_send = 0.0
+        self._throughput = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_profile(cls, profile) -> "PrinterPacer":
+        """Cria o pacer com os limites do perfil da impressora"""
+        return cls(
+            profile.printer_ip,
+            min_interval=profile.min_send_interval,
+            max_interval=profile.max_send_interval,
+            initial_interval=profile.page_delay,
+            step=profile.send_interval_step,
+            target_latency=profile.target_accept_latency,
+            max_queued=profile.max_queued_jobs,
+            retry_base=profile.retry_delays[0] if profile.retry_delays else 0.5,
+            retry_cap=max(profile.retry_delays) if profile.retry_delays else 5.0,
+        )
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    @property
+    def interval(self) -> float:
+        """Intervalo atual entre envios, em segundos"""
+        with self._lock:
+            return self._interval
+
+    def time_until_next(self) -> float:
+        """Tempo que falta para o próximo envio respeitar o intervalo atual"""
+        with self._lock:
+            return max(0.0, self._last_send + self._interval - time.monotonic())
+
+    def wait(self) -> float:
+        """Aguarda o intervalo desde o último envio; retorna o tempo aguardado"""
+        delay = self.time_until_next()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Vazão observada dos envios, em bytes por segundo (None enquanto não medida)"""
+        with self._lock:
+            return self._throughput
+
+    def on_accepted(self, latency: float, queued: Optional[int] = None, sent_bytes: int = 0):
+        """Registra um envio aceito com a latência medida, a fila da impressora (se conhecida) e o tamanho"""
+        congested = latency > self.target_latency or (queued is not None and queued > self.max_queued)
+        with self._lock:
+            self._last_send = time.monotonic()
+            if sent_bytes >= self.MIN_THROUGHPUT_SAMPLE and latency > 0:
+                # A latência inclui o processamento da impressora: a vazão fica subestimada (lado seguro)
+                rate = sent_bytes / latency
+                self._throughput = rate if self._throughput is None else (
+                    self._throughput + self.THROUGHPUT_SMOOTHING * (rate - self._throughput))
+            previous = self._interval
+            if congested:
+                self._interval = self._clamp(max(self._interval, self.step) * self.backoff_factor)
+            else:
+                self._interval = self._clamp(self._interval - self.step)
+
+        if congested:
+            logger.debug(f"Impressora {self.printer_ip} congestionada (latência {latency:.2f}s, fila {queued}): "
+                         f"intervalo {previous:.2f}s → {self._interval:.2f}s")
+
+    def on_rejected(self):
+        """Registra uma rejeição/falha de envio (redução multiplicativa do ritmo)"""
+        with self._lock:
+            self._last_send = time.monotonic()
+            self._interval = self._clamp(max(self._interval, self.step) * self.backoff_factor)
+            interval = self._interval
+        logger.debug(f"Envio rejeitado por {self.printer_ip}: intervalo → {interval:.2f}s")
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Pausa antes de uma nova tentativa
+
+        Parte do intervalo atual (não de uma escada fixa), então uma impressora
+        saudável que falha uma vez tenta de novo logo, enquanto uma que vem
+        rejeitando envios já está com o intervalo alto.
+        """
+        base = max(self.retry_base, self.interval)
+        return min(self.retry_cap, base * (2 ** attempt))
+
+    def to_dict(self) -> Dict:
+        return {
+            "printer_ip": self.printer_ip,
+            "interval": round(self.interval, 3),
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "throughput": round(self.throughput) if self.throughput is not None else None,
+        }
+
+
+class PrintPacerRegistry:
+    """Mantém um pacer por impressora (o ritmo aprendido vale para os próximos trabalhos)"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = PrintPacerRegistry()
+            return cls._instance
+
+    def __init__(self):
+        self._pacers: Dict[str, PrinterPacer] = {}
+        self._lock = threading.Lock()
+
+    def get_pacer(self, profile) -> PrinterPacer:
+        """Obtém o pacer da impressora, recriando-o se os limites do perfil mudaram"""
+        with self._lock:
+            pacer = self._pacers.get(profile.printer_ip)
+            if (pacer is None or pacer.min_interval != max(0.0, profile.min_send_interval)
+                    or pacer.max_interval != max(pacer.min_interval, profile.max_send_interval)):
+                pacer = PrinterPacer.from_profile(profile)
+                self._pacers[profile.printer_ip] = pacer
+            return pacer
+
+    def reset(self, printer_ip: Optional[str] = None):
+        """Descarta o ritmo aprendido (de uma impressora ou de todas)"""
+        with self._lock:
+            if printer_ip is None:
+                self._pacers.clear()
+            else:
+                self._pacers.pop(printer_ip, None)
@@ -16,9 +16,12 @@ import threading
 import logging
 import queue
 import socket
+import mmap
+import io
 from typing import Dict, Optional, Any, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from contextlib import contextmanager
 import platform
 import zipfile
 import urllib.request
@@ -27,8 +30,6 @@ import wx
 import json
 from datetime import datetime
 from urllib3.exceptions import InsecureRequestWarning
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import struct
 import ssl
 import requests
@@ -38,6 +39,16 @@ import concurrent.futures
 from PIL import Image
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.utils.subprocess_utils import run_hidden, popen_hidden, check_output_hidden
+from src.utils.ipp_connection_pool import PrinterConnectionPool
+from src.utils.page_cache import RasterPageCache
+from src.utils.printer_profile import PrinterProfileRegistry
+from src.utils import raster_encoders
+from src.utils import jpeg_budget
+from src.utils.ipp_job_tracker import IPPJobTracker
+from src.utils.print_pacer import PrintPacerRegistry, PrinterPacer
+from src.utils.job_store import PrintJobStore, STATE_QUEUED, STATE_PROCESSING, STATE_FAILED
+from src.utils.raster_pool import RasterProcessPool, PageEncoding, split_ranges
+from src.utils.rasterizers import RasterizerRegistry, postscript_page_count
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -128,6 +139,15 @@ class PrinterEndpointCache:
         
         return False
     
+    def set_multi_document_support(self, printer_ip: str, supported: bool):
+        """Registra se a impressora aceita Create-Job + Send-Document"""
+        with self._cache_lock:
+            printer_configs = self.config.get("printer_endpoint_cache", {})
+            if printer_ip in printer_configs and printer_configs[printer_ip].get("multi_document_supported") != supported:
+                printer_configs[printer_ip]["multi_document_supported"] = supported
+                self.config.set("printer_endpoint_cache", printer_configs)
+                logger.info(f"Suporte a multi-documento para {printer_ip}: {'SIM' if supported else 'NÃO'}")
+    
     def reset_printer_cache(self, printer_ip: str):
         """Reseta completamente o cache de uma impressora"""
         with self._cache_lock:
@@ -176,6 +196,12 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 class PopplerManager:
+    # Resultado de setup_poppler() memorizado (a verificação executa pdftoppm)
+    _setup_lock = threading.Lock()
+    _setup_result = None
+    _setup_checked_at = 0.0
+    SETUP_RETRY_SECONDS = 300
+    
     @staticmethod
     def get_poppler_path():
         """Retorna o caminho do Poppler se estiver instalado - VERSÃO CORRIGIDA"""
@@ -428,9 +454,28 @@ class PopplerManager:
             logger.error(f"Erro ao instalar Poppler: {e}")
             return None
 
+    @classmethod
+    def setup_poppler(cls):
+        """
+        Configura o Poppler para uso com pdf2image
+        
+        A verificação roda uma vez por execução; uma falha é verificada de novo
+        só depois de SETUP_RETRY_SECONDS (evita uma tentativa de instalação por trabalho).
+        """
+        with cls._setup_lock:
+            now = time.monotonic()
+            if cls._setup_checked_at and (cls._setup_result is not None or
+                                          now - cls._setup_checked_at < cls.SETUP_RETRY_SECONDS):
+                return cls._setup_result[0] if cls._setup_result else None
+            
+            poppler_path, available = cls._setup_poppler_uncached()
+            cls._setup_result = (poppler_path,) if available else None
+            cls._setup_checked_at = now
+            return poppler_path
+    
     @staticmethod
-    def setup_poppler():
-        """Configura o Poppler para uso com pdf2image"""
+    def _setup_poppler_uncached() -> Tuple[Optional[str], bool]:
+        """Localiza (e no Windows instala) o Poppler: (caminho, disponível)"""
         system = platform.system().lower()
         
         if system == "windows":
@@ -446,9 +491,9 @@ class PopplerManager:
                     logger.error("1. Instale o Poppler manualmente: https://github.com/oschwartz10612/poppler-windows/releases")
                     logger.error("2. Adicione o Poppler ao PATH do sistema")
                     logger.error("3. Execute o script como administrador")
-                    return None
+                    return None, False
             
-            return poppler_path
+            return poppler_path, True
         
         else:
             # Para Linux/Mac
@@ -456,14 +501,14 @@ class PopplerManager:
                 result = run_hidden(['pdftoppm', '-h'],
                     capture_output=True, text=True, timeout=5)
                 if result.returncode == 0:
-                    return None  # Já está disponível
+                    return None, True  # Já está disponível
             except Exception as e:
                 logger.debug(f"Poppler não encontrado: {e}")
             
             logger.error("Poppler não encontrado.")
             logger.error("Instale com: sudo apt-get install poppler-utils (Ubuntu/Debian)")
             logger.error("ou: brew install poppler (macOS)")
-            return None
+            return None, False
 
     @staticmethod
     def diagnose_poppler():
@@ -513,14 +558,28 @@ class IPPVersion:
 
 class IPPOperation:
     PRINT_JOB = 0x0002
+    VALIDATE_JOB = 0x0004
+    CREATE_JOB = 0x0005
+    SEND_DOCUMENT = 0x0006
+    CANCEL_JOB = 0x0008
+    GET_JOB_ATTRIBUTES = 0x0009
+    GET_JOBS = 0x000A
+    GET_PRINTER_ATTRIBUTES = 0x000B
+    CLOSE_JOB = 0x003B
 
 class IPPTag:
     OPERATION = 0x01
     JOB = 0x02
     END = 0x03
+    PRINTER = 0x04
+    UNSUPPORTED = 0x05
+    EVENT_NOTIFICATION = 0x07
+    OCTET_STRING = 0x30
     INTEGER = 0x21
     BOOLEAN = 0x22
     ENUM = 0x23
+    RESOLUTION = 0x32
+    RANGE_OF_INTEGER = 0x33
     TEXT = 0x41
     NAME = 0x42
     KEYWORD = 0x44
@@ -529,6 +588,25 @@ class IPPTag:
     LANGUAGE = 0x48
     MIMETYPE = 0x49
 
+class IPPJobState:
+    PENDING = 3
+    PENDING_HELD = 4
+    PROCESSING = 5
+    PROCESSING_STOPPED = 6
+    CANCELED = 7
+    ABORTED = 8
+    COMPLETED = 9
+
+IPP_JOB_STATE_NAMES = {
+    IPPJobState.PENDING: "pending",
+    IPPJobState.PENDING_HELD: "pending-held",
+    IPPJobState.PROCESSING: "processing",
+    IPPJobState.PROCESSING_STOPPED: "processing-stopped",
+    IPPJobState.CANCELED: "canceled",
+    IPPJobState.ABORTED: "aborted",
+    IPPJobState.COMPLETED: "completed",
+}
+
 IPP_STATUS_CODES = {
     0x0000: "successful-ok",
     0x0001: "successful-ok-ignored-or-substituted-attributes",
@@ -579,6 +657,41 @@ class Quality(Enum):
     NORMAL = 4
     ALTA = 5
 
+def parse_page_ranges(page_ranges: str, total_pages: Optional[int] = None) -> List[int]:
+    """
+    Páginas selecionadas por uma expressão como "1-3,5,8-" (vazia = todas)
+    
+    Args:
+        page_ranges: Intervalos separados por vírgula ("n", "a-b", "a-" ou "-b")
+        total_pages: Páginas do documento; sem ele a expressão é apenas validada
+    
+    Returns:
+        Páginas em ordem crescente, sem repetições e limitadas ao documento
+    
+    Raises:
+        ValueError: Se a expressão for inválida
+    """
+    spec = (page_ranges or "").replace(" ", "")
+    if not spec:
+        return list(range(1, total_pages + 1)) if total_pages else []
+    
+    pages = set()
+    for part in spec.split(","):
+        match = re.fullmatch(r"(\d*)-(\d*)|(\d+)", part)
+        if not match or part == "-":
+            raise ValueError(f"Intervalo de páginas inválido: {part!r}")
+        if match.group(3):
+            first = last = int(match.group(3))
+        else:
+            first = int(match.group(1) or 1)
+            # "a-" vai até o fim do documento
+            last = int(match.group(2)) if match.group(2) else None
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"Intervalo de páginas inválido: {part!r}")
+        if total_pages:
+            pages.update(range(first, min(last or total_pages, total_pages) + 1))
+    return sorted(pages)
+
 @dataclass
 class PrintOptions:
     color_mode: ColorMode = ColorMode.AUTO
@@ -588,16 +701,241 @@ class PrintOptions:
     orientation: str = "portrait"
     paper_size: str = "iso_a4_210x297mm"
     dpi: int = 300
+    # Páginas a imprimir, ex.: "3-4,10" (vazio = documento inteiro)
+    page_ranges: str = ""
+    
+    def selected_pages(self, total_pages: int) -> List[int]:
+        """Páginas do documento que este trabalho imprime"""
+        return parse_page_ranges(self.page_ranges, total_pages)
 
 @dataclass
 class PageJob:
     """Representa uma página para impressão"""
     page_num: int
     image_path: str
-    jpg_data: bytes
+    jpg_data: Optional[bytes]
     job_name: str
     attempts: int = 0
     max_attempts: int = 3
+    # Página em branco: não é enviada (ver blank_pages)
+    blank: bool = False
+    # Página codificada com um único canal: enviada com print-color-mode=monochrome
+    grayscale: bool = False
+    
+    def get_data(self) -> bytes:
+        """Dados codificados da página (em memória ou lidos do disco se foram descarregados)"""
+        if self.jpg_data is not None:
+            return self.jpg_data
+        with open(self.image_path, 'rb') as f:
+            return f.read()
+
+class PrintWorkspace:
+    """
+    Área de trabalho de um job de impressão
+    
+    As páginas são codificadas num buffer em memória reutilizável e mantidas
+    em RAM até o orçamento de memória; só o excedente é gravado em disco, numa
+    pasta temporária criada sob demanda e removida quando o job termina.
+    """
+    
+    def __init__(self, base_name: str, memory_budget_bytes: int):
+        self.base_name = normalize_filename(base_name)
+        self.memory_budget_bytes = max(0, int(memory_budget_bytes))
+        self.memory_bytes = 0
+        self.spilled_pages = 0
+        self._temp_dir = None
+        self._buffer = io.BytesIO()
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False
+    
+    def encode(self, image, **save_kwargs) -> bytes:
+        """Codifica a imagem no buffer reutilizável e retorna os bytes resultantes"""
+        with self._lock:
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            image.save(self._buffer, **save_kwargs)
+            return self._buffer.getvalue()
+    
+    def store(self, filename: str, data: bytes) -> Tuple[Optional[bytes], str]:
+        """
+        Guarda os dados de uma página respeitando o orçamento de memória
+        
+        Returns:
+            tuple: (dados em memória ou None, caminho em disco ou "")
+        """
+        with self._lock:
+            if self.memory_bytes + len(data) <= self.memory_budget_bytes:
+                self.memory_bytes += len(data)
+                return data, ""
+            
+            if self._temp_dir is None:
+                self._temp_dir = tempfile.mkdtemp(prefix=f"pdf_print_{self.base_name}_")
+            
+            path = os.path.join(self._temp_dir, filename)
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.spilled_pages += 1
+            return None, path
+    
+    def cleanup(self):
+        """Remove a pasta temporária (se criada) e libera o buffer"""
+        self._buffer = io.BytesIO()
+        if self._temp_dir and os.path.exists(self._temp_dir):
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            logger.debug(f"Área temporária removida: {self._temp_dir}")
+        self._temp_dir = None
+
+class RasterizationLimiter:
+    """
+    Limite global de rasterizações simultâneas
+    
+    Com uma fila por impressora, vários trabalhos podem converter PDF ao mesmo
+    tempo; cada conversão ocupa CPU e memória, então o número de conversões em
+    andamento no host é limitado independentemente do número de impressoras.
+    """
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = RasterizationLimiter()
+            return cls._instance
+    
+    def __init__(self, max_concurrent: int = 2):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._active = 0
+        self._condition = threading.Condition()
+    
+    def configure(self, max_concurrent: Optional[int] = None):
+        """Atualiza o limite (vale para as próximas conversões)"""
+        if max_concurrent is not None:
+            with self._condition:
+                self.max_concurrent = max(1, int(max_concurrent))
+                self._condition.notify_all()
+    
+    @contextmanager
+    def slot(self):
+        """Ocupa uma vaga de rasterização durante o bloco"""
+        with self._condition:
+            while self._active >= self.max_concurrent:
+                self._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify()
+    
+    @property
+    def active(self) -> int:
+        """Rasterizações em andamento"""
+        with self._condition:
+            return self._active
+
+class PagePipeline:
+    """
+    Pipeline produtor/consumidor limitado de páginas rasterizadas
+    
+    Uma thread rasteriza e codifica janelas de páginas (first_page/last_page)
+    enquanto o consumidor transmite as anteriores. A fila limitada controla o
+    pico de memória; as PageJobs já codificadas são mantidas para as cópias
+    seguintes, que são servidas sem nova rasterização.
+    """
+    
+    _END = object()
+    
+    def __init__(self, total_pages: int, produce_window, window_size: int = 2, queue_depth: int = 4):
+        """
+        Args:
+            total_pages: Número de páginas do documento
+            produce_window: Função (first_page, last_page) -> List[PageJob]
+            window_size: Páginas rasterizadas por chamada do conversor
+            queue_depth: Máximo de páginas prontas aguardando envio
+        """
+        self.total_pages = total_pages
+        self._produce_window = produce_window
+        self.window_size = max(1, int(window_size))
+        self._queue = queue.Queue(maxsize=max(1, int(queue_depth)))
+        self._produced: List[PageJob] = []
+        self._finished = False
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._start_time = None
+        self.time_to_first_page = None
+    
+    def __len__(self):
+        return self.total_pages
+    
+    def start(self):
+        """Inicia a thread produtora"""
+        self._start_time = time.time()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+    
+    def _put(self, item) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _run(self):
+        try:
+            for first_page in range(1, self.total_pages + 1, self.window_size):
+                if self._stop_event.is_set():
+                    return
+                last_page = min(self.total_pages, first_page + self.window_size - 1)
+                for page_job in self._produce_window(first_page, last_page):
+                    if not self._put(page_job):
+                        return
+            self._put(self._END)
+        except Exception as e:
+            logger.error(f"Erro no pipeline de rasterização: {e}")
+            self._put(e)
+    
+    def __iter__(self):
+        # Páginas já produzidas (cópias seguintes ou reinício após fallback)
+        index = 0
+        while index < len(self._produced):
+            yield self._produced[index]
+            index += 1
+        
+        while not self._finished:
+            item = self._queue.get()
+            if item is self._END:
+                self._finished = True
+                break
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            
+            if self.time_to_first_page is None:
+                self.time_to_first_page = time.time() - self._start_time
+                logger.info(f"Primeira página pronta em {self.time_to_first_page:.2f}s")
+            
+            self._produced.append(item)
+            index += 1
+            yield item
+    
+    def close(self):
+        """Interrompe a produção (cancelamento ou fim do trabalho)"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
 
 @dataclass
 class PrintJobInfo:
@@ -631,7 +969,8 @@ class PrintJobInfo:
                 "copies": self.options.copies,
                 "orientation": self.options.orientation,
                 "paper_size": self.options.paper_size,
-                "dpi": self.options.dpi
+                "dpi": self.options.dpi,
+                "page_ranges": self.options.page_ranges
             },
             "start_time": self.start_time.isoformat(),
             "status": self.status,
@@ -639,6 +978,37 @@ class PrintJobInfo:
             "completed_pages": self.completed_pages,
             "end_time": self.end_time.isoformat() if self.end_time else None
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PrintJobInfo":
+        """Recria o trabalho a partir do dicionário gerado por to_dict"""
+        options_data = data.get("options", {}) or {}
+        options = PrintOptions(
+            color_mode=ColorMode(options_data.get("color_mode", ColorMode.AUTO.value)),
+            duplex=Duplex(options_data.get("duplex", Duplex.SIMPLES.value)),
+            quality=Quality(options_data.get("quality", Quality.NORMAL.value)),
+            copies=options_data.get("copies", 1),
+            orientation=options_data.get("orientation", "portrait"),
+            paper_size=options_data.get("paper_size", "iso_a4_210x297mm"),
+            dpi=options_data.get("dpi", 300),
+            page_ranges=options_data.get("page_ranges", "")
+        )
+        
+        end_time = data.get("end_time")
+        return cls(
+            job_id=data["job_id"],
+            document_path=data["document_path"],
+            document_name=data.get("document_name", ""),
+            printer_name=data.get("printer_name", ""),
+            printer_id=data.get("printer_id", ""),
+            printer_ip=data.get("printer_ip", ""),
+            options=options,
+            start_time=datetime.fromisoformat(data["start_time"]) if data.get("start_time") else datetime.now(),
+            status=data.get("status", "pending"),
+            total_pages=data.get("total_pages", 0),
+            completed_pages=data.get("completed_pages", 0),
+            end_time=datetime.fromisoformat(end_time) if end_time else None
+        )
 
 class IPPEncoder:
     """Codificador para protocolo IPP"""
@@ -646,9 +1016,20 @@ class IPPEncoder:
     @staticmethod
     def encode_string(tag: int, name: str, value: str) -> bytes:
         """Codifica um atributo string"""
+        # Comprimentos em bytes (UTF-8), não em caracteres: nomes de trabalho podem ter acentos
+        name = name.encode('utf-8')
+        value = value.encode('utf-8')
         data = struct.pack('>B', tag)
-        data += struct.pack('>H', len(name)) + name.encode('utf-8')
-        data += struct.pack('>H', len(value)) + value.encode('utf-8')
+        data += struct.pack('>H', len(name)) + name
+        data += struct.pack('>H', len(value)) + value
+        return data
+    
+    @staticmethod
+    def encode_strings(tag: int, name: str, values: List[str]) -> bytes:
+        """Codifica um atributo multivalorado (valores adicionais têm nome vazio)"""
+        data = IPPEncoder.encode_string(tag, name, values[0])
+        for value in values[1:]:
+            data += IPPEncoder.encode_string(tag, "", value)
         return data
     
     @staticmethod
@@ -671,6 +1052,341 @@ class IPPEncoder:
     def encode_enum(name: str, value: int) -> bytes:
         """Codifica um atributo enum"""
         return IPPEncoder.encode_integer(IPPTag.ENUM, name, value)
+    
+    @staticmethod
+    def encode_attribute(name: str, value) -> bytes:
+        """Codifica um atributo de operação escolhendo a tag pelo nome/tipo (b"" se não suportado)"""
+        if isinstance(value, str):
+            if name == "printer-uri":
+                return IPPEncoder.encode_string(IPPTag.URI, name, value)
+            elif name in ["requesting-user-name", "job-name", "document-name"]:
+                return IPPEncoder.encode_string(IPPTag.NAME, name, value)
+            elif name == "document-format":
+                return IPPEncoder.encode_string(IPPTag.MIMETYPE, name, value)
+            elif name in ["print-color-mode", "sides", "media", "which-jobs"]:
+                return IPPEncoder.encode_string(IPPTag.KEYWORD, name, value)
+            else:
+                return IPPEncoder.encode_string(IPPTag.TEXT, name, value)
+                
+        elif isinstance(value, (list, tuple)) and value:
+            # Atributos multivalorados (ex.: requested-attributes)
+            return IPPEncoder.encode_strings(IPPTag.KEYWORD, name, [str(v) for v in value])
+                
+        # bool é subclasse de int: precisa ser verificado antes
+        elif isinstance(value, bool):
+            return IPPEncoder.encode_boolean(name, value)
+            
+        elif isinstance(value, int):
+            if name in ["copies", "job-priority", "job-id"]:
+                return IPPEncoder.encode_integer(IPPTag.INTEGER, name, value)
+            elif name in ["print-quality", "orientation-requested"]:
+                return IPPEncoder.encode_enum(name, value)
+        
+        return b""
+
+class IPPRequestTemplate:
+    """
+    Requisição IPP pré-codificada
+    
+    Os atributos constantes (URI, formato, opções de impressão...) são codificados
+    uma única vez; a cada requisição só o request-id e os atributos variáveis
+    (nome do trabalho/documento, job-id, last-document) são escritos.
+    """
+    
+    VARIABLE_ATTRIBUTES = ("job-name", "document-name", "job-id", "last-document")
+    
+    def __init__(self, operation: int, attributes: Dict[str, Any]):
+        self.operation = operation
+        
+        header = bytearray(struct.pack('>HHIB', IPPVersion.IPP_1_1, operation, 0, IPPTag.OPERATION))
+        header += IPPEncoder.encode_string(IPPTag.CHARSET, "attributes-charset", "utf-8")
+        header += IPPEncoder.encode_string(IPPTag.LANGUAGE, "attributes-natural-language", "en-us")
+        
+        # Sequência de trechos já codificados (bytes) e nomes de atributos variáveis (str)
+        self._parts = []
+        constant = header
+        for name, value in attributes.items():
+            if name in ["attributes-charset", "attributes-natural-language"]:
+                continue
+            if name in self.VARIABLE_ATTRIBUTES:
+                self._parts.append(bytes(constant))
+                self._parts.append(name)
+                constant = bytearray()
+            else:
+                constant += IPPEncoder.encode_attribute(name, value)
+        
+        constant += struct.pack('>BB', IPPTag.JOB, IPPTag.END)
+        self._parts.append(bytes(constant))
+    
+    @classmethod
+    def cache_key(cls, operation: int, attributes: Dict[str, Any]) -> tuple:
+        """Chave que identifica requisições com os mesmos atributos constantes"""
+        return (operation,) + tuple(
+            (name, None if name in cls.VARIABLE_ATTRIBUTES else
+             tuple(value) if isinstance(value, list) else value)
+            for name, value in attributes.items()
+        )
+    
+    def render(self, request_id: int, attributes: Dict[str, Any]) -> bytearray:
+        """Monta a requisição preenchendo request-id e atributos variáveis"""
+        packet = bytearray()
+        for part in self._parts:
+            if isinstance(part, str):
+                packet += IPPEncoder.encode_attribute(part, attributes[part])
+            else:
+                packet += part
+        struct.pack_into('>I', packet, 4, request_id)
+        return packet
+
+class IPPResponse:
+    """
+    Resposta IPP decodificada
+    
+    Percorre os grupos de atributos sobre um memoryview, sem copiar a resposta;
+    só os valores são convertidos para objetos Python. Atributos com vários
+    valores ficam agrupados em listas, na ordem em que aparecem.
+    """
+    
+    def __init__(self, version: int, status_code: int, request_id: int):
+        self.version = version
+        self.status_code = status_code
+        self.request_id = request_id
+        # Lista de (tag do grupo, {nome: [valores]}) - Get-Jobs retorna um grupo por trabalho
+        self.groups: List[Tuple[int, Dict[str, List[Any]]]] = []
+    
+    @classmethod
+    def parse(cls, data) -> 'IPPResponse':
+        """Decodifica uma resposta IPP (bytes, bytearray ou memoryview)"""
+        view = memoryview(data)
+        if len(view) < 8:
+            raise ValueError(f"Resposta IPP muito curta ({len(view)} bytes)")
+        
+        version, status_code, request_id = struct.unpack_from('>HHI', view, 0)
+        response = cls(version, status_code, request_id)
+        
+        offset = 8
+        end = len(view)
+        current_group = None
+        current_name = None
+        
+        while offset < end:
+            tag = view[offset]
+            offset += 1
+            
+            if tag == IPPTag.END:
+                break
+            if tag < 0x10:
+                # Início de um novo grupo de atributos
+                current_group = {}
+                response.groups.append((tag, current_group))
+                current_name = None
+                continue
+            
+            if offset + 2 > end:
+                raise ValueError("Resposta IPP truncada (nome)")
+            name_length = struct.unpack_from('>H', view, offset)[0]
+            offset += 2
+            if name_length:
+                current_name = str(view[offset:offset + name_length], 'utf-8', 'replace')
+            offset += name_length
+            
+            if offset + 2 > end:
+                raise ValueError("Resposta IPP truncada (valor)")
+            value_length = struct.unpack_from('>H', view, offset)[0]
+            offset += 2
+            if offset + value_length > end:
+                raise ValueError("Resposta IPP truncada (dados)")
+            value = cls._decode_value(tag, view[offset:offset + value_length])
+            offset += value_length
+            
+            if current_group is None:
+                current_group = {}
+                response.groups.append((IPPTag.OPERATION, current_group))
+            if current_name:
+                current_group.setdefault(current_name, []).append(value)
+        
+        return response
+    
+    @classmethod
+    def from_http_response(cls, http_response) -> Optional['IPPResponse']:
+        """Decodifica a resposta HTTP de uma operação IPP (None se não for uma resposta IPP válida)"""
+        if http_response is None or http_response.status_code != 200:
+            return None
+        try:
+            return cls.parse(http_response.content)
+        except (ValueError, struct.error) as e:
+            logger.debug(f"Resposta IPP inválida: {e}")
+            return None
+    
+    @staticmethod
+    def _decode_value(tag: int, raw: memoryview):
+        """Converte o valor de um atributo conforme a sua tag"""
+        length = len(raw)
+        if tag in (IPPTag.INTEGER, IPPTag.ENUM) and length == 4:
+            return struct.unpack_from('>i', raw)[0]
+        if tag == IPPTag.BOOLEAN and length == 1:
+            return bool(raw[0])
+        if tag == IPPTag.RESOLUTION and length == 9:
+            return struct.unpack_from('>iiB', raw)
+        if tag == IPPTag.RANGE_OF_INTEGER and length == 8:
+            return struct.unpack_from('>ii', raw)
+        if 0x10 <= tag <= 0x1F:
+            # Valores "out-of-band" (unsupported, unknown, no-value)
+            return None
+        if 0x40 <= tag <= 0x4F:
+            return str(raw, 'utf-8', 'replace')
+        return raw.tobytes()
+    
+    def group(self, group_tag: int) -> Dict[str, List[Any]]:
+        """Atributos do primeiro grupo com a tag informada (vazio se não existir)"""
+        for tag, attributes in self.groups:
+            if tag == group_tag:
+                return attributes
+        return {}
+    
+    def groups_of(self, group_tag: int) -> List[Dict[str, List[Any]]]:
+        """Todos os grupos com a tag informada (ex.: um por trabalho no Get-Jobs)"""
+        return [attributes for tag, attributes in self.groups if tag == group_tag]
+    
+    def get(self, name: str, default=None):
+        """Primeiro valor de um atributo, procurado em todos os grupos"""
+        for _tag, attributes in self.groups:
+            values = attributes.get(name)
+            if values:
+                return values[0]
+        return default
+    
+    def get_all(self, name: str) -> List[Any]:
+        """Todos os valores de um atributo (primeiro grupo em que aparece)"""
+        for _tag, attributes in self.groups:
+            if name in attributes:
+                return attributes[name]
+        return []
+    
+    @property
+    def is_success(self) -> bool:
+        return self.status_code <= 0x00FF
+    
+    @property
+    def status_name(self) -> str:
+        return IPP_STATUS_CODES.get(self.status_code, f"0x{self.status_code:04X}")
+    
+    @property
+    def job_id(self) -> Optional[int]:
+        job_id = self.group(IPPTag.JOB).get("job-id") or self.group(IPPTag.OPERATION).get("job-id")
+        return job_id[0] if job_id and isinstance(job_id[0], int) else None
+    
+    @property
+    def job_state(self) -> Optional[int]:
+        job_state = self.group(IPPTag.JOB).get("job-state")
+        return job_state[0] if job_state else None
+    
+    @property
+    def job_state_reasons(self) -> List[str]:
+        return list(self.group(IPPTag.JOB).get("job-state-reasons", []))
+    
+    @property
+    def unsupported_attributes(self) -> Dict[str, List[Any]]:
+        return self.group(IPPTag.UNSUPPORTED)
+
+class IPPStreamBody:
+    """Corpo de requisição IPP transmitido em blocos, sem concatenar o documento ao cabeçalho"""
+    
+    def __init__(self, ipp_header: bytes, document, chunk_size: int = 64 * 1024):
+        """
+        Args:
+            ipp_header: Cabeçalho IPP já codificado (operação + atributos)
+            document: bytes, memoryview/mmap ou arquivo aberto em modo binário
+            chunk_size: Tamanho de cada bloco enviado
+        """
+        self.ipp_header = ipp_header
+        self.document = document
+        self.chunk_size = max(4096, int(chunk_size))
+    
+    def __len__(self):
+        # Permite que o requests envie Content-Length sem materializar o corpo
+        return len(self.ipp_header) + document_length(self.document)
+    
+    def __iter__(self):
+        return self.iter_chunks()
+    
+    def iter_chunks(self):
+        """Gera o cabeçalho e depois o documento em blocos (memoryview, sem cópia)"""
+        yield self.ipp_header
+        
+        if _is_document_file(self.document):
+            # Buffer reutilizável: cada bloco é enviado antes do próximo ser lido
+            self.document.seek(0)
+            buffer = bytearray(self.chunk_size)
+            view = memoryview(buffer)
+            while True:
+                read = self.document.readinto(buffer)
+                if not read:
+                    break
+                yield view[:read]
+            return
+        
+        view = memoryview(self.document).cast('B')
+        try:
+            for offset in range(0, view.nbytes, self.chunk_size):
+                yield view[offset:offset + self.chunk_size]
+        finally:
+            view.release()
+    
+    def chunked(self):
+        """
+        Retorna uma visão sem tamanho conhecido (Transfer-Encoding: chunked)
+        
+        Ao contrário de um gerador, pode ser iterada novamente caso a conexão
+        keep-alive precise ser reaberta.
+        """
+        return _ChunkedIPPStreamBody(self)
+
+class _ChunkedIPPStreamBody:
+    """Visão reiterável de um IPPStreamBody sem __len__"""
+    
+    def __init__(self, body: IPPStreamBody):
+        self.body = body
+    
+    def __iter__(self):
+        return self.body.iter_chunks()
+
+def _is_document_file(document) -> bool:
+    """Indica se o documento é um arquivo aberto (e não um buffer em memória/mmap)"""
+    return hasattr(document, 'read') and not isinstance(document, mmap.mmap)
+
+def document_length(document) -> int:
+    """Retorna o tamanho de um documento (bytes, memoryview, mmap ou arquivo) sem lê-lo"""
+    if _is_document_file(document):
+        return os.fstat(document.fileno()).st_size
+    return memoryview(document).nbytes
+
+def open_document_buffer(file_path: str):
+    """
+    Abre um documento para envio sem carregá-lo inteiro na memória
+    
+    Returns:
+        tuple: (arquivo, buffer) onde buffer é um mmap somente leitura ou o próprio arquivo
+    """
+    document_file = open(file_path, 'rb')
+    try:
+        return document_file, mmap.mmap(document_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        # Arquivo vazio ou mmap indisponível: transmite diretamente do arquivo
+        return document_file, document_file
+
+def close_document_buffer(document_file, document_buffer):
+    """Fecha o buffer/arquivo aberto por open_document_buffer"""
+    if isinstance(document_buffer, mmap.mmap):
+        try:
+            document_buffer.close()
+        except BufferError:
+            # Ainda há blocos referenciados; o mmap será liberado pelo coletor
+            logger.debug("mmap ainda em uso, liberação adiada")
+    try:
+        document_file.close()
+    except Exception:
+        pass
 
 def normalize_filename(filename):
     """Normaliza um nome de arquivo removendo acentos e caracteres especiais"""
@@ -726,41 +1442,27 @@ class IPPPrinter:
         if not check_dependencies():
             raise ImportError("Falha ao verificar/instalar dependências para impressão")
             
-        # Configuração de retry otimizada
-        retry_strategy = Retry(
-            total=2,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST"],
-            backoff_factor=0.5
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session = requests.Session()
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        self.session = session
         self.printer_ip = printer_ip
         self.port = port
         self.use_https = use_https
         self.protocol = "https" if use_https else "http"
         self.base_url = f"{self.protocol}://{printer_ip}:{port}"
         self.request_id = 1
+        self._request_id_lock = threading.Lock()
+        self._request_templates = {}
         self.config = config
 
         # === CORREÇÃO: Detecção automática de impressoras Epson ===
-        self.force_jpg_mode = False
-        self.is_epson_printer = self._is_epson_printer(printer_ip)
-        
-        if config and hasattr(config, 'get'):
-            # Lista expandida de IPs/modelos que devem usar apenas JPG
-            jpg_only_printers = [
-                "10.148.1.20",   # EPSON L14150 Series
-                "10.148.1.192",  # EPSON L3250 Series
-            ]
-            
-            if printer_ip in jpg_only_printers or self.is_epson_printer:
-                self.force_jpg_mode = True
-                logger.info(f"Impressora {printer_ip} configurada para usar apenas modo JPG (EPSON detectada)")
+        # O perfil é resolvido uma vez por impressora e reaproveitado por todos os envios
+        self.profile = PrinterProfileRegistry.get_instance().get_profile(printer_ip, config)
+        self.is_epson_printer = self.profile.is_epson
+        self.force_jpg_mode = self.profile.jpg_only
+        self._capabilities_queried = False
+        self.raster_format = raster_encoders.MIME_JPEG
+        self.last_printer_job_id = None
+        
+        if self.force_jpg_mode:
+            logger.info(f"Impressora {printer_ip} configurada para usar apenas modo JPG (EPSON detectada)")
         
         # Cache de endpoints
         self.endpoint_cache = PrinterEndpointCache(config) if config else None
@@ -782,37 +1484,48 @@ class IPPPrinter:
         logger.info(f"Fazendo discovery para {printer_ip}...")
         self._quick_discovery()
     
+    @property
+    def session(self):
+        """Sessão keep-alive compartilhada por todas as instâncias que usam este IP"""
+        return PrinterConnectionPool.get_instance().get_session(self.printer_ip)
+    
+    # Endpoints IPP mais comuns primeiro (ordem de preferência no discovery)
+    DISCOVERY_ENDPOINTS = [
+        "/ipp/print",
+        "/ipp", 
+        "/printers/ipp",
+        "/ipp/printer",
+        "/printer",
+        "/printers",
+        ""
+    ]
+    
+    # Atributos pedidos no discovery e na consulta de capacidades
+    CAPABILITY_ATTRIBUTES = [
+        "document-format-supported",
+        "printer-resolution-supported",
+        "sides-supported",
+        "media-supported",
+        "printer-make-and-model",
+        "multiple-document-jobs-supported",
+        "pwg-raster-document-resolution-supported",
+        "pwg-raster-document-type-supported",
+        "urf-supported",
+    ]
+    
     def _quick_discovery(self):
-        """Discovery rápido e otimizado testando ambos os protocolos"""
-        # Endpoints mais comuns primeiro
-        priority_endpoints = [
-            "/ipp/print",
-            "/ipp", 
-            "/printers/ipp",
-            "/ipp/printer",
-            "/printer",
-            "/printers",
-            ""
-        ]
-        
-        # === CORREÇÃO: Testa ambos os protocolos para cada endpoint ===
-        working_combinations = []
-        
-        logger.info(f"Testando discovery para {self.printer_ip} - verificando HTTP e HTTPS...")
+        """
+        Discovery paralelo e não destrutivo
         
-        # Testa todas as combinações possíveis
-        for endpoint in priority_endpoints:
-            # Testa HTTP
-            if self._test_endpoint_quick(endpoint, use_https=False):
-                working_combinations.append((endpoint, False, "http"))
-                logger.debug(f"HTTP funciona: {endpoint}")
-            
-            # Testa HTTPS
-            if self._test_endpoint_quick(endpoint, use_https=True):
-                working_combinations.append((endpoint, True, "https"))
-                logger.debug(f"HTTPS funciona: {endpoint}")
+        Envia Get-Printer-Attributes para as combinações endpoint × protocolo em
+        paralelo e fica com a resposta IPP bem-sucedida preferida (nada é
+        impresso). As capacidades que vêm na resposta já alimentam o perfil.
+        """
+        logger.info(f"Testando discovery para {self.printer_ip} - HTTP e HTTPS em paralelo...")
+        started = time.time()
         
-        if not working_combinations:
+        winner = self._probe_endpoints(self.DISCOVERY_ENDPOINTS)
+        if winner is None:
             # Fallback para endpoint padrão
             self.known_endpoint = "/ipp/print"
             self.use_https = False
@@ -821,182 +1534,134 @@ class IPPPrinter:
             logger.warning(f"Nenhum endpoint respondeu, usando fallback: {self.known_endpoint}")
             return
         
-        # === CORREÇÃO: Testa impressão real com cada combinação ===
-        logger.info(f"Encontradas {len(working_combinations)} combinações, testando impressão real...")
-        
-        for endpoint, use_https, protocol in working_combinations:
-            logger.info(f"Testando impressão real: {protocol.upper()}{endpoint}")
-            
-            # Configura temporariamente para este teste
-            self.known_endpoint = endpoint
-            self.use_https = use_https
-            self.protocol = protocol
-            self.base_url = f"{protocol}://{self.printer_ip}:{self.port}"
-            
-            # Testa com impressão real (teste pequeno)
-            if self._test_real_printing(endpoint, use_https):
-                logger.info(f"✓ Impressão confirmada: {protocol.upper()}{endpoint}")
-                self._save_to_cache(endpoint, use_https, True)
-                return
-            else:
-                logger.debug(f"✗ Falha na impressão: {protocol.upper()}{endpoint}")
-        
-        # Se nenhuma funcionou para impressão real, usa a primeira que respondeu HTTP
-        logger.warning("Nenhuma combinação funcionou para impressão real, usando primeira opção HTTP")
-        endpoint, use_https, protocol = working_combinations[0]
+        endpoint, use_https, ipp_response = winner
         self.known_endpoint = endpoint
         self.use_https = use_https
-        self.protocol = protocol
-        self.base_url = f"{protocol}://{self.printer_ip}:{self.port}"
+        self.protocol = "https" if use_https else "http"
+        self.base_url = f"{self.protocol}://{self.printer_ip}:{self.port}"
+        logger.info(f"✓ Endpoint IPP encontrado em {time.time() - started:.2f}s: {self.protocol.upper()}{endpoint}")
+        
+        if ipp_response.is_success:
+            self._save_to_cache(endpoint, use_https, True)
+            self._apply_printer_capabilities(ipp_response.group(IPPTag.PRINTER))
+    
+    def _probe_endpoints(self, endpoints: List[str], timeout: float = 3.0):
+        """
+        Consulta as combinações endpoint × protocolo em paralelo
+        
+        Muitas impressoras respondem Get-Printer-Attributes em qualquer caminho, então
+        a primeira resposta não decide: as respostas que chegam até discovery_grace
+        segundos depois dela são reunidas e vence a primeira na ordem de preferência
+        (DISCOVERY_ENDPOINTS, HTTP antes de HTTPS). As sondas rodam no máximo
+        discovery_max_parallel de cada vez, na mesma ordem, para não sobrecarregar
+        placas de rede frágeis.
+        
+        Returns:
+            (endpoint, use_https, IPPResponse) da resposta bem-sucedida preferida; sem
+            nenhuma, a primeira resposta IPP válida na ordem de preferência; ou None
+        """
+        combinations = [(endpoint, use_https) for endpoint in endpoints for use_https in (False, True)]
+        grace = float(self._get_performance_option("discovery_grace", 0.3))
+        max_parallel = max(1, int(self._get_performance_option("discovery_max_parallel", 4)))
+        stop_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(max_parallel, len(combinations)),
+                                      thread_name_prefix="ipp-discovery")
+        futures = {
+            executor.submit(self._probe_endpoint, endpoint, use_https, timeout, stop_event): (endpoint, use_https)
+            for endpoint, use_https in combinations
+        }
+        
+        def preferred(responses: Dict) -> Optional[Tuple[str, bool]]:
+            return next((combination for combination in combinations if combination in responses), None)
+        
+        successes = {}
+        answered = {}
+        pending = set(futures)
+        # Sondas na fila começam quando outras terminam: o prazo total cobre até duas rodadas
+        deadline = time.monotonic() + timeout * 2 + 1
+        first_success_at = None
+        try:
+            while pending:
+                limit = deadline if first_success_at is None else min(deadline, first_success_at + grace)
+                remaining = limit - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = concurrent.futures.wait(pending, timeout=remaining,
+                                                        return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    ipp_response = future.result()
+                    if ipp_response is None:
+                        continue
+                    if ipp_response.is_success:
+                        successes[futures[future]] = ipp_response
+                        first_success_at = first_success_at or time.monotonic()
+                    else:
+                        answered[futures[future]] = ipp_response
+                
+                # Nenhuma combinação ainda pendente seria preferida à melhor resposta já recebida
+                best = preferred(successes)
+                if best is not None and all(combinations.index(futures[future]) > combinations.index(best)
+                                            for future in pending):
+                    break
+            
+            if not successes and not answered:
+                logger.debug(f"Discovery de {self.printer_ip}: sem resposta")
+        finally:
+            # As demais tentativas são descartadas; as que estão em andamento param no timeout
+            stop_event.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        for responses in (successes, answered):
+            best = preferred(responses)
+            if best is not None:
+                return best[0], best[1], responses[best]
+        return None
     
-    def _test_endpoint_quick(self, endpoint: str, use_https: bool) -> bool:
-        """Teste rápido de endpoint (timeout reduzido)"""
+    def _probe_endpoint(self, endpoint: str, use_https: bool, timeout: float,
+                        stop_event: threading.Event) -> Optional[IPPResponse]:
+        """Get-Printer-Attributes em uma combinação; None se não houver resposta IPP"""
+        if stop_event.is_set():
+            return None
+        
         protocol = "https" if use_https else "http"
         url = f"{protocol}://{self.printer_ip}:{self.port}{endpoint}"
+        attributes = {
+            "printer-uri": f"{'ipps' if use_https else 'ipp'}://{self.printer_ip}:{self.port}{endpoint}",
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+            "requested-attributes": self.CAPABILITY_ATTRIBUTES,
+        }
+        headers = {
+            'Content-Type': 'application/ipp',
+            'Accept': 'application/ipp',
+            'Connection': 'close',
+            'User-Agent': 'PDF-IPP-Rigorous/1.0'
+        }
         
         try:
-            response = requests.get(
+            # Conexão própria: as sondas não ocupam a sessão keep-alive compartilhada
+            response = requests.post(
                 url,
-                timeout=3,  # Timeout reduzido
+                data=self._build_ipp_request(IPPOperation.GET_PRINTER_ATTRIBUTES, attributes),
+                headers=headers,
+                timeout=timeout,
                 verify=False,
                 allow_redirects=False
             )
-            
-            # Considera sucesso códigos que indicam que o endpoint existe
-            return response.status_code in [200, 400, 401, 403, 404, 405, 426]
-            
-        except requests.exceptions.ConnectionError as e:
-            # Se Connection Reset e testando HTTP, pode precisar de HTTPS
-            if ("10054" in str(e) or "Connection aborted" in str(e)) and not use_https:
-                return False  # Vai testar HTTPS na próxima rodada
-            return False
-        except:
-            return False
+        except requests.exceptions.RequestException:
+            return None
+        
+        ipp_response = IPPResponse.from_http_response(response)
+        if ipp_response is not None:
+            logger.debug(f"Discovery {protocol.upper()}{endpoint}: {ipp_response.status_name}")
+        return ipp_response
 
-    def _test_real_printing(self, endpoint: str, use_https: bool) -> bool:
-        """Testa impressão real com dados mínimos para validar o endpoint"""
-        try:
-            protocol = "https" if use_https else "http"
-            url = f"{protocol}://{self.printer_ip}:{self.port}{endpoint}"
-            
-            # Cria URI IPP correto
-            if use_https:
-                printer_uri = url.replace("https://", "ipps://", 1)
-            else:
-                printer_uri = url.replace("http://", "ipp://", 1)
-            
-            # Cria uma requisição IPP mínima para teste (sem documento)
-            attributes = {
-                "printer-uri": printer_uri,
-                "requesting-user-name": "test",
-                "job-name": "test_connection",
-                "document-format": "application/pdf",
-                "ipp-attribute-fidelity": False,
-                "copies": 1
-            }
-            
-            # Dados PDF mínimos (PDF vazio válido)
-            minimal_pdf = b"""%%PDF-1.4
-1 0 obj
-<<
-/Type /Catalog
-/Pages 2 0 R
->>
-endobj
-
-2 0 obj
-<<
-/Type /Pages
-/Kids [3 0 R]
-/Count 1
->>
-endobj
-
-3 0 obj
-<<
-/Type /Page
-/Parent 2 0 R
-/MediaBox [0 0 612 792]
->>
-endobj
-
-xref
-0 4
-0000000000 65535 f 
-0000000009 00000 n 
-0000000074 00000 n 
-0000000120 00000 n 
-trailer
-<<
-/Size 4
-/Root 1 0 R
->>
-startxref
-190
-%%EOF"""
-            
-            # Constrói requisição IPP
-            ipp_request = self._build_ipp_request(IPPOperation.PRINT_JOB, attributes)
-            ipp_request += minimal_pdf
-            
-            headers = {
-                'Content-Type': 'application/ipp',
-                'Accept': 'application/ipp',
-                'Connection': 'close',
-                'User-Agent': 'PDF-IPP-Test/1.0'
-            }
-            
-            # Testa com timeout muito baixo
-            response = requests.post(
-                url, 
-                data=ipp_request, 
-                headers=headers, 
-                timeout=5,  # Timeout baixo para teste
-                verify=False,
-                allow_redirects=False
-            )
-            
-            # Verifica se a resposta indica que a impressora aceita trabalhos
-            if response.status_code == 200:
-                # Verifica resposta IPP
-                if len(response.content) >= 8:
-                    status_code = struct.unpack('>H', response.content[2:4])[0]
-                    # Status codes que indicam que a impressora funcionou
-                    # (mesmo que rejeite o trabalho por outros motivos)
-                    valid_statuses = [
-                        0x0000,  # successful-ok
-                        0x0001,  # successful-ok-ignored-or-substituted-attributes
-                        0x0002,  # successful-ok-conflicting-attributes
-                        0x0400,  # client-error-bad-request (mas IPP funcionou)
-                        0x040A,  # document-format-not-supported (mas IPP funcionou)
-                        0x040B,  # attributes-or-values-not-supported (mas IPP funcionou)
-                    ]
-                    
-                    if status_code in valid_statuses:
-                        logger.debug(f"Teste real bem-sucedido: {protocol.upper()}{endpoint} (status: 0x{status_code:04X})")
-                        return True
-                    else:
-                        logger.debug(f"Teste real falhou: {protocol.upper()}{endpoint} (status: 0x{status_code:04X})")
-                        return False
-            
-            logger.debug(f"Teste real falhou: {protocol.upper()}{endpoint} (HTTP: {response.status_code})")
-            return False
-            
-        except requests.exceptions.Timeout:
-            logger.debug(f"Timeout no teste real: {protocol.upper()}{endpoint}")
-            return False
-        except requests.exceptions.ConnectionError:
-            logger.debug(f"Erro de conexão no teste real: {protocol.upper()}{endpoint}")
-            return False
-        except Exception as e:
-            logger.debug(f"Erro no teste real {protocol.upper()}{endpoint}: {e}")
-            return False
-
-    def _save_to_cache(self, endpoint: str, use_https: bool, success: bool):
-        """Salva configuração no cache"""
-        if self.endpoint_cache:
-            self.endpoint_cache.save_printer_endpoint_config(
-                self.printer_ip, endpoint, use_https, success
+    def _save_to_cache(self, endpoint: str, use_https: bool, success: bool):
+        """Salva configuração no cache"""
+        if self.endpoint_cache:
+            self.endpoint_cache.save_printer_endpoint_config(
+                self.printer_ip, endpoint, use_https, success
             )
 
     def _discover_printer_endpoints(self):
@@ -1135,6 +1800,12 @@ startxref
             return False, {"error": "Arquivo não encontrado"}
         
         file_extension = os.path.splitext(file_path)[1].lower()
+        if file_extension == '.ps':
+            # PostScript da impressora virtual para impressoras só-raster: uma passada do Ghostscript
+            job_name = normalize_filename(job_name or os.path.basename(file_path))
+            logger.info(f"Preparando impressão direta de PostScript: {job_name}")
+            return self._print_postscript_as_raster(file_path, job_name, options, progress_callback, job_info)
+        
         if file_extension != '.pdf':
             logger.error(f"Erro: Arquivo deve ser PDF (.pdf), recebido: {file_extension}")
             return False, {"error": "Arquivo deve ser PDF"}
@@ -1145,18 +1816,40 @@ startxref
         job_name = normalize_filename(job_name)
         logger.info(f"Preparando impressão otimizada de: {job_name}")
         
-        # Lê o arquivo PDF
+        # Abre o PDF mapeado em memória: o envio é feito em blocos, sem cópias do arquivo inteiro
         try:
-            with open(file_path, 'rb') as f:
-                pdf_data = f.read()
+            document_file, pdf_data = open_document_buffer(file_path)
         except Exception as e:
             logger.error(f"Erro ao ler arquivo: {e}")
             return False, {"error": f"Erro ao ler arquivo: {e}"}
         
-        logger.info(f"Tamanho do arquivo: {len(pdf_data):,} bytes")
+        try:
+            logger.info(f"Tamanho do arquivo: {os.path.getsize(file_path):,} bytes")
+            return self._print_document(file_path, pdf_data, job_name, options, progress_callback, job_info)
+        finally:
+            close_document_buffer(document_file, pdf_data)
+    
+    def _print_document(self, file_path: str, pdf_data, job_name: str, options: PrintOptions,
+                        progress_callback=None, job_info: Optional[PrintJobInfo] = None) -> Tuple[bool, Dict]:
+        """Executa as tentativas de impressão (PDF, JPG e rediscovery) para um documento já aberto"""
+        # Formato decidido pelas capacidades da impressora: evita a tentativa PDF em impressoras só-JPG
+        self._ensure_printer_capabilities()
+        document_format = self._choose_document_format()
+        if document_format != "pdf":
+            logger.info("Impressora não aceita PDF (capacidades/perfil) - enviando direto como JPG")
+        elif self._completed_page_keys(job_info):
+            # Retomada: só o modo por página consegue enviar apenas as páginas que faltam
+            logger.info("Trabalho retomado com páginas já impressas - enviando apenas as páginas restantes como JPG")
+            document_format = "jpg"
+        
+        if document_format == "pdf" and options.page_ranges:
+            # Seleção de páginas: o PDF enviado contém só as páginas escolhidas
+            pdf_data = self._selected_pdf_data(file_path, pdf_data, options)
+            if pdf_data is None:
+                return False, {"error": f"Nenhuma página do documento em '{options.page_ranges}'"}
         
         # === CORREÇÃO: Tentativa prioritária com endpoint conhecido ===
-        if self.known_endpoint is not None:
+        if self.known_endpoint is not None and document_format == "pdf":
             logger.info(f"Tentativa 1: PDF usando endpoint conhecido ({self.protocol.upper()}{self.known_endpoint})")
             if progress_callback:
                 progress_callback(f"Tentativa 1: PDF usando {self.protocol.upper()}{self.known_endpoint}...")
@@ -1219,7 +1912,20 @@ startxref
             "rediscovery_attempts": 1
         }
     
-    def _print_as_pdf_optimized(self, pdf_data: bytes, job_name: str, options: PrintOptions) -> bool:
+    def _selected_pdf_data(self, file_path: str, pdf_data, options: PrintOptions):
+        """PDF só com as páginas selecionadas (o próprio documento se todas foram escolhidas; None se nenhuma)"""
+        document_pages = self._get_pdf_page_count(file_path, PopplerManager.setup_poppler())
+        selected_pages = options.selected_pages(document_pages)
+        if not selected_pages:
+            return None
+        if len(selected_pages) == document_pages:
+            return pdf_data
+        
+        from src.utils.pdf import PDFUtils
+        logger.info(f"Extraindo {len(selected_pages)} de {document_pages} página(s) para o envio PDF: {options.page_ranges}")
+        return PDFUtils.extract_pages(file_path, selected_pages)
+    
+    def _print_as_pdf_optimized(self, pdf_data, job_name: str, options: PrintOptions) -> bool:
         """Impressão PDF com detecção inteligente para impressoras Epson - VERSÃO CORRIGIDA PARA L3250"""
         if self.known_endpoint is None:
             return False
@@ -1229,7 +1935,7 @@ startxref
             return False
         
         # === CORREÇÃO CRÍTICA: Detecta impressoras Epson L3250 e outras problemáticas ===
-        if hasattr(self, 'printer_ip') and self._is_epson_printer(self.printer_ip):
+        if self.profile.is_epson:
             logger.info(f"EPSON detectada ({self.printer_ip}) - forçando modo JPG para máxima compatibilidade")
             return False  # Força usar modo JPG
         
@@ -1259,7 +1965,7 @@ startxref
         
         if options.color_mode != ColorMode.AUTO:
             attributes["print-color-mode"] = options.color_mode.value
-        if options.duplex != Duplex.SIMPLES:
+        if options.duplex != Duplex.SIMPLES and self.profile.supports_sides(options.duplex.value):
             attributes["sides"] = options.duplex.value
         
         # Tentativas limitadas para PDF
@@ -1285,115 +1991,81 @@ startxref
         return False
 
     def _verify_ipp_response_epson_compatible(self, response):
-        """Verificação RIGOROSA da resposta IPP - CORRIGIDA"""
-        try:
-            logger.debug(f"=== VERIFICAÇÃO RIGOROSA IPP ===")
-            logger.debug(f"Status HTTP: {response.status_code}")
-            logger.debug(f"Tamanho da resposta: {len(response.content)} bytes")
-            
-            # REQUISITO 1: HTTP deve ser 200
-            if response.status_code != 200:
-                logger.debug(f"✗ FALHA: HTTP {response.status_code} (requerido: 200)")
-                return False
-            
-            # REQUISITO 2: Resposta deve ter conteúdo mínimo IPP
-            if len(response.content) < 8:
-                logger.debug(f"✗ FALHA: Resposta muito pequena ({len(response.content)} bytes)")
-                return False
-            
-            # REQUISITO 3: Deve ter estrutura IPP válida
-            version = struct.unpack('>H', response.content[0:2])[0]
-            status_code = struct.unpack('>H', response.content[2:4])[0]
-            request_id = struct.unpack('>I', response.content[4:8])[0]
-            
-            logger.debug(f"IPP: version=0x{version:04X}, status=0x{status_code:04X}, request_id={request_id}")
-            
-            # REQUISITO 4: Status deve ser de SUCESSO REAL
-            success_codes = [
-                0x0000,  # successful-ok
-                0x0001,  # successful-ok-ignored-or-substituted-attributes
-                0x0002,  # successful-ok-conflicting-attributes
-            ]
-            
-            if status_code not in success_codes:
-                logger.debug(f"✗ FALHA: Status IPP 0x{status_code:04X} não é sucesso")
-                return False
-            
-            # REQUISITO 5: DEVE ter job-id na resposta (prova de que foi aceito)
-            response_content = response.content.lower()
-            if b'job-id' not in response_content:
-                logger.debug(f"✗ FALHA CRÍTICA: Sem job-id na resposta - impressão NÃO foi aceita")
-                logger.debug(f"Conteúdo: {response.content[:200]}...")
-                return False
-            
-            # REQUISITO 6: Verificação adicional de conteúdo válido
-            if len(response.content) < 50:  # Resposta muito pequena para ter job-id real
-                logger.debug(f"✗ FALHA: Resposta muito pequena para conter job-id válido")
-                return False
-            
-            logger.debug(f"✓ SUCESSO CONFIRMADO: Status 0x{status_code:04X} com job-id presente")
-            return True
-            
-        except Exception as e:
-            logger.debug(f"✗ ERRO na verificação IPP: {e}")
+        """Verificação RIGOROSA da resposta IPP: status de sucesso E job-id atribuído"""
+        ipp_response = IPPResponse.from_http_response(response)
+        if ipp_response is None:
+            logger.debug(f"✗ FALHA: resposta não é IPP válida (HTTP {getattr(response, 'status_code', None)})")
             return False
-
-    def _is_epson_printer(self, printer_ip: str) -> bool:
-        """Detecta se é uma impressora Epson que precisa de tratamento especial"""
-        # IPs conhecidos de impressoras Epson problemáticas
-        known_epson_ips = [
-            "10.148.1.20",   # EPSON L14150 Series
-            "10.148.1.192",  # EPSON L3250 Series
-        ]
         
-        if printer_ip in known_epson_ips:
-            return True
+        logger.debug(f"IPP: version=0x{ipp_response.version:04X}, status={ipp_response.status_name}, "
+                     f"request_id={ipp_response.request_id}")
         
-        # Verifica se é Epson através de discovery/teste rápido
-        try:
-            # Faz uma requisição HTTP simples para tentar identificar o modelo
-            test_url = f"http://{printer_ip}:80"
-            response = requests.get(test_url, timeout=3, verify=False)
-            if response.status_code == 200:
-                content = response.text.lower()
-                if "epson" in content and ("l3250" in content or "l14150" in content or "series" in content):
-                    return True
-        except:
-            pass
+        if ipp_response.unsupported_attributes:
+            logger.debug(f"Atributos não suportados pela impressora: {list(ipp_response.unsupported_attributes)}")
         
-        return False
+        if not ipp_response.is_success:
+            logger.debug(f"✗ FALHA: Status IPP {ipp_response.status_name} não é sucesso")
+            return False
+        
+        # DEVE ter job-id na resposta (prova de que foi aceito)
+        if ipp_response.job_id is None:
+            logger.debug("✗ FALHA CRÍTICA: Sem job-id na resposta - impressão NÃO foi aceita")
+            return False
+        
+        self.last_printer_job_id = ipp_response.job_id
+        
+        logger.debug(f"✓ SUCESSO CONFIRMADO: {ipp_response.status_name}, job-id {ipp_response.job_id}, "
+                     f"estado {IPP_JOB_STATE_NAMES.get(ipp_response.job_state, ipp_response.job_state)}")
+        return True
 
     def _convert_and_print_as_jpg_optimized(self, pdf_path: str, job_name: str, options: PrintOptions, 
                                         progress_callback=None, job_info: Optional[PrintJobInfo] = None) -> Tuple[bool, Dict]:
         """Conversão e impressão JPG com processamento otimizado para EPSON"""
         
-        temp_folder = None
+        workspace = None
         
         try:
             # === CORREÇÃO ESPECÍFICA PARA EPSON: Log detalhado ===
-            is_epson = self._is_epson_printer(getattr(self, 'printer_ip', ''))
+            is_epson = self.profile.is_epson
             conversion_mode = "EPSON-OTIMIZADO" if is_epson else "PADRÃO"
+            self.raster_format = self._choose_raster_format(options)
             
-            logger.info(f"Convertendo PDF para JPG com otimizações {conversion_mode}...")
+            logger.info(f"Convertendo PDF para {self.raster_format} com otimizações {conversion_mode}...")
             if progress_callback:
                 progress_callback(f"Convertendo PDF para JPG (modo {conversion_mode.lower()})...")
             
-            import pdf2image
-            from PIL import Image
-            
             job_name = normalize_filename(job_name)
             base_name = os.path.splitext(os.path.basename(pdf_path))[0]
             safe_base_name = normalize_filename(base_name)
-            temp_folder = self._create_temp_folder(safe_base_name)
+            memory_budget_mb = self._get_performance_option("page_memory_budget_mb", 256)
+            workspace = PrintWorkspace(safe_base_name, memory_budget_mb * 1024 * 1024)
+            
+            # Validate-Job opcional: descobre uma recusa antes de gastar tempo rasterizando
+            if self._get_performance_option("validate_job", False) and not self._validate_jpg_job(job_name, options):
+                return False, {"error": "Impressora recusou o trabalho JPG (Validate-Job)"}
             
             # === CORREÇÃO ESPECÍFICA PARA EPSON: Configuração para conversão otimizada ===
             poppler_path = PopplerManager.setup_poppler()
             
+            document_pages = self._get_pdf_page_count(pdf_path, poppler_path)
+            if not document_pages:
+                logger.error("Falha na conversão PDF para JPG")
+                return False, {"error": "Falha na conversão PDF para JPG"}
+            
+            # Só as páginas selecionadas são rasterizadas; no trabalho elas são numeradas 1..N
+            selected_pages = options.selected_pages(document_pages)
+            if not selected_pages:
+                return False, {"error": f"Nenhuma página do documento ({document_pages}) em '{options.page_ranges}'"}
+            total_pages = len(selected_pages)
+            if total_pages < document_pages:
+                logger.info(f"Imprimindo {total_pages} de {document_pages} página(s): {options.page_ranges}")
+            
+            # Cada janela é rasterizada por um processo próprio; o paralelismo vem do pipeline
             convert_kwargs = {
-                'pdf_path': pdf_path,
-                'dpi': min(options.dpi, 150) if is_epson else min(options.dpi, 200),  # DPI menor para Epson
-                'fmt': 'jpeg',
-                'thread_count': 1 if is_epson else min(4, os.cpu_count() or 2),  # Single thread para Epson
+                'dpi': self.profile.best_dpi(options.dpi, self.raster_format),  # DPI suportado (menor para Epson)
+                # PWG/URF são codificados a partir de um bitmap sem perdas
+                'fmt': 'jpeg' if self.raster_format == raster_encoders.MIME_JPEG else 'ppm',
+                'thread_count': 1,
                 'use_pdftocairo': True,
                 'grayscale': options.color_mode == ColorMode.MONOCROMO
             }
@@ -1401,119 +2073,828 @@ startxref
             if poppler_path:
                 convert_kwargs['poppler_path'] = poppler_path
             
-            # Conversão otimizada
-            start_time = time.time()
-            images = pdf2image.convert_from_path(**convert_kwargs)
-            conversion_time = time.time() - start_time
+            # Páginas já rasterizadas com os mesmos parâmetros vêm do cache (reimpressões e retentativas)
+            page_cache = RasterPageCache.get_instance()
+            document_digest = page_cache.file_digest(pdf_path) if page_cache.enabled else None
+            jpg_quality = self._get_jpg_quality(options)
+            cache_hits = []
+            
+            def page_cache_key(page_num: int) -> str:
+                color_key = options.color_mode.value
+                if page_encoding.detects_grayscale:
+                    color_key += f"+gray{page_encoding.grayscale_threshold}"
+                if page_encoding.blank_threshold > 0:
+                    # Página em branco fica no cache como entrada vazia, válida só para o mesmo limite
+                    color_key += f"+blank{page_encoding.blank_threshold}"
+                quality_key = jpg_quality
+                if page_encoding.byte_budget:
+                    quality_key = f"{jpg_quality}<{page_encoding.byte_budget}"
+                return page_cache.make_key(document_digest, page_num, convert_kwargs['dpi'],
+                                           color_key, quality_key,
+                                           self.profile.profile_name, self.raster_format)
+            
+            raster_pool = RasterProcessPool.get_instance()
+            page_encoding = self._page_encoding(options, is_epson, dpi=convert_kwargs['dpi'])
+            # Poppler ou Ghostscript, conforme a medição feita neste computador
+            rasterizer = RasterizerRegistry.get_instance().get_rasterizer(poppler_path)
+            logger.debug(f"Backend de rasterização: {rasterizer.name}")
+            
+            # Retomada: páginas já impressas em todas as cópias nem são rasterizadas
+            done_pages = self._fully_printed_pages(job_info, total_pages, options.copies)
+            
+            def produce_window(first_page: int, last_page: int) -> List[PageJob]:
+                # Posição no trabalho -> página do documento
+                positions = {selected_pages[index - 1]: index for index in range(first_page, last_page + 1)
+                             if index not in done_pages}
+                pages = sorted(positions)
+                cached = {}
+                if document_digest:
+                    for page_num in pages:
+                        data = page_cache.get(page_cache_key(page_num))
+                        if data is not None:
+                            cached[page_num] = data
+                    cache_hits.extend(cached)
+                
+                missing = [page_num for page_num in pages if page_num not in cached]
+                encoded = dict(cached)
+                if missing and len(missing) > 1 and raster_pool.is_active:
+                    # Vários núcleos: cada processo rasteriza e codifica um intervalo da janela
+                    try:
+                        rasterized = raster_pool.rasterize(pdf_path, missing, convert_kwargs, page_encoding,
+                                                           rasterizer)
+                        for page_num in missing:
+                            encoded[page_num] = rasterized[page_num]
+                            if document_digest:
+                                page_cache.put(page_cache_key(page_num), rasterized[page_num])
+                        missing = []
+                    except Exception as e:
+                        logger.warning(f"Pool de rasterização falhou ({e}) - convertendo no processo atual")
+                        missing = [page_num for page_num in missing if page_num not in encoded]
+                
+                if missing:
+                    with RasterizationLimiter.get_instance().slot():
+                        # Um intervalo por trecho contíguo: páginas fora da seleção nem são rasterizadas
+                        for run_first, run_last in split_ranges(missing, 1):
+                            rendered = rasterizer.render(pdf_path, run_first, run_last, convert_kwargs,
+                                                         page_encoding, save=workspace.encode)
+                            for page_num, data in rendered:
+                                encoded[page_num] = data
+                                if document_digest:
+                                    page_cache.put(page_cache_key(page_num), encoded[page_num])
+                
+                return [
+                    self._build_page_job(encoded[page_num], positions[page_num], total_pages, safe_base_name,
+                                         job_name, workspace)
+                    for page_num in sorted(encoded)
+                ]
             
-            if not images:
-                logger.error("Falha na conversão PDF para JPG")
-                return False, {"error": "Falha na conversão PDF para JPG"}
+            window_size = self._get_performance_option("pipeline_window_pages", 2)
+            queue_depth = self._get_performance_option("pipeline_queue_depth", 4)
+            if raster_pool.is_active:
+                # Janela com páginas para todos os processos do pool
+                window_size = max(window_size, raster_pool.workers * 2)
+                queue_depth = max(queue_depth, window_size)
+            
+            pipeline = PagePipeline(
+                total_pages,
+                produce_window,
+                window_size=window_size,
+                queue_depth=queue_depth
+            )
             
-            logger.info(f"Convertido {len(images)} página(s) em {conversion_time:.2f}s (modo {conversion_mode})")
+            logger.info(f"Pipeline de páginas iniciado: {total_pages} página(s) (modo {conversion_mode})")
             if progress_callback:
-                progress_callback(f"Convertido {len(images)} páginas em {conversion_time:.2f}s")
-            
-            # Processamento em lote de páginas
-            page_jobs = self._prepare_pages_batch(
-                images, safe_base_name, job_name, temp_folder, options
-            )
+                progress_callback(f"Convertendo e enviando {total_pages} página(s)...")
             
-            # Processamento otimizado de páginas
-            return self._process_pages_parallel(page_jobs, options, progress_callback, job_info)
+            pipeline.start()
+            try:
+                # Processamento otimizado de páginas (consome o pipeline à medida que as páginas ficam prontas)
+                return self._process_pages(pipeline, options, progress_callback, job_info, job_name=job_name)
+            finally:
+                pipeline.close()
+                if cache_hits:
+                    logger.info(f"{len(cache_hits)} de {total_pages} página(s) reaproveitadas do cache de rasterização")
+                if workspace.spilled_pages:
+                    logger.info(f"{workspace.spilled_pages} página(s) descarregadas em disco (orçamento de memória: {memory_budget_mb} MB)")
             
         except Exception as e:
             logger.error(f"Erro na conversão/preparação JPG: {e}")
-            if temp_folder and os.path.exists(temp_folder):
-                logger.info(f"Imagens parciais mantidas em: {temp_folder}")
             return False, {"error": f"Erro na conversão/preparação JPG: {e}"}
+        finally:
+            # A área temporária pertence ao job: é removida ao final, com ou sem sucesso
+            if workspace:
+                workspace.cleanup()
 
-    def _prepare_pages_batch(self, images: List, safe_base_name: str, job_name: str, 
-                        temp_folder: str, options: PrintOptions) -> List[PageJob]:
-        """Prepara páginas em lote com otimizações específicas para EPSON"""
-        page_jobs = []
-        
-        # === CORREÇÃO ESPECÍFICA PARA EPSON: Configurações otimizadas ===
-        is_epson = self._is_epson_printer(getattr(self, 'printer_ip', ''))
+    def _print_postscript_as_raster(self, ps_path: str, job_name: str, options: PrintOptions,
+                                    progress_callback=None, job_info: Optional[PrintJobInfo] = None) -> Tuple[bool, Dict]:
+        """
+        Rasteriza um PostScript numa única execução do Ghostscript e envia as páginas
         
-        for page_num, image in enumerate(images, 1):
-            # === CORREÇÃO PARA EPSON: Processamento de imagem otimizado ===
-            if is_epson:
-                # Epson L3250 funciona melhor com RGB
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # Remove transparência se existir (Epson não lida bem)
-                if image.mode == 'RGBA':
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[-1])
-                    image = background
-            else:
-                # Processamento padrão para outras impressoras
-                if options.color_mode == ColorMode.MONOCROMO:
-                    image = image.convert('L')
-                elif image.mode not in ['RGB', 'L']:
-                    image = image.convert('RGB')
-            
-            # Nome do arquivo otimizado
-            if len(images) > 1:
-                image_filename = f"{safe_base_name}_p{page_num:02d}.jpg"
-                page_job_name = f"{normalize_filename(job_name)}_p{page_num:02d}"
-            else:
-                image_filename = f"{safe_base_name}.jpg"
-                page_job_name = normalize_filename(job_name)
-            
-            image_path = os.path.join(temp_folder, image_filename)
-            
-            # === CORREÇÃO PARA EPSON: Qualidade e configurações específicas ===
-            if is_epson:
-                # Epson L3250 funciona melhor com qualidade mais baixa e sem otimização
-                jpg_quality = 75  # Qualidade menor para compatibilidade
-                save_kwargs = {
-                    'format': 'JPEG',
-                    'quality': jpg_quality,
-                    'optimize': False,  # Sem otimização para Epson
-                    'progressive': False,  # Sem JPEG progressivo
-                }
-            else:
-                # Configurações padrão para outras impressoras
-                jpg_quality = 85 if options.quality == Quality.ALTA else 75
-                save_kwargs = {
-                    'format': 'JPEG',
-                    'quality': jpg_quality,
-                    'optimize': True
-                }
+        As páginas saem do Ghostscript já codificadas (JPEG/PWG) e seguem pelo
+        mesmo pipeline e envio do modo JPG, sem a conversão intermediária para PDF.
+        """
+        rasterizer = RasterizerRegistry.get_instance().get_ghostscript()
+        if rasterizer is None:
+            return False, {"error": "Ghostscript não disponível para imprimir PostScript"}
+        
+        # %%Pages fica no cabeçalho ou, com "(atend)", no trailer
+        with open(ps_path, 'rb') as f:
+            head = f.read(65536)
+            f.seek(max(0, os.path.getsize(ps_path) - 65536))
+            tail = f.read()
+        document_pages = postscript_page_count(head) or postscript_page_count(tail)
+        if not document_pages:
+            return False, {"error": "PostScript sem contagem de páginas (%%Pages)"}
+        
+        selected_pages = options.selected_pages(document_pages)
+        if not selected_pages:
+            return False, {"error": f"Nenhuma página do documento ({document_pages}) em '{options.page_ranges}'"}
+        total_pages = len(selected_pages)
+        
+        workspace = None
+        rendered = None
+        try:
+            self._ensure_printer_capabilities()
+            self.raster_format = self._choose_raster_format(options)
+            is_epson = self.profile.is_epson
+            
+            safe_base_name = normalize_filename(os.path.splitext(os.path.basename(ps_path))[0])
+            memory_budget_mb = self._get_performance_option("page_memory_budget_mb", 256)
+            workspace = PrintWorkspace(safe_base_name, memory_budget_mb * 1024 * 1024)
+            
+            dpi = self.profile.best_dpi(options.dpi, self.raster_format)
+            page_encoding = self._page_encoding(options, is_epson, dpi=dpi)
+            done_pages = self._fully_printed_pages(job_info, total_pages, options.copies)
+            # Posição no trabalho -> página do documento
+            positions = {page_num: index for index, page_num in enumerate(selected_pages, 1)
+                         if index not in done_pages}
+            
+            # PostScript não permite pular páginas: uma única execução interpreta todas, em ordem,
+            # e só as selecionadas são codificadas
+            rendered = rasterizer.render_document(ps_path, dpi, page_encoding, save=workspace.encode,
+                                                  skip=set(range(1, document_pages + 1)) - set(positions),
+                                                  expected_pages=document_pages)
+            next_page = []
+            
+            def produce_window(first_page: int, last_page: int) -> List[PageJob]:
+                page_jobs = []
+                with RasterizationLimiter.get_instance().slot():
+                    while True:
+                        if not next_page:
+                            item = next(rendered, None)
+                            if item is None:
+                                break
+                            next_page.append(item)
+                        page_num, data = next_page[0]
+                        if page_num > selected_pages[last_page - 1]:
+                            break
+                        next_page.pop()
+                        page_jobs.append(self._build_page_job(data, positions[page_num], total_pages,
+                                                              safe_base_name, job_name, workspace))
+                return page_jobs
+            
+            pipeline = PagePipeline(
+                total_pages,
+                produce_window,
+                window_size=self._get_performance_option("pipeline_window_pages", 2),
+                queue_depth=self._get_performance_option("pipeline_queue_depth", 4)
+            )
             
-            image.save(image_path, **save_kwargs)
+            logger.info(f"PostScript → {self.raster_format} em uma passada: {total_pages} página(s)")
+            if progress_callback:
+                progress_callback(f"Rasterizando e enviando {total_pages} página(s)...")
             
-            # Lê dados
-            with open(image_path, 'rb') as f:
-                jpg_data = f.read()
+            pipeline.start()
+            try:
+                return self._process_pages(pipeline, options, progress_callback, job_info, job_name=job_name)
+            finally:
+                pipeline.close()
             
-            page_job = PageJob(
-                page_num=page_num,
-                image_path=image_path,
-                jpg_data=jpg_data,
-                job_name=page_job_name,
-                max_attempts=7 if is_epson else 2  # Mais tentativas para Epson
-            )
-            page_jobs.append(page_job)
+        except Exception as e:
+            logger.error(f"Erro na impressão direta do PostScript: {e}")
+            return False, {"error": f"Erro na impressão direta do PostScript: {e}"}
+        finally:
+            if rendered is not None:
+                # Encerra o Ghostscript se o envio terminou antes (cancelamento/erro)
+                rendered.close()
+            if workspace:
+                workspace.cleanup()
+    
+    def _get_pdf_page_count(self, pdf_path: str, poppler_path: Optional[str] = None) -> int:
+        """Obtém o número de páginas do PDF sem rasterizá-lo"""
+        try:
+            import pdf2image
+            info = pdf2image.pdfinfo_from_path(pdf_path, poppler_path=poppler_path)
+            return int(info.get("Pages", 0))
+        except Exception as e:
+            logger.debug(f"pdfinfo indisponível ({e}), usando pypdf")
+        
+        try:
+            from src.utils.pdf import PDFUtils
+            return int(PDFUtils.get_pdf_info(pdf_path).get("pages", 0))
+        except Exception as e:
+            logger.error(f"Não foi possível contar as páginas do PDF: {e}")
+            return 0
+    
+    def _prepare_pages_batch(self, images: List, safe_base_name: str, job_name: str, 
+                        workspace: 'PrintWorkspace', options: PrintOptions) -> List[PageJob]:
+        """Prepara páginas em lote com otimizações específicas para EPSON"""
+        # === CORREÇÃO ESPECÍFICA PARA EPSON: Configurações otimizadas ===
+        is_epson = self.profile.is_epson
+        
+        page_jobs = [
+            self._prepare_page(image, page_num, len(images), safe_base_name,
+                               job_name, workspace, options, is_epson)
+            for page_num, image in enumerate(images, 1)
+        ]
         
         logger.info(f"Preparadas {len(page_jobs)} páginas para impressão (EPSON: {is_epson})")
         return page_jobs
+    
+    def _prepare_page(self, image, page_num: int, total_pages: int, safe_base_name: str, job_name: str,
+                      workspace: 'PrintWorkspace', options: PrintOptions, is_epson: bool) -> PageJob:
+        """Prepara (converte e codifica em JPEG) uma única página"""
+        jpg_data = self._encode_page(image, options, is_epson, workspace)
+        return self._build_page_job(jpg_data, page_num, total_pages, safe_base_name,
+                                    job_name, workspace)
+    
+    def _get_jpg_quality(self, options: PrintOptions) -> int:
+        """Qualidade JPEG usada na codificação das páginas"""
+        if self.profile.jpg_quality:
+            # Perfil fixa a qualidade (Epson L3250 funciona melhor com qualidade mais baixa)
+            return self.profile.jpg_quality
+        return 85 if options.quality == Quality.ALTA else 75
+    
+    def _choose_raster_format(self, options: PrintOptions) -> str:
+        """
+        Formato raster de envio: PWG Raster/URF quando anunciados pela impressora, JPEG caso contrário
+        
+        PWG/URF só são usados quando a impressora também anuncia resoluções e o tipo
+        de bitmap (sRGB ou sGray de 8 bits, conforme o modo de cor) do formato.
+        """
+        preference = str(self._get_performance_option("raster_format", "auto")).lower()
+        if preference == "jpeg" or self.profile.is_epson:
+            return raster_encoders.MIME_JPEG
+        
+        candidates = {
+            "pwg": [raster_encoders.MIME_PWG_RASTER],
+            "urf": [raster_encoders.MIME_URF],
+        }.get(preference, [raster_encoders.MIME_PWG_RASTER, raster_encoders.MIME_URF])
+        
+        for mime_type in candidates:
+            if not self.profile.supports_format(mime_type):
+                continue
+            if not raster_encoders.is_available():
+                logger.info(f"Impressora aceita {mime_type}, mas o NumPy não está instalado - usando JPEG")
+                break
+            if self.profile.supports_raster(mime_type, color=options.color_mode != ColorMode.MONOCROMO):
+                return mime_type
+            logger.info(f"Impressora aceita {mime_type}, mas não anuncia resolução/tipo de bitmap compatível")
+        
+        return raster_encoders.MIME_JPEG
+    
+    def _page_encoding(self, options: PrintOptions, is_epson: bool, dpi: Optional[int] = None) -> PageEncoding:
+        """Parâmetros de codificação das páginas deste trabalho"""
+        return PageEncoding(
+            mime_type=self.raster_format,
+            dpi=dpi or self.profile.best_dpi(options.dpi, self.raster_format),
+            color_mode=options.color_mode.value,
+            # === CORREÇÃO PARA EPSON: RGB sem transparência, JPEG sem otimização ===
+            epson_mode=is_epson,
+            jpg_quality=self._get_jpg_quality(options),
+            duplex=options.duplex != Duplex.SIMPLES,
+            tumble=options.duplex == Duplex.DUPLEX_CURTO,
+            quality=options.quality.value,
+            page_size_name=options.paper_size,
+            blank_threshold=self._blank_page_threshold(),
+            grayscale_threshold=self._grayscale_page_threshold(options),
+            byte_budget=self._page_byte_budget(),
+            min_jpg_quality=int(self._get_performance_option("min_jpeg_quality", 40))
+        )
+    
+    def _blank_page_threshold(self) -> float:
+        """Limite de tinta abaixo do qual a página é descartada (0 = detecção desativada)"""
+        if not self._get_performance_option("skip_blank_pages", False):
+            return 0.0
+        if not raster_encoders.is_available():
+            logger.info("Detecção de páginas em branco requer o NumPy - desativada")
+            return 0.0
+        return float(self._get_performance_option("blank_page_ink_threshold", 0.0001))
+    
+    def _page_byte_budget(self) -> int:
+        """
+        Tamanho máximo desejado de uma página JPEG (0 = qualidade fixa do perfil)
+        
+        Menor entre o limite do perfil da impressora e o que a vazão observada
+        do link transfere em "page_transfer_seconds"; sem nenhum dos dois, a
+        qualidade não é ajustada.
+        """
+        if (self.raster_format != raster_encoders.MIME_JPEG or
+                not self._get_performance_option("adaptive_jpeg_quality", True)):
+            return 0
+        
+        budget = self.profile.max_page_bytes
+        pacer = self._get_pacer()
+        throughput = pacer.throughput if pacer else None
+        if throughput:
+            link_budget = throughput * float(self._get_performance_option("page_transfer_seconds", 10.0))
+            budget = min(budget, link_budget) if budget else link_budget
+        return jpeg_budget.quantize_budget(budget)
+    
+    def _grayscale_page_threshold(self, options: PrintOptions) -> float:
+        """Limite de cor abaixo do qual uma página do modo automático vai em tons de cinza (0 = desativado)"""
+        if options.color_mode != ColorMode.AUTO or not self._get_performance_option("auto_grayscale_pages", True):
+            return 0.0
+        if (self.raster_format != raster_encoders.MIME_JPEG and
+                not self.profile.supports_raster(self.raster_format, color=False)):
+            # PWG/URF sem sGray anunciado: as páginas seguem em sRGB
+            return 0.0
+        if not raster_encoders.is_available():
+            return 0.0
+        return float(self._get_performance_option("grayscale_color_threshold", 0.0002))
+    
+    def _encode_page(self, image, options: PrintOptions, is_epson: bool,
+                     workspace: 'PrintWorkspace', dpi: Optional[int] = None) -> bytes:
+        """Converte o modo de cor da imagem e a codifica no formato raster escolhido"""
+        # Codifica direto em memória, no buffer reutilizável do workspace
+        return self._page_encoding(options, is_epson, dpi).encode(image, workspace.encode)
+    
+    def _build_page_job(self, jpg_data: bytes, page_num: int, total_pages: int, safe_base_name: str,
+                        job_name: str, workspace: 'PrintWorkspace') -> PageJob:
+        """Cria o PageJob de uma página já codificada"""
+        # Nome do arquivo otimizado
+        extension = raster_encoders.FILE_EXTENSIONS.get(self.raster_format, ".jpg")
+        if total_pages > 1:
+            image_filename = f"{safe_base_name}_p{page_num:02d}{extension}"
+            page_job_name = f"{normalize_filename(job_name)}_p{page_num:02d}"
+        else:
+            image_filename = f"{safe_base_name}{extension}"
+            page_job_name = normalize_filename(job_name)
+        
+        if not jpg_data:
+            # Página em branco (blank_pages.BLANK_PAGE): fica no trabalho, mas não é enviada
+            return PageJob(page_num=page_num, image_path="", jpg_data=None, job_name=page_job_name, blank=True)
+        
+        # Lido do próprio dado codificado: vale também para páginas vindas do cache
+        grayscale = raster_encoders.is_grayscale(jpg_data, self.raster_format)
+        
+        # Mantém em memória; só vai para o disco se o orçamento estourar
+        jpg_data, image_path = workspace.store(image_filename, jpg_data)
+        
+        return PageJob(
+            page_num=page_num,
+            image_path=image_path,
+            jpg_data=jpg_data,
+            job_name=page_job_name,
+            max_attempts=self.profile.page_max_attempts,  # Mais tentativas para Epson
+            grayscale=grayscale
+        )
 
 
-    def _process_pages_parallel(self, page_jobs: list, options: PrintOptions, 
-                            progress_callback=None, job_info: Optional[PrintJobInfo] = None) -> Tuple[bool, Dict]:
-        """Processa páginas SEQUENCIALMENTE com otimizações específicas para EPSON"""
+    def _process_pages(self, page_jobs: list, options: PrintOptions, progress_callback=None,
+                       job_info: Optional[PrintJobInfo] = None, job_name: Optional[str] = None) -> Tuple[bool, Dict]:
+        """Escolhe entre um trabalho multi-documento (Create-Job) e um Print-Job por página"""
+        sent_keys = None
+        if len(page_jobs) and self._supports_multi_document_jobs():
+            success, result = self._process_pages_multi_document(
+                page_jobs, options, progress_callback, job_info, job_name or "documento"
+            )
+            if result.get("fallback") != "print_job":
+                return success, result
+            # As páginas já aceitas no modo multi-documento não são reenviadas
+            sent_keys = result.get("sent_keys")
+            logger.info("Create-Job/Send-Document não suportado, usando um Print-Job por página")
+        
+        return self._process_pages_parallel(page_jobs, options, progress_callback, job_info,
+                                            sent_keys=sent_keys)
+    
+    def _supports_multi_document_jobs(self) -> bool:
+        """
+        Indica se deve tentar o modo Create-Job + Send-Document para esta impressora
+        
+        Impressoras que informam multiple-document-jobs-supported=false nunca usam o
+        modo; quando o atributo não é informado, a primeira recusa em Create-Job ou
+        Send-Document desativa o modo para a impressora.
+        """
+        if not self._get_performance_option("multi_document_jobs", True):
+            return False
+        self._ensure_printer_capabilities()
+        if self.profile.multiple_document_jobs is False:
+            return False
+        if self.endpoint_cache:
+            cached_config = self.endpoint_cache.get_printer_endpoint_config(self.printer_ip)
+            if cached_config.get("multi_document_supported") is False:
+                return False
+        return True
+    
+    def _ensure_printer_capabilities(self):
+        """Consulta Get-Printer-Attributes uma vez por impressora e guarda as capacidades no perfil"""
+        if self.profile.capabilities_resolved_at or self._capabilities_queried:
+            return
+        self._capabilities_queried = True
+        
+        url = f"{self.base_url}{self.known_endpoint or '/ipp/print'}"
+        attributes = {
+            "printer-uri": url,
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+            "requested-attributes": self.CAPABILITY_ATTRIBUTES,
+        }
+        
+        response = self._post_ipp(url, IPPOperation.GET_PRINTER_ATTRIBUTES, attributes, timeout=5)
+        ipp_response = IPPResponse.from_http_response(response)
+        if ipp_response is None or not ipp_response.is_success:
+            status = ipp_response.status_name if ipp_response else None
+            logger.debug(f"Get-Printer-Attributes indisponível para {self.printer_ip} (status: {status})")
+            return
+        
+        self._apply_printer_capabilities(ipp_response.group(IPPTag.PRINTER))
+    
+    def _apply_printer_capabilities(self, printer_attributes: Dict[str, List[Any]]):
+        """Guarda no perfil as capacidades informadas por Get-Printer-Attributes"""
+        self._capabilities_queried = True
+        profile = self.profile
+        profile.document_formats = [str(v) for v in printer_attributes.get("document-format-supported", [])]
+        profile.sides_supported = [str(v) for v in printer_attributes.get("sides-supported", [])]
+        profile.media_supported = [str(v) for v in printer_attributes.get("media-supported", [])]
+        profile.resolutions_dpi = sorted({
+            # (x, y, unidade): 3 = dpi, 4 = pontos por centímetro
+            round(x * 2.54) if units == 4 else x
+            for x, _y, units in printer_attributes.get("printer-resolution-supported", [])
+        })
+        multiple_documents = printer_attributes.get("multiple-document-jobs-supported")
+        profile.multiple_document_jobs = bool(multiple_documents[0]) if multiple_documents else None
+        profile.pwg_resolutions_dpi = sorted({
+            round(x * 2.54) if units == 4 else x
+            for x, _y, units in printer_attributes.get("pwg-raster-document-resolution-supported", [])
+        })
+        profile.pwg_types = [str(v) for v in printer_attributes.get("pwg-raster-document-type-supported", [])]
+        profile.urf_supported = [str(v) for v in printer_attributes.get("urf-supported", [])]
+        make_and_model = printer_attributes.get("printer-make-and-model")
+        if make_and_model and not profile.model:
+            profile.model = str(make_and_model[0])
+        profile.capabilities_resolved_at = time.time()
+        
+        PrinterProfileRegistry.get_instance().update_profile(profile)
+        logger.info(f"Capacidades de {self.printer_ip}: formatos={profile.document_formats}, "
+                    f"resoluções={profile.resolutions_dpi}, sides={profile.sides_supported}")
+    
+    def _choose_document_format(self) -> str:
+        """Escolhe o formato de envio ("pdf" ou "jpg") pelo perfil e pelas capacidades"""
+        if self.force_jpg_mode:
+            return "jpg"
+        if self.profile.supports_format("application/pdf") is False:
+            return "jpg"
+        return "pdf"
+    
+    def _validate_jpg_job(self, job_name: str, options: PrintOptions) -> bool:
+        """Executa Validate-Job com os atributos JPG; só recusa se a impressora rejeitar o formato"""
+        url = f"{self.base_url}{self.known_endpoint or '/ipp/print'}"
+        attributes = self._build_jpg_job_attributes(url, job_name, options)
+        
+        response = self._post_ipp(url, IPPOperation.VALIDATE_JOB, attributes, timeout=10)
+        ipp_response = IPPResponse.from_http_response(response)
+        if ipp_response and ipp_response.status_code in (0x040A, 0x040B):
+            logger.warning(f"Validate-Job recusado: {ipp_response.status_name} "
+                           f"(não suportados: {list(ipp_response.unsupported_attributes)})")
+            return False
+        
+        # Sem resposta ou operação não suportada: segue com a impressão normalmente
+        return True
+    
+    def _build_jpg_job_attributes(self, url: str, job_name: str, options: PrintOptions,
+                                  grayscale: bool = False) -> Dict[str, Any]:
+        """
+        Atributos IPP comuns aos trabalhos JPG (sempre 1 cópia, controlada manualmente)
+        
+        Args:
+            grayscale: Páginas sem cor detectadas no modo automático (print-color-mode=monochrome)
+        """
+        attributes = {
+            "printer-uri": url,
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+            "job-name": job_name,
+            "document-name": job_name,
+            "document-format": self.raster_format,
+            "ipp-attribute-fidelity": False,
+            "job-priority": 50,
+            "copies": 1,
+            "orientation-requested": 3 if options.orientation == "portrait" else 4,
+            "print-quality": options.quality.value,
+            "media": options.paper_size,
+        }
+        
+        if options.color_mode != ColorMode.AUTO:
+            attributes["print-color-mode"] = options.color_mode.value
+        elif grayscale:
+            attributes["print-color-mode"] = ColorMode.MONOCROMO.value
+        
+        return attributes
+    
+    def _post_ipp(self, url: str, operation: int, attributes: Dict[str, Any], document_data=None, timeout: float = 30):
+        """
+        Envia uma operação IPP genérica pela sessão keep-alive
         
+        Returns:
+            requests.Response ou None em caso de erro de rede
+        """
+        if self.use_https and url.startswith("http:"):
+            url = url.replace("http:", "https:", 1)
+        
+        ipp_header = self._build_ipp_request(operation, attributes)
+        body = self._build_ipp_body(ipp_header, document_data) if document_data is not None else ipp_header
+        
+        headers = {
+            'Content-Type': 'application/ipp',
+            'Accept': 'application/ipp',
+            'User-Agent': 'PDF-IPP-Rigorous/1.0'
+        }
+        
+        try:
+            return self.session.post(
+                url,
+                data=body,
+                headers=headers,
+                timeout=timeout,
+                verify=False,
+                allow_redirects=False
+            )
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Erro de rede na operação IPP 0x{operation:04X}: {e}")
+            return None
+    
+    @staticmethod
+    def _ipp_status_code(response) -> Optional[int]:
+        """Extrai o status IPP de uma resposta HTTP 200"""
+        ipp_response = IPPResponse.from_http_response(response)
+        return ipp_response.status_code if ipp_response else None
+    
+    def _create_job(self, url: str, job_name: str, options: PrintOptions,
+                    grayscale: bool = False) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Abre um trabalho com Create-Job
+        
+        Returns:
+            tuple: (job_id, status IPP) - job_id é None se a impressora recusou
+        """
+        attributes = self._build_jpg_job_attributes(url, job_name, options, grayscale)
+        del attributes["document-name"]
+        del attributes["document-format"]
+        
+        response = self._post_ipp(url, IPPOperation.CREATE_JOB, attributes, timeout=15)
+        ipp_response = IPPResponse.from_http_response(response)
+        if ipp_response is None:
+            return None, None
+        
+        if ipp_response.is_success:
+            return ipp_response.job_id, ipp_response.status_code
+        
+        return None, ipp_response.status_code
+    
+    def _send_document(self, url: str, job_id: int, document_name: str, document_data,
+                       last_document: bool) -> Optional[int]:
+        """
+        Envia um documento (página) para um trabalho aberto com Send-Document
+        
+        Returns:
+            Status IPP da resposta (None sem resposta IPP)
+        """
+        attributes = {
+            "printer-uri": url,
+            "job-id": job_id,
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+            "document-name": document_name,
+            "last-document": last_document,
+        }
+        if document_data is not None:
+            attributes["document-format"] = self.raster_format
+        
+        timeout = self.profile.request_timeout
+        response = self._post_ipp(url, IPPOperation.SEND_DOCUMENT, attributes, document_data, timeout=timeout)
+        return self._ipp_status_code(response)
+    
+    def _close_job(self, url: str, job_id: int, document_name: str):
+        """Fecha um trabalho aberto: Send-Document vazio com last-document=true, ou Close-Job"""
+        status_code = self._send_document(url, job_id, document_name, None, True)
+        if status_code is not None and status_code <= 0x00FF:
+            return
+        
+        attributes = {
+            "printer-uri": url,
+            "job-id": job_id,
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+        }
+        status_code = self._ipp_status_code(self._post_ipp(url, IPPOperation.CLOSE_JOB, attributes, timeout=15))
+        if status_code is None or status_code > 0x00FF:
+            logger.warning(f"Não foi possível fechar o trabalho {job_id} (status: {status_code})")
+    
+    def _cancel_printer_job(self, url: str, job_id: int):
+        """Cancela na impressora um trabalho aberto que ficou sem documentos"""
+        attributes = {
+            "printer-uri": url,
+            "job-id": job_id,
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+        }
+        status_code = self._ipp_status_code(self._post_ipp(url, IPPOperation.CANCEL_JOB, attributes, timeout=15))
+        if status_code is None or status_code > 0x00FF:
+            logger.warning(f"Não foi possível cancelar o trabalho vazio {job_id} (status: {status_code})")
+    
+    def _process_pages_multi_document(self, page_jobs: list, options: PrintOptions, progress_callback=None,
+                                      job_info: Optional[PrintJobInfo] = None, job_name: str = "") -> Tuple[bool, Dict]:
+        """
+        Envia cada cópia como UM trabalho: Create-Job seguido de um Send-Document por página
+        
+        A impressora vê um único trabalho por cópia (páginas juntas na fila) e não há
+        pausas fixas entre páginas. No modo de cor automático, páginas sem cor e
+        coloridas vão em trabalhos separados: cada sequência de páginas sem cor é
+        aberta com print-color-mode=monochrome (o atributo vale para o trabalho
+        inteiro), e um documento todo sem cor continua sendo um único trabalho.
+        Se a impressora recusar Create-Job ou um segundo
+        Send-Document (operação ou multi-documento não suportados), o trabalho aberto
+        é fechado e o resultado traz result["fallback"] == "print_job" e, em
+        result["sent_keys"], as páginas já aceitas, para que o chamador envie as
+        demais com um Print-Job por página.
+        """
+        url = f"{self.base_url}{self.known_endpoint or '/ipp/print'}"
         total_copies = options.copies
         total_pages_all_copies = len(page_jobs) * total_copies
+        completed_keys = self._completed_page_keys(job_info)
+        successful_pages = self._already_printed_pages(completed_keys, len(page_jobs), total_copies)
+        skipped_pages = len(successful_pages)
+        is_epson = self.profile.is_epson
+        base_job_name = normalize_filename(job_name or "documento")
+        max_attempts = 3
+        blank_pages = []
+        grayscale_pages = set()
         pages_sent = 0
-        successful_pages = []
+        unsupported = (0x0501, 0x0509)  # operation-not-supported / multiple-document-jobs-not-supported
+        pacer = self._get_pacer()
+        
+        def fall_back() -> Tuple[bool, Dict]:
+            if self.endpoint_cache:
+                self.endpoint_cache.set_multi_document_support(self.printer_ip, False)
+            return False, {"fallback": "print_job", "sent_keys": set(successful_pages)}
+        
+        logger.info(f"Processamento MULTI-DOCUMENTO: {len(page_jobs)} página(s) × {total_copies} cópia(s)")
+        if progress_callback:
+            progress_callback("Iniciando trabalho multi-documento (Create-Job)...")
+        
+        for copy_num in range(1, total_copies + 1):
+            if job_info and job_info.status == "canceled":
+                break
+            
+            copy_job_name = f"{base_job_name}_c{copy_num:02d}" if total_copies > 1 else base_job_name
+            if all(f"p{page_num}_c{copy_num}" in completed_keys for page_num in range(1, len(page_jobs) + 1)):
+                logger.info(f"Cópia {copy_num} já impressa anteriormente - pulando")
+                continue
+            
+            # O trabalho é aberto com a primeira página a enviar (e reaberto quando a cor muda)
+            printer_job_id = None
+            job_grayscale = False
+            job_closed = False
+            documents_accepted = 0
+            for index, page_job in enumerate(page_jobs):
+                if job_info and job_info.status == "canceled":
+                    break
+                if page_job.blank:
+                    if page_job.page_num not in blank_pages:
+                        blank_pages.append(page_job.page_num)
+                        total_pages_all_copies -= total_copies
+                    continue
+                if f"p{page_job.page_num}_c{copy_num}" in completed_keys:
+                    continue
+                
+                if printer_job_id is not None and page_job.grayscale != job_grayscale:
+                    # print-color-mode vale para o trabalho todo: a sequência seguinte vai em outro trabalho
+                    if not job_closed:
+                        self._close_job(url, printer_job_id, copy_job_name)
+                    self._track_printer_job(printer_job_id, job_info)
+                    printer_job_id = None
+                
+                if printer_job_id is None:
+                    printer_job_id, status_code = self._create_job(url, copy_job_name, options,
+                                                                   grayscale=page_job.grayscale)
+                    if printer_job_id is None:
+                        if status_code in unsupported:
+                            return fall_back()
+                        if not pages_sent:
+                            # Nada foi enviado ainda: deixa o modo por página tentar
+                            return False, {"fallback": "print_job", "sent_keys": set(successful_pages)}
+                        
+                        logger.error(f"✗ Create-Job falhou na cópia {copy_num} (status: {status_code})")
+                        break
+                    
+                    job_grayscale = page_job.grayscale
+                    job_closed = False
+                    documents_accepted = 0
+                    logger.info(f"Trabalho {printer_job_id} aberto para a cópia {copy_num}/{total_copies}"
+                                f"{' (sem cor)' if job_grayscale else ''}")
+                
+                last_document = index == len(page_jobs) - 1
+                sent = False
+                status_code = None
+                page_data = page_job.get_data()
+                for attempt in range(max_attempts):
+                    started = time.monotonic()
+                    status_code = self._send_document(url, printer_job_id, page_job.job_name,
+                                                      page_data, last_document)
+                    if status_code is not None and status_code <= 0x00FF:
+                        sent = True
+                        if pacer:
+                            # A vazão medida aqui define o orçamento de bytes das próximas páginas
+                            pacer.on_accepted(time.monotonic() - started,
+                                              IPPJobTracker.get_instance().queued_count(self.printer_ip),
+                                              sent_bytes=len(page_data))
+                        break
+                    if status_code in unsupported:
+                        break
+                    if pacer:
+                        pacer.on_rejected()
+                    logger.warning(f"✗ Send-Document falhou para página {page_job.page_num} (tentativa {attempt + 1}/{max_attempts})")
+                    if attempt < max_attempts - 1:
+                        time.sleep(pacer.retry_delay(attempt) if pacer else self.profile.retry_pause)
+                
+                if status_code in unsupported:
+                    # Um documento por trabalho: fecha o que já foi aceito e segue página a página
+                    logger.warning(f"Impressora recusou o documento {documents_accepted + 1} do trabalho "
+                                   f"{printer_job_id} (status: 0x{status_code:04X})")
+                    if documents_accepted:
+                        self._close_job(url, printer_job_id, copy_job_name)
+                        self._track_printer_job(printer_job_id, job_info)
+                    else:
+                        self._cancel_printer_job(url, printer_job_id)
+                    return fall_back()
+                
+                if sent:
+                    documents_accepted += 1
+                    pages_sent += 1
+                    if documents_accepted == 2 and self.endpoint_cache:
+                        # Só um segundo documento aceito no mesmo trabalho confirma o suporte
+                        self.endpoint_cache.set_multi_document_support(self.printer_ip, True)
+                    if page_job.grayscale:
+                        grayscale_pages.add(page_job.page_num)
+                    successful_pages.append(f"p{page_job.page_num}_c{copy_num}")
+                    self._checkpoint_page(job_info, successful_pages[-1])
+                    job_closed = last_document
+                    if progress_callback:
+                        progress_callback(f"✓ Página {page_job.page_num} (cópia {copy_num}) - {len(successful_pages)}/{total_pages_all_copies}")
+                else:
+                    logger.error(f"✗ Falha DEFINITIVA na página {page_job.page_num} (cópia {copy_num})")
+                    if progress_callback:
+                        progress_callback(f"✗ Falha página {page_job.page_num} (cópia {copy_num})")
+            
+            if printer_job_id is not None:
+                if not job_closed:
+                    self._close_job(url, printer_job_id, copy_job_name)
+                self._track_printer_job(printer_job_id, job_info)
+            
+            if copy_num < total_copies and not (job_info and job_info.status == "canceled"):
+                self._wait_for_printer(self.profile.copy_delay, "próxima cópia")
+        
+        successful_count = len(successful_pages)
+        result = {
+            "total_pages": total_pages_all_copies,
+            "successful_pages": successful_count,
+            "failed_pages": total_pages_all_copies - successful_count,
+            "method": "jpg_multi_document",
+            "copies_requested": total_copies,
+            "unique_pages": len(page_jobs),
+            "workers_used": 1,
+            "epson_optimized": is_epson,
+            "skipped_pages": skipped_pages,
+            "blank_pages": blank_pages,
+            "grayscale_pages": sorted(grayscale_pages)
+        }
+        
+        if job_info and job_info.status == "canceled":
+            result["status"] = "canceled"
+            result["message"] = "Trabalho cancelado durante o envio multi-documento."
+            return False, result
+        
+        return successful_count == total_pages_all_copies, result
+    
+    def _process_pages_parallel(self, page_jobs: list, options: PrintOptions, 
+                            progress_callback=None, job_info: Optional[PrintJobInfo] = None,
+                            sent_keys: Optional[set] = None) -> Tuple[bool, Dict]:
+        """
+        Processa páginas SEQUENCIALMENTE com otimizações específicas para EPSON
+        
+        Args:
+            sent_keys: Páginas/cópias (ex.: "p3_c1") já aceitas neste envio (ex.: antes
+                do fallback do modo multi-documento), que não são reenviadas
+        """
+        
+        total_copies = options.copies
+        total_pages_all_copies = len(page_jobs) * total_copies
+        # Retomada: páginas/cópias já confirmadas contam como enviadas e não são reenviadas
+        completed_keys = self._completed_page_keys(job_info) | set(sent_keys or ())
+        successful_pages = self._already_printed_pages(completed_keys, len(page_jobs), total_copies)
+        skipped_pages = len(successful_pages)
+        pages_sent = skipped_pages
+        blank_pages = []
+        grayscale_pages = set()
         
         # === CORREÇÃO ESPECÍFICA PARA EPSON: Processamento mais lento e tolerante ===
-        is_epson = self._is_epson_printer(getattr(self, 'printer_ip', ''))
+        is_epson = self.profile.is_epson
         processing_mode = "SEQUENCIAL EPSON-OTIMIZADO" if is_epson else "SEQUENCIAL"
         
         logger.info(f"Processamento {processing_mode}: {len(page_jobs)} página(s) × {total_copies} cópia(s) = {total_pages_all_copies} páginas")
@@ -1536,6 +2917,18 @@ startxref
                     logger.info(f"Cancelamento detectado na cópia {copy_num}")
                     break
                 
+                if page_job.blank:
+                    # Sem envio e sem a pausa entre páginas
+                    if page_job.page_num not in blank_pages:
+                        blank_pages.append(page_job.page_num)
+                        total_pages_all_copies -= total_copies
+                        logger.info(f"Página {page_job.page_num} em branco - não será enviada")
+                    continue
+                
+                if f"p{page_job.page_num}_c{copy_num}" in completed_keys:
+                    copy_successful += 1
+                    continue
+                
                 # Cria nome único para esta cópia
                 if total_copies > 1:
                     copy_job_name = f"{page_job.job_name}_c{copy_num:02d}"
@@ -1554,8 +2947,12 @@ startxref
                 if success:
                     copy_successful += 1
                     pages_sent += 1
+                    if page_job.grayscale:
+                        grayscale_pages.add(page_job.page_num)
                     page_key = f"p{page_job.page_num}_c{copy_num}"
                     successful_pages.append(page_key)
+                    self._checkpoint_page(job_info, page_key)
+                    self._track_printer_job(self.last_printer_job_id, job_info)
                     
                     logger.info(f"✓ Página {page_job.page_num} (cópia {copy_num}) enviada com sucesso - {pages_sent}/{total_pages_all_copies}")
                     if progress_callback:
@@ -1567,9 +2964,7 @@ startxref
                 
                 # === CORREÇÃO ESPECÍFICA PARA EPSON: Delay maior entre páginas ===
                 if page_job.page_num < len(page_jobs):  # Não pausa após a última página
-                    delay = 5.0 if is_epson else 2.0  # Delay maior para Epson
-                    logger.info(f"Aguardando {delay}s antes da próxima página...")
-                    time.sleep(delay)
+                    self._wait_for_printer(self.profile.page_delay, "próxima página")
             
             # Verifica se foi cancelado
             if job_info and job_info.status == "canceled":
@@ -1587,9 +2982,7 @@ startxref
             
             # Pausa entre cópias (maior para Epson)
             if copy_num < total_copies and total_copies > 1:
-                delay = 8.0 if is_epson else 3.0  # Delay maior para Epson
-                logger.info(f"Aguardando {delay}s antes da próxima cópia...")
-                time.sleep(delay)
+                self._wait_for_printer(self.profile.copy_delay, "próxima cópia")
         
         # Relatório final
         successful_count = len(successful_pages)
@@ -1597,7 +2990,10 @@ startxref
         
         logger.info(f"=== Relatório Final ({processing_mode}) ===")
         logger.info(f"Páginas enviadas: {successful_count}/{total_pages_all_copies}")
-        logger.info(f"Taxa de sucesso: {(successful_count/total_pages_all_copies)*100:.1f}%")
+        if total_pages_all_copies:
+            logger.info(f"Taxa de sucesso: {(successful_count/total_pages_all_copies)*100:.1f}%")
+        if blank_pages:
+            logger.info(f"Páginas em branco descartadas: {blank_pages}")
         
         result = {
             "total_pages": total_pages_all_copies,
@@ -1607,7 +3003,11 @@ startxref
             "copies_requested": total_copies,
             "unique_pages": len(page_jobs),
             "workers_used": 1,
-            "epson_optimized": is_epson
+            "epson_optimized": is_epson,
+            "skipped_pages": skipped_pages,
+            "blank_pages": blank_pages,
+            # Páginas do modo automático enviadas como monocromáticas
+            "grayscale_pages": sorted(grayscale_pages)
         }
         
         return successful_count == total_pages_all_copies, result
@@ -1624,7 +3024,7 @@ startxref
             "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
             "job-name": copy_job_name,
             "document-name": copy_job_name,
-            "document-format": "image/jpeg",
+            "document-format": self.raster_format,
             "ipp-attribute-fidelity": False,
             "job-priority": 50,
             "copies": 1,  # Sempre 1 cópia (controlamos manualmente)
@@ -1635,18 +3035,32 @@ startxref
         
         if options.color_mode != ColorMode.AUTO:
             attributes["print-color-mode"] = options.color_mode.value
+        elif page_job.grayscale:
+            # Página sem cor detectada no modo automático
+            attributes["print-color-mode"] = ColorMode.MONOCROMO.value
         
         # === CORREÇÃO ESPECÍFICA PARA EPSON: Sistema de retry mais robusto ===
-        is_epson = self._is_epson_printer(getattr(self, 'printer_ip', ''))
-        max_attempts = 7 if is_epson else 5  # Mais tentativas para Epson
-        delays = [1.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0] if is_epson else [0.5, 1.0, 2.0, 3.0, 5.0]
+        is_epson = self.profile.is_epson
+        max_attempts = self.profile.max_attempts  # Mais tentativas para Epson
+        delays = self.profile.retry_delays
+        pacer = self._get_pacer()
         
         for attempt in range(max_attempts):
             try:
                 logger.info(f"Tentativa {attempt + 1}/{max_attempts} para página {page_job.page_num} (cópia {copy_num}) - EPSON: {is_epson}")
                 
                 # === CORREÇÃO ESPECÍFICA PARA EPSON: Usa método otimizado ===
-                success = self._send_ipp_request_with_extended_timeout(url, attributes, page_job.jpg_data)
+                page_data = page_job.get_data()
+                started = time.monotonic()
+                success = self._send_ipp_request_with_extended_timeout(url, attributes, page_data)
+                
+                if pacer:
+                    if success:
+                        pacer.on_accepted(time.monotonic() - started,
+                                          IPPJobTracker.get_instance().queued_count(self.printer_ip),
+                                          sent_bytes=len(page_data))
+                    else:
+                        pacer.on_rejected()
 
                 # CORREÇÃO: Log detalhado do resultado
                 if success:
@@ -1667,50 +3081,235 @@ startxref
                 
                 # Pausa progressiva entre tentativas (maior para Epson)
                 if attempt < max_attempts - 1:
-                    delay = delays[min(attempt, len(delays) - 1)]
-                    logger.info(f"Aguardando {delay}s antes da próxima tentativa...")
+                    delay = pacer.retry_delay(attempt) if pacer else delays[min(attempt, len(delays) - 1)]
+                    logger.info(f"Aguardando {delay:.1f}s antes da próxima tentativa...")
                     time.sleep(delay)
                     
             except Exception as e:
                 logger.error(f"Erro na tentativa {attempt + 1} para página {page_job.page_num}: {e}")
+                if pacer:
+                    pacer.on_rejected()
                 if attempt < max_attempts - 1:
-                    delay = delays[min(attempt, len(delays) - 1)]
+                    delay = pacer.retry_delay(attempt) if pacer else delays[min(attempt, len(delays) - 1)]
                     time.sleep(delay)
         
-        # Marca falha apenas após todas as tentativas
-        logger.error(f"FALHA DEFINITIVA na página {page_job.page_num} após {max_attempts} tentativas")
-        if self.endpoint_cache:
-            self.endpoint_cache.mark_endpoint_failed(self.printer_ip)
+        # Marca falha apenas após todas as tentativas
+        logger.error(f"FALHA DEFINITIVA na página {page_job.page_num} após {max_attempts} tentativas")
+        if self.endpoint_cache:
+            self.endpoint_cache.mark_endpoint_failed(self.printer_ip)
+        
+        return False
+
+    def _completed_page_keys(self, job_info: Optional[PrintJobInfo]) -> set:
+        """Páginas/cópias (ex.: "p3_c1") já confirmadas em uma execução anterior do trabalho"""
+        if not job_info:
+            return set()
+        return PrintJobStore.get_instance().get_completed_pages(job_info.job_id)
+    
+    def _fully_printed_pages(self, job_info: Optional[PrintJobInfo], total_pages: int, total_copies: int) -> set:
+        """Páginas já impressas em todas as cópias numa execução anterior (não precisam ser rasterizadas)"""
+        completed_keys = self._completed_page_keys(job_info)
+        if not completed_keys:
+            return set()
+        
+        done_pages = {
+            page_num for page_num in range(1, total_pages + 1)
+            if all(f"p{page_num}_c{copy_num}" in completed_keys for copy_num in range(1, total_copies + 1))
+        }
+        if done_pages:
+            logger.info(f"Retomada: {len(done_pages)} de {total_pages} página(s) já impressas serão puladas")
+        return done_pages
+    
+    @staticmethod
+    def _already_printed_pages(completed_keys: set, total_pages: int, total_copies: int) -> List[str]:
+        """Chaves já impressas que pertencem a este trabalho, na ordem de envio"""
+        return [
+            f"p{page_num}_c{copy_num}"
+            for copy_num in range(1, total_copies + 1)
+            for page_num in range(1, total_pages + 1)
+            if f"p{page_num}_c{copy_num}" in completed_keys
+        ]
+    
+    def _checkpoint_page(self, job_info: Optional[PrintJobInfo], page_key: str):
+        """Registra na fila persistente uma página/cópia confirmada pela impressora"""
+        if job_info:
+            PrintJobStore.get_instance().checkpoint_page(job_info.job_id, page_key)
+    
+    def _track_printer_job(self, printer_job_id: Optional[int], job_info: Optional[PrintJobInfo] = None):
+        """Registra um trabalho aceito pela impressora para acompanhamento"""
+        if printer_job_id is None or not self._get_performance_option("track_printer_jobs", True):
+            return
+        IPPJobTracker.get_instance().track(self, printer_job_id, job_info.job_id if job_info else None)
+        self.last_printer_job_id = None
+    
+    def _get_pacer(self) -> Optional[PrinterPacer]:
+        """Pacer adaptativo da impressora (None quando desativado na configuração)"""
+        if not self._get_performance_option("adaptive_pacing", True):
+            return None
+        return PrintPacerRegistry.get_instance().get_pacer(self.profile)
+    
+    def _wait_for_printer(self, max_delay: float, reason: str):
+        """
+        Pausa antes do próximo envio
+        
+        Com o pacer adaptativo, a pausa é o intervalo aprendido para a impressora
+        (limitado pelo perfil) em vez da pausa fixa. Com acompanhamento de trabalhos,
+        segue assim que a impressora confirma espaço (trabalho anterior em
+        processamento ou concluído); a pausa vira apenas o limite máximo de espera.
+        """
+        pacer = self._get_pacer()
+        tracker = IPPJobTracker.get_instance()
+        
+        if pacer:
+            started = time.monotonic()
+            if tracker.is_tracking(self.printer_ip):
+                tracker.wait_for_capacity(
+                    self.printer_ip,
+                    timeout=pacer.max_interval,
+                    max_queued=self.profile.max_queued_jobs,
+                    wait_for_completion=self.profile.wait_for_completion
+                )
+            pacer.wait()
+            logger.info(f"Aguardou {time.monotonic() - started:.1f}s antes da {reason} "
+                        f"(intervalo adaptativo: {pacer.interval:.2f}s)")
+            return
+        
+        if not tracker.is_tracking(self.printer_ip):
+            logger.info(f"Aguardando {max_delay}s antes da {reason}...")
+            time.sleep(max_delay)
+            return
+        
+        started = time.monotonic()
+        ready = tracker.wait_for_capacity(
+            self.printer_ip,
+            timeout=max_delay,
+            max_queued=self.profile.max_queued_jobs,
+            wait_for_completion=self.profile.wait_for_completion
+        )
+        waited = time.monotonic() - started
+        if ready:
+            logger.info(f"Impressora pronta para a {reason} após {waited:.1f}s (limite: {max_delay}s)")
+        else:
+            logger.info(f"Aguardou {waited:.1f}s antes da {reason} (sem confirmação da impressora)")
+    
+    def get_job_attributes(self, printer_job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Consulta o estado de um trabalho na impressora (Get-Job-Attributes)
+        
+        Returns:
+            dict com state, state_reasons e impressions_completed; None se a consulta falhar
+        """
+        url = f"{self.base_url}{self.known_endpoint or '/ipp/print'}"
+        attributes = {
+            "printer-uri": url,
+            "job-id": printer_job_id,
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+            "requested-attributes": ["job-id", "job-state", "job-state-reasons", "job-impressions-completed"],
+        }
+        
+        ipp_response = IPPResponse.from_http_response(
+            self._post_ipp(url, IPPOperation.GET_JOB_ATTRIBUTES, attributes, timeout=5)
+        )
+        if ipp_response is None:
+            return None
+        if ipp_response.status_code == 0x0406:
+            # client-error-not-found: a impressora já descartou o trabalho
+            return {"job_id": printer_job_id, "gone": True}
+        if not ipp_response.is_success:
+            return None
         
-        return False
-
-    def _send_ipp_request_with_extended_timeout(self, url: str, attributes: Dict[str, Any], document_data: bytes) -> bool:
+        return self._job_status_from_attributes(ipp_response.group(IPPTag.JOB))
+    
+    def get_active_jobs(self) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Lista os trabalhos não concluídos da impressora (Get-Jobs); None se a consulta falhar"""
+        url = f"{self.base_url}{self.known_endpoint or '/ipp/print'}"
+        attributes = {
+            "printer-uri": url,
+            "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
+            "which-jobs": "not-completed",
+            "requested-attributes": ["job-id", "job-state", "job-state-reasons", "job-impressions-completed"],
+        }
+        
+        ipp_response = IPPResponse.from_http_response(
+            self._post_ipp(url, IPPOperation.GET_JOBS, attributes, timeout=5)
+        )
+        if ipp_response is None or not ipp_response.is_success:
+            return None
+        
+        jobs = {}
+        for job_attributes in ipp_response.groups_of(IPPTag.JOB):
+            status = self._job_status_from_attributes(job_attributes)
+            if status["job_id"] is not None:
+                jobs[status["job_id"]] = status
+        return jobs
+    
+    @staticmethod
+    def _job_status_from_attributes(job_attributes: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Converte o grupo de atributos de um trabalho no formato usado pelo IPPJobTracker"""
+        def first(name):
+            values = job_attributes.get(name)
+            return values[0] if values else None
+        
+        return {
+            "job_id": first("job-id"),
+            "state": first("job-state"),
+            "state_reasons": [str(reason) for reason in job_attributes.get("job-state-reasons", [])],
+            "impressions_completed": first("job-impressions-completed") or 0,
+        }
+    
+    def _get_performance_option(self, key: str, default):
+        """Lê uma opção da seção print_performance da configuração"""
+        if self.config and hasattr(self.config, 'get'):
+            perf_config = self.config.get("print_performance", {}) or {}
+            return perf_config.get(key, default)
+        return default
+    
+    def _build_ipp_body(self, ipp_header: bytes, document_data):
+        """
+        Monta o corpo da requisição IPP
+        
+        No modo streaming o documento é transmitido em blocos a partir do buffer
+        (mmap/memoryview/arquivo). Com transferência chunked o corpo é um gerador;
+        caso contrário o IPPStreamBody informa o Content-Length sem materializar os dados.
+        """
+        if not self._get_performance_option("stream_documents", True):
+            if _is_document_file(document_data):
+                document_data.seek(0)
+                return ipp_header + document_data.read()
+            return ipp_header + bytes(document_data)
+        
+        chunk_size = int(self._get_performance_option("stream_chunk_size_kb", 64)) * 1024
+        body = IPPStreamBody(ipp_header, document_data, chunk_size)
+        
+        # Epson não lida bem com Transfer-Encoding: chunked; usa Content-Length conhecido
+        use_chunked = (self._get_performance_option("chunked_transfer", True) and
+                       self.profile.use_chunked_transfer)
+        return body.chunked() if use_chunked else body
+    
+    def _send_ipp_request_with_extended_timeout(self, url: str, attributes: Dict[str, Any], document_data) -> bool:
         """Envio IPP com verificação RIGOROSA de sucesso"""
         # Corrige URL para protocolo correto
         if self.use_https and url.startswith("http:"):
             url = url.replace("http:", "https:", 1)
         
-        # Constrói requisição IPP
-        ipp_request = self._build_ipp_request(IPPOperation.PRINT_JOB, attributes)
-        ipp_request += document_data
+        # Constrói apenas o cabeçalho IPP; o documento é anexado em streaming
+        ipp_header = self._build_ipp_request(IPPOperation.PRINT_JOB, attributes)
         
         try:
             headers = {
                 'Content-Type': 'application/ipp',
                 'Accept': 'application/ipp',
-                'Connection': 'close',
-                'User-Agent': 'PDF-IPP-Rigorous/1.0',
-                'Content-Length': str(len(ipp_request))
+                'User-Agent': 'PDF-IPP-Rigorous/1.0'
             }
             
             # Timeout específico
-            timeout = 60 if self._is_epson_printer(getattr(self, 'printer_ip', '')) else 45
+            timeout = self.profile.request_timeout
             
-            logger.debug(f"Enviando {len(document_data)} bytes para {url} (timeout: {timeout}s)")
+            logger.debug(f"Enviando {document_length(document_data)} bytes para {url} (timeout: {timeout}s)")
             
-            response = requests.post(
+            response = self.session.post(
                 url, 
-                data=ipp_request, 
+                data=self._build_ipp_body(ipp_header, document_data), 
                 headers=headers, 
                 timeout=timeout,
                 verify=False,
@@ -1733,7 +3332,7 @@ startxref
             elif response.status_code in [202, 204]:
                 logger.debug(f"HTTP {response.status_code} - verificando se há job-id")
                 # Mesmo para 202/204, deve ter job-id para confirmar
-                if b'job-id' in response.content.lower():
+                if self._extract_job_id_from_response(response.content) is not None:
                     logger.info(f"✓ HTTP {response.status_code} com job-id confirmado")
                     return True
                 else:
@@ -1753,101 +3352,6 @@ startxref
             logger.debug(f"Erro geral IPP: {e}")
             return False
 
-    def _validate_print_job_acceptance(self, response):
-        """
-        Validação final para confirmar que a impressora REALMENTE aceitou o trabalho
-        
-        Returns:
-            bool: True apenas se há evidência concreta de aceitação
-        """
-        try:
-            # Log detalhado da resposta
-            logger.debug("=== VALIDAÇÃO FINAL DE ACEITAÇÃO ===")
-            logger.debug(f"Resposta completa ({len(response.content)} bytes):")
-            
-            # Mostra primeiros 200 bytes em hex para debug
-            hex_preview = response.content[:200].hex()
-            logger.debug(f"HEX: {hex_preview}")
-            
-            # Mostra como string (ignorando erros)
-            try:
-                str_preview = response.content[:200].decode('utf-8', errors='ignore')
-                logger.debug(f"STRING: {repr(str_preview)}")
-            except:
-                pass
-            
-            # Procura por job-id de forma mais rigorosa
-            job_id_patterns = [
-                b'job-id',
-                b'job-uri',
-                b'job-state',
-                b'job-uuid'
-            ]
-            
-            found_job_indicators = []
-            for pattern in job_id_patterns:
-                if pattern in response.content:
-                    found_job_indicators.append(pattern.decode())
-            
-            if found_job_indicators:
-                logger.info(f"✓ INDICADORES DE JOB ENCONTRADOS: {found_job_indicators}")
-                
-                # Validação adicional: deve ter pelo menos 30 bytes após encontrar job-id
-                job_id_pos = response.content.find(b'job-id')
-                if job_id_pos >= 0 and len(response.content) > job_id_pos + 30:
-                    logger.info("✓ VALIDAÇÃO FINAL: Job-id com dados suficientes")
-                    return True
-                else:
-                    logger.warning("✗ Job-id encontrado mas dados insuficientes")
-                    return False
-            else:
-                logger.warning("✗ VALIDAÇÃO FINAL: Nenhum indicador de job encontrado")
-                logger.warning("✗ CONCLUSÃO: Impressora rejeitou o trabalho silenciosamente")
-                return False
-            
-        except Exception as e:
-            logger.error(f"Erro na validação final: {e}")
-            return False
-        
-    def _verify_ipp_response_ultra_permissive(self, response):
-        """Verificação inteligente da resposta IPP (não mais ultra permissiva)"""
-        try:
-            # Se tem conteúdo, tenta verificar
-            if len(response.content) >= 8:
-                version = struct.unpack('>H', response.content[0:2])[0]
-                status_code = struct.unpack('>H', response.content[2:4])[0]
-                request_id = struct.unpack('>I', response.content[4:8])[0]
-                
-                logger.debug(f"IPP Response: version=0x{version:04X}, status=0x{status_code:04X}, request_id={request_id}")
-                
-                # === CORREÇÃO: Verificação mais restritiva para sucesso real ===
-                success_codes = [
-                    0x0000,  # successful-ok
-                    0x0001,  # successful-ok-ignored-or-substituted-attributes
-                    0x0002,  # successful-ok-conflicting-attributes
-                ]
-                
-                if status_code in success_codes:
-                    # === VERIFICAÇÃO ADICIONAL: Confirma que tem job-id na resposta ===
-                    response_content = response.content.lower()
-                    if b'job-id' in response_content:
-                        logger.debug(f"✓ IPP sucesso CONFIRMADO: 0x{status_code:04X} (com job-id)")
-                        return True
-                    else:
-                        logger.debug(f"⚠ IPP sucesso mas SEM job-id: 0x{status_code:04X} - pode ser falso sucesso")
-                        return False
-                else:
-                    logger.debug(f"✗ IPP falha: 0x{status_code:04X}")
-                    return False
-            else:
-                # === CORREÇÃO: Resposta vazia agora é considerada falha ===
-                logger.debug("✗ IPP resposta vazia - considerado falha")
-                return False
-                
-        except Exception as e:
-            logger.debug(f"Erro ao verificar resposta IPP: {e}")
-            return False
-
     def _send_page_with_retry(self, page_job: PageJob, copy_job_name: str, 
                              options: PrintOptions, copy_num: int, total_copies: int) -> bool:
         """Envia uma página com sistema de retry melhorado"""
@@ -1859,7 +3363,7 @@ startxref
             "requesting-user-name": normalize_filename(os.getenv("USER", "usuario")),
             "job-name": copy_job_name,
             "document-name": copy_job_name,
-            "document-format": "image/jpeg",
+            "document-format": self.raster_format,
             "ipp-attribute-fidelity": False,
             "job-priority": 50,
             "copies": 1,  # Sempre 1 cópia (controlamos manualmente)
@@ -1882,7 +3386,7 @@ startxref
                 page_delay = (page_job.page_num - 1) * 0.1
                 time.sleep(page_delay)
                 
-                success = self._send_ipp_request_optimized(url, attributes, page_job.jpg_data)
+                success = self._send_ipp_request_optimized(url, attributes, page_job.get_data())
                 
                 if success:
                     # === CORREÇÃO: Só salva no cache uma vez por processo ===
@@ -1919,12 +3423,11 @@ startxref
             headers = {
                 'Content-Type': 'application/ipp',
                 'Accept': 'application/ipp',
-                'Connection': 'close',
                 'User-Agent': 'PDF-IPP-Optimized/1.1'
             }
             
             # === CORREÇÃO: Timeout ajustado e melhor detecção de sucesso ===
-            response = requests.post(
+            response = self.session.post(
                 url, 
                 data=ipp_request, 
                 headers=headers, 
@@ -1977,7 +3480,7 @@ startxref
                     return True
                 elif status_code in acceptable_codes:
                     # Verifica se tem job-id na resposta (indica que foi aceito)
-                    if b'job-id' in response.content:
+                    if self._extract_job_id_from_response(response.content) is not None:
                         logger.debug(f"Status IPP aceitável com job-id: 0x{status_code:04X}")
                         return True
                     else:
@@ -2104,7 +3607,8 @@ startxref
                 convert_kwargs['poppler_path'] = poppler_path
                 logger.info(f"Usando Poppler em: {poppler_path}")
             
-            images = pdf2image.convert_from_path(**convert_kwargs)
+            with RasterizationLimiter.get_instance().slot():
+                images = pdf2image.convert_from_path(**convert_kwargs)
             
             if not images:
                 logger.error("Falha na conversão PDF para JPG")
@@ -2391,52 +3895,25 @@ startxref
                     else:
                         attributes["printer-uri"] = f"{protocol}://{self.printer_ip}:{self.port}/{printer_uri}"
         
-        # Cabeçalho IPP
-        packet = struct.pack('>HHI', IPPVersion.IPP_1_1, operation, self.request_id)
-        self.request_id += 1
-        
-        # Tag de operação
-        packet += struct.pack('>B', IPPTag.OPERATION)
-        
-        # Atributos obrigatórios primeiro
-        packet += IPPEncoder.encode_string(IPPTag.CHARSET, 
-                                        "attributes-charset", "utf-8")
-        packet += IPPEncoder.encode_string(IPPTag.LANGUAGE, 
-                                        "attributes-natural-language", "en-us")
-        
-        # Adiciona outros atributos
-        for name, value in attributes.items():
-            if name in ["attributes-charset", "attributes-natural-language"]:
-                continue
-                
-            if isinstance(value, str):
-                if name == "printer-uri":
-                    packet += IPPEncoder.encode_string(IPPTag.URI, name, value)
-                elif name in ["requesting-user-name", "job-name", "document-name"]:
-                    packet += IPPEncoder.encode_string(IPPTag.NAME, name, value)
-                elif name == "document-format":
-                    packet += IPPEncoder.encode_string(IPPTag.MIMETYPE, name, value)
-                elif name in ["print-color-mode", "sides", "media"]:
-                    packet += IPPEncoder.encode_string(IPPTag.KEYWORD, name, value)
-                else:
-                    packet += IPPEncoder.encode_string(IPPTag.TEXT, name, value)
-                    
-            elif isinstance(value, int):
-                if name in ["copies", "job-priority"]:
-                    packet += IPPEncoder.encode_integer(IPPTag.INTEGER, name, value)
-                elif name in ["print-quality", "orientation-requested"]:
-                    packet += IPPEncoder.encode_enum(name, value)
-                    
-            elif isinstance(value, bool):
-                packet += IPPEncoder.encode_boolean(name, value)
-        
-        # Tag de job
-        packet += struct.pack('>B', IPPTag.JOB)
+        # Atributos constantes vêm pré-codificados; só os variáveis são escritos a cada página/tentativa
+        template = self._get_request_template(operation, attributes)
         
-        # Tag de fim
-        packet += struct.pack('>B', IPPTag.END)
+        with self._request_id_lock:
+            request_id = self.request_id
+            self.request_id += 1
         
-        return packet
+        return bytes(template.render(request_id, attributes))
+    
+    def _get_request_template(self, operation: int, attributes: Dict[str, Any]) -> IPPRequestTemplate:
+        """Obtém (ou cria) o template pré-codificado para estes atributos constantes"""
+        key = IPPRequestTemplate.cache_key(operation, attributes)
+        template = self._request_templates.get(key)
+        if template is None:
+            if len(self._request_templates) >= 32:
+                self._request_templates.clear()
+            template = IPPRequestTemplate(operation, attributes)
+            self._request_templates[key] = template
+        return template
 
     def _send_ipp_request(self, url: str, attributes: Dict[str, Any], document_data: bytes) -> bool:
         """Envia requisição IPP com correção de URI e retry inteligente"""
@@ -2457,7 +3934,6 @@ startxref
                 'Content-Type': 'application/ipp',
                 'Accept': 'application/ipp',
                 'Accept-Encoding': 'identity',
-                'Connection': 'close',
                 'User-Agent': 'PDF-IPP/1.1'
             }
             
@@ -2583,18 +4059,9 @@ startxref
     def _extract_job_id_from_response(self, ipp_response: bytes) -> Optional[int]:
         """Extrai job-id de uma resposta IPP"""
         try:
-            search_pattern = b'\x21\x00\x06job-id\x00\x04'
-            idx = ipp_response.find(search_pattern)
-            
-            if idx >= 0:
-                value_idx = idx + len(search_pattern)
-                if value_idx + 4 <= len(ipp_response):
-                    job_id = struct.unpack('>I', ipp_response[value_idx:value_idx+4])[0]
-                    return job_id
-                    
-        except Exception as e:
-            logger.error(f"Erro ao extrair job-id: {e}")
-            
+            return IPPResponse.parse(ipp_response).job_id
+        except (ValueError, struct.error) as e:
+            logger.debug(f"Erro ao extrair job-id: {e}")
         return None
 
 # Mantém as classes de gerenciamento e diálogos inalteradas
@@ -2611,10 +4078,14 @@ class PrintQueueManager:
         return cls._instance
     
     def __init__(self):
+        # Fila de entrada: o despachante distribui os trabalhos entre as filas por impressora
         self.print_queue = queue.Queue()
         self.worker_thread = None
         self.is_running = False
-        self.current_job = None
+        self.current_jobs = {}
+        self.lanes = {}
+        self.lanes_lock = threading.Lock()
+        self.lane_idle_timeout = 60.0
         self.lock = threading.Lock()
         self.config = None
         self.job_history = []
@@ -2629,6 +4100,11 @@ class PrintQueueManager:
         
         self.continuous_processing = True
         self.idle_sleep_time = 0.1
+        
+        # Fila persistente: trabalhos pendentes sobrevivem a quedas e reinícios
+        self.job_store = PrintJobStore.get_instance()
+        self.max_resume_attempts = 3
+        self._resume_checked = False
     
     def cancel_job_id(self, job_id: str):
         """Registra um job_id como cancelado."""
@@ -2636,13 +4112,18 @@ class PrintQueueManager:
             self.canceled_job_ids.add(job_id)
             logger.info(f"Job ID {job_id} marcado para cancelamento.")
 
-            if self.current_job and self.current_job["info"].job_id == job_id:
-                self.current_job["info"].status = "canceled"
+            current_job = self.current_jobs.get(job_id)
+            if current_job:
+                current_job["info"].status = "canceled"
                 
     def set_config(self, config):
         """Define o objeto de configuração"""
         self.config = config
         self._load_job_history()
+        
+        perf_config = (config.get("print_performance", {}) or {}) if hasattr(config, 'get') else {}
+        if getattr(config, 'data_dir', None) and perf_config.get("durable_queue", True):
+            self.job_store.configure(db_path=os.path.join(config.data_dir, "print_queue.db"))
     
     def _load_job_history(self):
         """Carrega histórico de trabalhos de impressão"""
@@ -2658,23 +4139,103 @@ class PrintQueueManager:
             self.config.set("print_jobs", self.job_history)
     
     def start(self):
-        """Inicia o processamento da fila de impressão"""
+        """Inicia o despachante da fila de impressão"""
         with self.lock:
             if not self.is_running:
                 self.is_running = True
-                self.worker_thread = threading.Thread(target=self._process_queue)
+                self.worker_thread = threading.Thread(target=self._dispatch_queue)
                 self.worker_thread.daemon = True
                 self.worker_thread.start()
                 logger.info("Gerenciador de fila de impressão iniciado")
+            
+            resume = not self._resume_checked and self.job_store.enabled
+            if resume:
+                self._resume_checked = True
+        
+        if resume:
+            # Em segundo plano: recriar as impressoras pode consultar a rede
+            threading.Thread(target=self._resume_unfinished_jobs, daemon=True).start()
+    
+    def _resume_unfinished_jobs(self):
+        """Recoloca na fila os trabalhos que não terminaram na execução anterior"""
+        jobs = self.job_store.get_unfinished_jobs()
+        if not jobs:
+            return
+        
+        logger.info(f"Retomando {len(jobs)} trabalho(s) pendente(s) da execução anterior")
+        for job in jobs:
+            try:
+                job_info = PrintJobInfo.from_dict(job["job_data"])
+            except Exception as e:
+                logger.error(f"Trabalho {job['job_id']} não pôde ser recuperado: {e}")
+                self.job_store.update_state(job["job_id"], STATE_FAILED)
+                continue
+            
+            # Um trabalho que derrubou o processo várias vezes não volta para a fila
+            if job["attempts"] >= self.max_resume_attempts:
+                reason = f"{job['attempts']} tentativa(s) sem concluir"
+            elif not os.path.exists(job_info.document_path):
+                reason = "arquivo não encontrado"
+            elif not job_info.printer_ip:
+                reason = "impressora sem IP"
+            else:
+                reason = None
+            
+            if reason:
+                logger.warning(f"Trabalho {job_info.job_id} não será retomado: {reason}")
+                job_info.status = "failed"
+                job_info.end_time = datetime.now()
+                self.job_store.update_state(job_info.job_id, STATE_FAILED, job_info.to_dict())
+                self._update_history(job_info)
+                continue
+            
+            job_info.status = "pending"
+            printer_instance = IPPPrinter(
+                printer_ip=job_info.printer_ip,
+                port=631,
+                use_https=False,
+                config=self.config
+            )
+            self.job_store.update_state(job_info.job_id, STATE_QUEUED)
+            self.print_queue.put({"info": job_info, "printer": printer_instance, "callback": None})
+            logger.info(f"Trabalho retomado: {job_info.document_name} ({job_info.job_id})")
     
-    def stop(self):
-        """Para o processamento da fila de impressão"""
+    def stop(self, timeout: float = 30.0):
+        """
+        Para o despachante e as filas das impressoras
+        
+        As filas param de pegar trabalhos e o trabalho em andamento em cada uma
+        termina (gravando seus checkpoints e o estado final). A fila persistente
+        só é fechada depois que todas as filas encerraram; se alguma ainda estiver
+        enviando após o timeout, as escritas são gravadas e o banco fica aberto
+        para ela (o trabalho é retomado na próxima execução se não terminar).
+        """
+        deadline = time.monotonic() + timeout
         with self.lock:
             self.is_running = False
-            if self.worker_thread:
-                self.worker_thread.join(timeout=1.0)
-                self.worker_thread = None
-                logger.info("Gerenciador de fila de impressão parado")
+            worker_thread = self.worker_thread
+            self.worker_thread = None
+        
+        if worker_thread:
+            worker_thread.join(timeout=1.0)
+        
+        with self.lanes_lock:
+            lanes = dict(self.lanes)
+            self.lanes.clear()
+        
+        busy_lanes = []
+        for lane_key, lane in lanes.items():
+            lane["thread"].join(timeout=max(0.0, deadline - time.monotonic()))
+            if lane["thread"].is_alive():
+                busy_lanes.append(lane_key)
+        
+        if busy_lanes:
+            logger.warning(f"Filas ainda enviando após {timeout:.0f}s: {', '.join(busy_lanes)} - "
+                           f"fila persistente mantida aberta")
+            self.job_store.flush()
+        else:
+            self.job_store.close()
+        logger.info("Gerenciador de fila de impressão parado")
     
     def _get_file_hash(self, filepath):
         """
@@ -2721,7 +4282,8 @@ class PrintQueueManager:
                     file_hash = f"unknown_{current_time}"
             
             # CORREÇÃO: Chave única baseada em hash + job info
-            job_key = f"{file_hash}_{print_job_info.printer_id}_{print_job_info.options.copies}"
+            job_key = (f"{file_hash}_{print_job_info.printer_id}_{print_job_info.options.copies}_"
+                       f"{print_job_info.options.page_ranges}")
             
             # Verifica se existe job para esta chave
             if job_key in self.file_jobs:
@@ -2796,6 +4358,9 @@ class PrintQueueManager:
             "callback": callback
         }
         
+        # Grava antes de enfileirar: se o processo cair, o trabalho é retomado no próximo início
+        self.job_store.save_job(print_job_info.to_dict(), STATE_QUEUED)
+        
         # Adiciona à fila
         self.print_queue.put(job_item)
         logger.info(f"Trabalho adicionado à fila: {print_job_info.document_name}")
@@ -2803,201 +4368,337 @@ class PrintQueueManager:
         # Retorna um ID para rastreamento
         return print_job_info.job_id
     
+    def resume_job(self, job_id: str, callback=None) -> Tuple[bool, str]:
+        """
+        Recoloca na fila um trabalho que falhou ou foi cancelado no meio
+        
+        Apenas as páginas/cópias sem checkpoint são reenviadas; as páginas
+        rasterizadas em cache são reaproveitadas.
+        
+        Returns:
+            (sucesso, mensagem)
+        """
+        record = self.job_store.get_job(job_id) if self.job_store.enabled else None
+        if record:
+            if record["state"] in (STATE_QUEUED, STATE_PROCESSING):
+                return False, f"Trabalho {job_id} ainda está na fila"
+            job_data = record["job_data"]
+            completed_pages = len(record["completed_pages"])
+        else:
+            job_data = next((job for job in self.get_job_history() if job.get("job_id") == job_id), None)
+            if job_data is None:
+                return False, f"Trabalho não encontrado: {job_id}"
+            # Sem a fila persistente, só o histórico diz o estado: apenas falhas e cancelamentos voltam
+            if job_data.get("status") not in ("failed", "canceled"):
+                return False, f"Trabalho {job_id} não pode ser retomado (estado: {job_data.get('status')})"
+            completed_pages = 0
+        
+        if job_data.get("status") == "completed":
+            return False, f"Trabalho {job_id} já foi concluído"
+        
+        if self._is_waiting(job_id):
+            return False, f"Trabalho {job_id} ainda está na fila"
+        
+        with self.lock:
+            if any(job["info"].job_id == job_id for job in self.current_jobs.values()):
+                return False, f"Trabalho {job_id} está em processamento"
+            self.canceled_job_ids.discard(job_id)
+        
+        job_info = PrintJobInfo.from_dict(job_data)
+        if not os.path.exists(job_info.document_path):
+            return False, f"Arquivo do trabalho não encontrado: {job_info.document_path}"
+        if not job_info.printer_ip:
+            return False, "Impressora do trabalho não possui IP configurado"
+        
+        job_info.status = "pending"
+        job_info.end_time = None
+        printer_instance = IPPPrinter(
+            printer_ip=job_info.printer_ip,
+            port=631,
+            use_https=False,
+            config=self.config
+        )
+        
+        self.start()
+        self.job_store.save_job(job_info.to_dict(), STATE_QUEUED)
+        self._update_history(job_info)
+        self.print_queue.put({"info": job_info, "printer": printer_instance, "callback": callback})
+        
+        logger.info(f"Trabalho {job_id} retomado ({completed_pages} página(s) já impressas)")
+        return True, f"Trabalho retomado: {completed_pages} página(s) já impressas serão puladas"
+    
+    def _is_waiting(self, job_id: str) -> bool:
+        """Indica se o trabalho aguarda na fila de entrada ou na fila de alguma impressora"""
+        with self.lanes_lock:
+            queues = [self.print_queue] + [lane["queue"] for lane in self.lanes.values()]
+        for job_queue in queues:
+            with job_queue.mutex:
+                if any(item["info"].job_id == job_id for item in job_queue.queue):
+                    return True
+        return False
+    
     def get_queue_size(self):
-        """Retorna o tamanho atual da fila"""
-        return self.print_queue.qsize()
+        """Retorna o total de trabalhos aguardando (entrada + filas das impressoras)"""
+        with self.lanes_lock:
+            lane_sizes = sum(lane["queue"].qsize() for lane in self.lanes.values())
+        return self.print_queue.qsize() + lane_sizes
     
     def get_current_job(self):
-        """Retorna o trabalho atual em processamento"""
+        """Retorna um trabalho em processamento (o mais antigo)"""
+        with self.lock:
+            return next(iter(self.current_jobs.values()), None)
+    
+    def get_current_jobs(self):
+        """Retorna os trabalhos em processamento (um por impressora)"""
         with self.lock:
-            return self.current_job
+            return list(self.current_jobs.values())
     
-    def _process_queue(self):
-        """Processa fila com loop otimizado e contínuo"""
-        logger.info("Iniciando processamento contínuo da fila de impressão")
+    def get_lane_status(self) -> Dict[str, int]:
+        """Trabalhos aguardando em cada fila de impressora"""
+        with self.lanes_lock:
+            return {lane_key: lane["queue"].qsize() for lane_key, lane in self.lanes.items()}
+    
+    def get_printer_job_status(self, job_id: str) -> Dict:
+        """
+        Andamento de um trabalho do lado da impressora
+        
+        Returns:
+            dict com os trabalhos na impressora (job-state, job-state-reasons,
+            impressions-completed) e totais de concluídos/pendentes
+        """
+        return IPPJobTracker.get_instance().get_summary(job_id)
+    
+    def _lane_key(self, job_item) -> str:
+        """Impressora de destino do trabalho (chave da fila)"""
+        job_info = job_item["info"]
+        printer = job_item["printer"]
+        return (job_info.printer_ip or getattr(printer, 'printer_ip', '') or
+                str(job_info.printer_id or "default"))
+    
+    def _dispatch_queue(self):
+        """Distribui os trabalhos da fila de entrada para a fila da impressora de destino"""
+        logger.info("Iniciando despachante da fila de impressão (uma fila por impressora)")
         
         while self.is_running:
             try:
-                # === OTIMIZAÇÃO: Loop contínuo sem sleep desnecessário ===
-                if self.print_queue.empty():
-                    time.sleep(self.idle_sleep_time)  # Sleep mínimo quando idle
-                    continue
-                    
-                job_item = self.print_queue.get(block=False)
-                
-                job_info = job_item["info"]
-                printer = job_item["printer"]
-                callback = job_item["callback"]
-                
-                logger.info(f"Processando trabalho otimizado: {job_info.document_name}")
-                logger.info(f"  Job ID: {job_info.job_id}")
-                logger.info(f"  Printer ID: {job_info.printer_id}")
-                logger.info(f"  Cópias: {job_info.options.copies}")
+                job_item = self.print_queue.get(timeout=self.idle_sleep_time)
+            except queue.Empty:
+                continue
+            
+            try:
+                lane_key = self._lane_key(job_item)
+                with self.lanes_lock:
+                    lane = self.lanes.get(lane_key)
+                    if lane is None:
+                        lane = {"queue": queue.Queue()}
+                        lane["thread"] = threading.Thread(
+                            target=self._lane_worker, args=(lane_key, lane["queue"]), daemon=True
+                        )
+                        self.lanes[lane_key] = lane
+                        lane["thread"].start()
+                        logger.info(f"Fila da impressora {lane_key} criada")
+                    lane["queue"].put(job_item)
                 
-                # Verifica cancelamento
-                with self.lock:
-                    is_canceled = job_info.job_id in self.canceled_job_ids
+                logger.debug(f"Trabalho {job_item['info'].job_id} encaminhado para a fila de {lane_key}")
+            except Exception as e:
+                logger.error(f"Erro ao despachar trabalho: {e}")
+            finally:
+                self.print_queue.task_done()
+    
+    def _lane_worker(self, lane_key: str, lane_queue: queue.Queue):
+        """
+        Processa em ordem os trabalhos de uma impressora
+        
+        Impressoras diferentes são atendidas em paralelo. A fila é encerrada após
+        lane_idle_timeout segundos sem trabalhos e recriada sob demanda.
+        """
+        idle_since = time.time()
+        
+        while self.is_running:
+            try:
+                job_item = lane_queue.get(timeout=max(self.idle_sleep_time, 0.5))
+            except queue.Empty:
+                if time.time() - idle_since < self.lane_idle_timeout:
+                    continue
+                with self.lanes_lock:
+                    # O despachante só coloca trabalhos com o lock: fila vazia aqui é definitiva
+                    if lane_queue.empty() and self.lanes.get(lane_key, {}).get("queue") is lane_queue:
+                        del self.lanes[lane_key]
+                        logger.debug(f"Fila da impressora {lane_key} encerrada por inatividade")
+                        return
+                continue
+            
+            try:
+                self._process_job(job_item)
+            except Exception as e:
+                logger.error(f"Erro no processamento da fila de {lane_key}: {e}")
+            finally:
+                lane_queue.task_done()
+                idle_since = time.time()
+    
+    def _process_job(self, job_item):
+        """Processa um trabalho de impressão"""
+        job_info = job_item["info"]
+        printer = job_item["printer"]
+        callback = job_item["callback"]
+        
+        logger.info(f"Processando trabalho otimizado: {job_info.document_name}")
+        logger.info(f"  Job ID: {job_info.job_id}")
+        logger.info(f"  Printer ID: {job_info.printer_id}")
+        logger.info(f"  Cópias: {job_info.options.copies}")
+        
+        # Verifica cancelamento
+        with self.lock:
+            is_canceled = job_info.job_id in self.canceled_job_ids
 
-                if is_canceled:
-                    logger.info(f"Trabalho cancelado: {job_info.job_id}")
-                    job_info.status = "canceled" 
-                    job_info.end_time = datetime.now()
-                    self._update_history(job_info)
+        if is_canceled:
+            logger.info(f"Trabalho cancelado: {job_info.job_id}")
+            job_info.status = "canceled" 
+            job_info.end_time = datetime.now()
+            self._update_history(job_info)
+            self.job_store.update_state(job_info.job_id, job_info.status, job_info.to_dict())
 
-                    if callback:
-                        wx.CallAfter(callback, job_info.job_id, "canceled", {"message": "Trabalho cancelado"})
+            if callback:
+                wx.CallAfter(callback, job_info.job_id, "canceled", {"message": "Trabalho cancelado"})
 
-                    self.print_queue.task_done()
-                    with self.lock: 
-                        if self.current_job and self.current_job["info"].job_id == job_info.job_id:
-                            self.current_job = None
-                    continue 
+            return
+        
+        with self.lock:
+            self.current_jobs[job_info.job_id] = job_item
+        
+        job_info.status = "processing"
+        self._add_to_history(job_info)
+        self.job_store.update_state(job_info.job_id, STATE_PROCESSING, increment_attempts=True)
+        
+        # === CORREÇÃO: PROCESSAMENTO OTIMIZADO COM MELHOR CONTROLE ===
+        def progress_callback(message):
+            with self.lock:
+                if job_info.status == "canceled":
+                    raise InterruptedError("Trabalho cancelado")
+            if callback:
+                wx.CallAfter(callback, job_info.job_id, "progress", message)
+        
+        should_delete_file = False
+        
+        try:
+            if callback:
+                progress_callback("Iniciando impressão otimizada...")
+            
+            # === CORREÇÃO: Passa configuração para o printer uma só vez ===
+            if not hasattr(printer, 'config') or printer.config is None:
+                printer.config = self.config
+            
+            # === CORREÇÃO: Verifica se endpoint já está em cache ===
+            if hasattr(printer, 'endpoint_cache') and printer.endpoint_cache:
+                cached_config = printer.endpoint_cache.get_printer_endpoint_config(printer.printer_ip)
+                if cached_config and not printer.endpoint_cache.should_rediscover(printer.printer_ip):
+                    logger.info(f"Usando endpoint em cache para {printer.printer_ip}: {cached_config.get('endpoint', '')}")
+            
+            success, result = printer.print_file(
+                job_info.document_path,
+                job_info.options,
+                job_info.document_name,
+                progress_callback if callback else None,
+                job_info=job_info
+            )
+            
+            job_info.end_time = datetime.now()
+            
+            if success:
+                job_info.status = "completed"
                 
-                with self.lock:
-                    self.current_job = job_item
+                total_pages_sent = result.get("total_pages", 0)
+                successful_pages_sent = result.get("successful_pages", 0)
                 
-                job_info.status = "processing"
-                self._add_to_history(job_info)
+                job_info.total_pages = total_pages_sent
+                job_info.completed_pages = successful_pages_sent
                 
-                # === CORREÇÃO: PROCESSAMENTO OTIMIZADO COM MELHOR CONTROLE ===
-                def progress_callback(message):
-                    with self.lock:
-                        if (self.current_job and 
-                            self.current_job["info"].job_id == job_info.job_id and 
-                            self.current_job["info"].status == "canceled"):
-                            raise InterruptedError("Trabalho cancelado")
-                    if callback:
-                        wx.CallAfter(callback, job_info.job_id, "progress", message)
+                # === CORREÇÃO: Só deleta arquivo se 100% de sucesso ===
+                should_delete_file = (successful_pages_sent == total_pages_sent and total_pages_sent > 0)
                 
-                should_delete_file = False
+                logger.info(f"Trabalho concluído: {job_info.document_name}")
+                logger.info(f"  Páginas enviadas: {successful_pages_sent}/{total_pages_sent}")
+                logger.info(f"  Método: {result.get('method', 'unknown')}")
                 
-                try:
-                    if callback:
-                        progress_callback("Iniciando impressão otimizada...")
-                    
-                    # === CORREÇÃO: Passa configuração para o printer uma só vez ===
-                    if not hasattr(printer, 'config') or printer.config is None:
-                        printer.config = self.config
-                    
-                    # === CORREÇÃO: Verifica se endpoint já está em cache ===
-                    if hasattr(printer, 'endpoint_cache') and printer.endpoint_cache:
-                        cached_config = printer.endpoint_cache.get_printer_endpoint_config(printer.printer_ip)
-                        if cached_config and not printer.endpoint_cache.should_rediscover(printer.printer_ip):
-                            logger.info(f"Usando endpoint em cache para {printer.printer_ip}: {cached_config.get('endpoint', '')}")
-                    
-                    success, result = printer.print_file(
-                        job_info.document_path,
-                        job_info.options,
-                        job_info.document_name,
-                        progress_callback if callback else None,
-                        job_info=job_info
-                    )
-                    
-                    job_info.end_time = datetime.now()
-                    
-                    if success:
-                        job_info.status = "completed"
-                        
-                        total_pages_sent = result.get("total_pages", 0)
-                        successful_pages_sent = result.get("successful_pages", 0)
-                        
-                        job_info.total_pages = total_pages_sent
-                        job_info.completed_pages = successful_pages_sent
-                        
-                        # === CORREÇÃO: Só deleta arquivo se 100% de sucesso ===
-                        should_delete_file = (successful_pages_sent == total_pages_sent and total_pages_sent > 0)
-                        
-                        logger.info(f"Trabalho concluído: {job_info.document_name}")
-                        logger.info(f"  Páginas enviadas: {successful_pages_sent}/{total_pages_sent}")
-                        logger.info(f"  Método: {result.get('method', 'unknown')}")
-                        
-                        if result.get("method") == "jpg_parallel":
-                            logger.info(f"  Workers usados: {result.get('workers_used', 'N/A')}")
-                            logger.info(f"  Taxa de sucesso: {(successful_pages_sent/total_pages_sent)*100:.1f}%")
-                        
+                if result.get("method") == "jpg_parallel":
+                    logger.info(f"  Workers usados: {result.get('workers_used', 'N/A')}")
+                    logger.info(f"  Taxa de sucesso: {(successful_pages_sent/total_pages_sent)*100:.1f}%")
+                
+            else:
+                with self.lock:
+                    if job_info.status == "canceled":
+                        logger.info(f"Trabalho cancelado durante impressão: {job_info.document_name}")
                     else:
-                        with self.lock:
-                            if job_info.status == "canceled":
-                                logger.info(f"Trabalho cancelado durante impressão: {job_info.document_name}")
-                            else:
-                                job_info.status = "failed"
-                                logger.error(f"Falha no trabalho: {job_info.document_name}")
-                        
-                        total_pages_sent = result.get("total_pages", 0)
-                        successful_pages_sent = result.get("successful_pages", 0)
-                        
-                        job_info.total_pages = total_pages_sent
-                        job_info.completed_pages = successful_pages_sent
-                        
-                        should_delete_file = False
-                    
-                    # === CORREÇÃO: Remove arquivo apenas se tudo foi impresso corretamente ===
-                    if should_delete_file:
-                        try:
-                            if os.path.exists(job_info.document_path):
-                                os.remove(job_info.document_path)
-                                logger.info(f"Arquivo removido: {job_info.document_path}")
-                        except Exception as e:
-                            logger.warning(f"Não foi possível remover arquivo: {e}")
-                    
-                    self._update_history(job_info)
-                    
-                    # === CORREÇÃO: Sincronização apenas se houve páginas impressas ===
-                    if job_info.completed_pages > 0:
-                        def delayed_sync():
-                            try:
-                                time.sleep(2)  # Aguarda estabilizar
-                                from src.utils.print_sync_manager import PrintSyncManager
-                                sync_manager = PrintSyncManager.get_instance()
-                                if sync_manager:
-                                    logger.info(f"Sincronizando {job_info.completed_pages} páginas impressas...")
-                                    sync_manager.sync_print_jobs()
-                            except Exception as e:
-                                logger.error(f"Erro na sincronização: {e}")
-                        
-                        threading.Thread(target=delayed_sync, daemon=True).start()
-                            
-                    # Callback de resultado
-                    if callback:
-                        status_cb = "complete" if success else ("canceled" if job_info.status == "canceled" else "error")
-                        wx.CallAfter(callback, job_info.job_id, status_cb, result)
-                    
-                except InterruptedError:
-                    logger.info(f"Trabalho interrompido: {job_info.document_name}")
-                    job_info.status = "canceled"
-                    job_info.end_time = datetime.now()
-                    self._update_history(job_info)
-                    if callback:
-                        wx.CallAfter(callback, job_info.job_id, "canceled", {"message": "Trabalho cancelado"})
-
-                except Exception as e:
-                    job_info.status = "failed"
-                    job_info.end_time = datetime.now()
-                    logger.error(f"Erro no processamento: {e}")
-                    
-                    self._update_history(job_info)
-                    
-                    if callback:
-                        wx.CallAfter(callback, job_info.job_id, "error", {"error": str(e)})
+                        job_info.status = "failed"
+                        logger.error(f"Falha no trabalho: {job_info.document_name}")
                 
-                # Limpa controle de jobs processados
-                with self.processed_jobs_lock:
-                    if job_info.job_id in self.processed_jobs:
-                        del self.processed_jobs[job_info.job_id]
-
-                self.print_queue.task_done()
+                total_pages_sent = result.get("total_pages", 0)
+                successful_pages_sent = result.get("successful_pages", 0)
                 
-                with self.lock:
-                    self.current_job = None
+                job_info.total_pages = total_pages_sent
+                job_info.completed_pages = successful_pages_sent
                 
-                # === OTIMIZAÇÃO: Sem sleep entre jobs ===
-                # Remove time.sleep aqui para processamento contínuo
+                should_delete_file = False
+            
+            # === CORREÇÃO: Remove arquivo apenas se tudo foi impresso corretamente ===
+            if should_delete_file:
+                try:
+                    if os.path.exists(job_info.document_path):
+                        os.remove(job_info.document_path)
+                        logger.info(f"Arquivo removido: {job_info.document_path}")
+                except Exception as e:
+                    logger.warning(f"Não foi possível remover arquivo: {e}")
+            
+            self._update_history(job_info)
+            
+            # === CORREÇÃO: Sincronização apenas se houve páginas impressas ===
+            if job_info.completed_pages > 0:
+                def delayed_sync():
+                    try:
+                        time.sleep(2)  # Aguarda estabilizar
+                        from src.utils.print_sync_manager import PrintSyncManager
+                        sync_manager = PrintSyncManager.get_instance()
+                        if sync_manager:
+                            logger.info(f"Sincronizando {job_info.completed_pages} páginas impressas...")
+                            sync_manager.sync_print_jobs()
+                    except Exception as e:
+                        logger.error(f"Erro na sincronização: {e}")
                 
-            except queue.Empty:
-                time.sleep(self.idle_sleep_time)
-            except Exception as e:
-                logger.error(f"Erro no processamento da fila: {e}")
-                time.sleep(1.0)
+                threading.Thread(target=delayed_sync, daemon=True).start()
+                    
+            # Callback de resultado
+            if callback:
+                status_cb = "complete" if success else ("canceled" if job_info.status == "canceled" else "error")
+                wx.CallAfter(callback, job_info.job_id, status_cb, result)
+            
+        except InterruptedError:
+            logger.info(f"Trabalho interrompido: {job_info.document_name}")
+            job_info.status = "canceled"
+            job_info.end_time = datetime.now()
+            self._update_history(job_info)
+            if callback:
+                wx.CallAfter(callback, job_info.job_id, "canceled", {"message": "Trabalho cancelado"})
+
+        except Exception as e:
+            job_info.status = "failed"
+            job_info.end_time = datetime.now()
+            logger.error(f"Erro no processamento: {e}")
+            
+            self._update_history(job_info)
+            
+            if callback:
+                wx.CallAfter(callback, job_info.job_id, "error", {"error": str(e)})
+        
+        # Estado final na fila persistente (completed/failed/canceled)
+        self.job_store.update_state(job_info.job_id, job_info.status, job_info.to_dict())
+        
+        # Limpa controle de jobs processados
+        with self.processed_jobs_lock:
+            if job_info.job_id in self.processed_jobs:
+                del self.processed_jobs[job_info.job_id]
+
+        with self.lock:
+            self.current_jobs.pop(job_info.job_id, None)
 
     def _add_to_history(self, job_info):
         """Adiciona um trabalho ao histórico"""
@@ -3681,7 +5382,37 @@ class PrintSystem:
         
         # Configurações de performance
         perf_config = config.get_print_performance_config()
+        PrinterConnectionPool.get_instance().configure(
+            idle_timeout=perf_config.get("keep_alive_idle_timeout", 20),
+            pool_size=perf_config.get("connection_pool_size", 4)
+        )
+        PrinterProfileRegistry.get_instance().configure(
+            config=config,
+            ttl_hours=perf_config.get("printer_profile_ttl_hours", 24)
+        )
+        IPPJobTracker.get_instance().configure(
+            poll_interval=perf_config.get("job_tracking_poll_interval", 1.0)
+        )
+        RasterPageCache.get_instance().configure(
+            cache_dir=os.path.join(config.data_dir, "cache", "pages"),
+            max_size_mb=perf_config.get("page_cache_max_mb", 512),
+            enabled=perf_config.get("page_cache_enabled", True)
+        )
+        RasterizationLimiter.get_instance().configure(
+            max_concurrent=perf_config.get("max_concurrent_rasterizations", 2)
+        )
+        RasterProcessPool.get_instance().configure(
+            workers=perf_config.get("raster_workers", 0),
+            enabled=perf_config.get("raster_process_pool", True)
+        )
+        RasterizerRegistry.get_instance().configure(
+            config=config,
+            preference=perf_config.get("rasterizer", "auto"),
+            rendering_threads=perf_config.get("ghostscript_rendering_threads", 0),
+            poppler_streaming=perf_config.get("poppler_stdout_streaming", True)
+        )
         self.print_queue_manager.idle_sleep_time = 0.05  # Ultra responsivo
+        self.print_queue_manager.lane_idle_timeout = perf_config.get("printer_lane_idle_timeout", 60)
         
         self.print_queue_manager.start()
         
@@ -3866,22 +5597,15 @@ class PrintSystem:
                     "cached": True
                 }
             
-            # Se não tem cache, faz teste rápido
+            # Se não tem cache, consulta os endpoints em paralelo (Get-Printer-Attributes)
             working_endpoints = []
             protocol = "HTTP"
             
-            # Testa endpoints prioritários rapidamente
-            priority_endpoints = ["/ipp/print", "/ipp", "/printers/ipp"]
-            
-            for endpoint in priority_endpoints:
-                if test_printer._test_endpoint_quick(endpoint, use_https=False):
-                    working_endpoints.append(endpoint)
-                    protocol = "HTTP"
-                    break
-                elif test_printer._test_endpoint_quick(endpoint, use_https=True):
-                    working_endpoints.append(endpoint)
-                    protocol = "HTTPS"
-                    break
+            winner = test_printer._probe_endpoints(IPPPrinter.DISCOVERY_ENDPOINTS)
+            if winner:
+                endpoint, winner_https, _ipp_response = winner
+                working_endpoints.append(endpoint)
+                protocol = "HTTPS" if winner_https else "HTTP"
             
             return {
                 "success": len(working_endpoints) > 0,
@@ -3900,4 +5624,7 @@ class PrintSystem:
     def shutdown(self):
         """Desliga sistema"""
         if self.print_queue_manager:
-            self.print_queue_manager.stop()
\ No newline at end of file
+            self.print_queue_manager.stop()
+        IPPJobTracker.get_instance().stop()
+        RasterProcessPool.get_instance().shutdown()
+        PrinterConnectionPool.get_instance().close_all()
\ No newline at end of file
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Perfil de capacidades e particularidades (quirks) por impressora
+"""
+
+import re
+import time
+import logging
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+import requests
+
+from src.utils import raster_encoders
+
+logger = logging.getLogger("PrintManagementSystem.Utils.PrinterProfile")
+
+# IPs conhecidos de impressoras Epson problemáticas
+KNOWN_EPSON_IPS = {
+    "10.148.1.20": "L14150 Series",
+    "10.148.1.192": "L3250 Series",
+}
+
+KNOWN_VENDORS = ["epson", "brother", "canon", "hp", "kyocera", "lexmark", "ricoh", "samsung", "xerox"]
+
+
+@dataclass
+class PrinterProfile:
+    """Capacidades e parâmetros de envio de uma impressora, resolvidos uma única vez"""
+    printer_ip: str
+    vendor: str = ""
+    model: str = ""
+    epson_mode: bool = False
+    jpg_only: bool = False
+    preferred_dpi: int = 200
+    jpg_quality: Optional[int] = None
+    max_attempts: int = 5
+    retry_delays: List[float] = field(default_factory=lambda: [0.5, 1.0, 2.0, 3.0, 5.0])
+    page_max_attempts: int = 2
+    request_timeout: int = 45
+    retry_pause: float = 0.5
+    page_delay: float = 2.0
+    copy_delay: float = 3.0
+    use_chunked_transfer: bool = True
+    # Tamanho máximo de uma página JPEG enviada (0 = sem limite fixo; a vazão medida ainda limita)
+    max_page_bytes: int = 0
+    # Espaço na impressora para o próximo envio: trabalhos ainda na fila / aguardar conclusão
+    max_queued_jobs: int = 1
+    wait_for_completion: bool = False
+    # Limites do ritmo adaptativo de envio (PrinterPacer)
+    min_send_interval: float = 0.0
+    max_send_interval: float = 5.0
+    send_interval_step: float = 0.25
+    target_accept_latency: float = 3.0
+    resolved_at: float = 0.0
+    # Capacidades informadas pela impressora (Get-Printer-Attributes); vazio = desconhecido
+    document_formats: List[str] = field(default_factory=list)
+    resolutions_dpi: List[int] = field(default_factory=list)
+    sides_supported: List[str] = field(default_factory=list)
+    media_supported: List[str] = field(default_factory=list)
+    # pwg-raster-document-resolution-supported (dpi), pwg-raster-document-type-supported e urf-supported
+    pwg_resolutions_dpi: List[int] = field(default_factory=list)
+    pwg_types: List[str] = field(default_factory=list)
+    urf_supported: List[str] = field(default_factory=list)
+    # multiple-document-jobs-supported (None = não informado)
+    multiple_document_jobs: Optional[bool] = None
+    capabilities_resolved_at: float = 0.0
+
+    @property
+    def is_epson(self) -> bool:
+        """Indica se a impressora precisa do tratamento especial Epson"""
+        return self.epson_mode
+
+    @property
+    def profile_name(self) -> str:
+        """Nome do perfil de envio (usado em chaves de cache)"""
+        return "epson" if self.epson_mode else "default"
+
+    def supports_format(self, mime_type: str) -> Optional[bool]:
+        """Indica se o formato é aceito (None quando as capacidades não são conhecidas)"""
+        if not self.document_formats:
+            return None
+        return mime_type in self.document_formats
+
+    @property
+    def raster_only(self) -> bool:
+        """Indica se a impressora só recebe páginas rasterizadas (não aceita PDF)"""
+        return self.jpg_only or self.supports_format("application/pdf") is False
+
+    def supports_sides(self, sides: str) -> bool:
+        """Indica se o modo frente/verso pode ser enviado (desconhecido conta como suportado)"""
+        return not self.sides_supported or sides in self.sides_supported
+
+    def raster_resolutions(self, mime_type: str) -> List[int]:
+        """Resoluções aceitas para o formato (PWG/URF têm listas próprias)"""
+        if mime_type == raster_encoders.MIME_PWG_RASTER:
+            return self.pwg_resolutions_dpi
+        if mime_type == raster_encoders.MIME_URF:
+            return raster_encoders.urf_resolutions(self.urf_supported)
+        return self.resolutions_dpi
+
+    def supports_raster(self, mime_type: str, color: bool) -> bool:
+        """Indica se PWG/URF pode ser enviado com este espaço de cor e com alguma resolução anunciada"""
+        types = self.pwg_types if mime_type == raster_encoders.MIME_PWG_RASTER else self.urf_supported
+        return (bool(self.raster_resolutions(mime_type)) and
+                raster_encoders.supports_color_space(mime_type, types, color))
+
+    def best_dpi(self, requested_dpi: int, mime_type: str = raster_encoders.MIME_JPEG) -> int:
+        """Maior resolução suportada (no formato) que não excede a pedida nem a preferida do perfil"""
+        limit = min(requested_dpi, self.preferred_dpi)
+        resolutions = self.raster_resolutions(mime_type)
+        if not resolutions:
+            return limit
+        candidates = [dpi for dpi in resolutions if dpi <= limit]
+        return max(candidates) if candidates else min(resolutions)
+
+    def apply_vendor_quirks(self):
+        """Ajusta os parâmetros de envio conforme as particularidades conhecidas"""
+        if self.epson_mode:
+            # Epson L3250/L14150: só JPG, DPI menor, mais tentativas e pausas maiores
+            self.jpg_only = True
+            self.preferred_dpi = 150
+            self.jpg_quality = 75
+            self.max_attempts = 7
+            self.retry_delays = [1.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0]
+            self.page_max_attempts = 7
+            self.request_timeout = 60
+            self.retry_pause = 2.0
+            self.page_delay = 5.0
+            self.copy_delay = 8.0
+            # Epson não lida bem com Transfer-Encoding: chunked
+            self.use_chunked_transfer = False
+            # Páginas grandes (fotos) estouram o tempo limite da placa de rede
+            self.max_page_bytes = 1024 * 1024
+            # Só envia o próximo trabalho depois que o anterior terminar
+            self.wait_for_completion = True
+            # Nunca acelera abaixo de 2s entre páginas; recua até 15s
+            self.min_send_interval = 2.0
+            self.max_send_interval = 15.0
+            self.send_interval_step = 0.5
+            self.target_accept_latency = 8.0
+
+    def to_dict(self) -> Dict:
+        """Converte o perfil para dicionário (persistência)"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PrinterProfile":
+        """Cria um perfil a partir de um dicionário salvo"""
+        known = {name for name in cls.__dataclass_fields__}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+class PrinterProfileRegistry:
+    """
+    Resolve e memoriza os perfis das impressoras
+
+    O perfil é detectado uma vez por impressora (sonda HTTP na porta 80) e fica
+    em memória e na configuração ("printer_profiles") até expirar o TTL, de modo
+    que o envio de páginas nunca faz sondas bloqueantes.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = PrinterProfileRegistry()
+            return cls._instance
+
+    def __init__(self, config=None, ttl_hours: float = 24.0):
+        self.config = config
+        self.ttl_seconds = ttl_hours * 3600
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._resolve_locks = {}
+
+    def configure(self, config=None, ttl_hours: Optional[float] = None):
+        """Define a configuração usada para persistir os perfis e o TTL"""
+        if config is not None:
+            self.config = config
+        if ttl_hours is not None:
+            self.ttl_seconds = max(0.0, float(ttl_hours)) * 3600
+
+    def _is_fresh(self, profile: PrinterProfile) -> bool:
+        return time.time() - profile.resolved_at < self.ttl_seconds
+
+    def get_profile(self, printer_ip: str, config=None) -> PrinterProfile:
+        """Obtém o perfil da impressora (memória → disco → detecção)"""
+        if config is not None and self.config is None:
+            self.config = config
+
+        with self._lock:
+            profile = self._profiles.get(printer_ip)
+            if profile and self._is_fresh(profile):
+                return profile
+            resolve_lock = self._resolve_locks.setdefault(printer_ip, threading.Lock())
+
+        # Só uma thread sonda cada impressora; as demais aguardam o resultado
+        with resolve_lock:
+            with self._lock:
+                profile = self._profiles.get(printer_ip)
+                if profile and self._is_fresh(profile):
+                    return profile
+
+            profile = self._load_profile(printer_ip)
+            if profile is None:
+                profile = self._resolve_profile(printer_ip)
+                self._save_profile(profile)
+
+            with self._lock:
+                self._profiles[printer_ip] = profile
+            return profile
+
+    def update_profile(self, profile: PrinterProfile):
+        """Atualiza um perfil já resolvido (ex.: após consultar atributos IPP)"""
+        with self._lock:
+            self._profiles[profile.printer_ip] = profile
+        self._save_profile(profile)
+
+    def invalidate(self, printer_ip: str):
+        """Descarta o perfil para forçar nova detecção"""
+        with self._lock:
+            self._profiles.pop(printer_ip, None)
+
+        if self.config is not None and hasattr(self.config, 'get'):
+            profiles = self.config.get("printer_profiles", {}) or {}
+            if printer_ip in profiles:
+                del profiles[printer_ip]
+                self.config.set("printer_profiles", profiles)
+
+    def _load_profile(self, printer_ip: str) -> Optional[PrinterProfile]:
+        """Carrega o perfil salvo na configuração, se ainda válido"""
+        if self.config is None or not hasattr(self.config, 'get'):
+            return None
+
+        data = (self.config.get("printer_profiles", {}) or {}).get(printer_ip)
+        if not data:
+            return None
+
+        try:
+            profile = PrinterProfile.from_dict(data)
+        except Exception as e:
+            logger.debug(f"Perfil salvo inválido para {printer_ip}: {e}")
+            return None
+
+        # Perfis salvos por versões anteriores não têm os campos novos
+        profile.apply_vendor_quirks()
+
+        return profile if self._is_fresh(profile) else None
+
+    def _save_profile(self, profile: PrinterProfile):
+        """Persiste o perfil na configuração"""
+        if self.config is None or not hasattr(self.config, 'set'):
+            return
+
+        try:
+            profiles = self.config.get("printer_profiles", {}) or {}
+            profiles[profile.printer_ip] = profile.to_dict()
+            self.config.set("printer_profiles", profiles)
+        except Exception as e:
+            logger.debug(f"Não foi possível salvar o perfil de {profile.printer_ip}: {e}")
+
+    def _resolve_profile(self, printer_ip: str) -> PrinterProfile:
+        """Detecta fabricante/modelo e monta o perfil com as particularidades conhecidas"""
+        profile = PrinterProfile(printer_ip=printer_ip)
+
+        if printer_ip in KNOWN_EPSON_IPS:
+            profile.vendor = "epson"
+            profile.model = KNOWN_EPSON_IPS[printer_ip]
+            profile.epson_mode = True
+        else:
+            self._probe_web_interface(profile)
+
+        profile.apply_vendor_quirks()
+        profile.resolved_at = time.time()
+
+        logger.info(f"Perfil da impressora {printer_ip}: fabricante={profile.vendor or 'desconhecido'}, "
+                    f"modelo={profile.model or 'desconhecido'}, EPSON={profile.epson_mode}, "
+                    f"somente JPG={profile.jpg_only}")
+        return profile
+
+    @staticmethod
+    def _probe_web_interface(profile: PrinterProfile):
+        """Identifica o modelo pela página web da impressora (uma única sonda)"""
+        try:
+            response = requests.get(f"http://{profile.printer_ip}:80", timeout=3, verify=False)
+            if response.status_code != 200:
+                return
+            content = response.text.lower()
+        except Exception:
+            return
+
+        for vendor in KNOWN_VENDORS:
+            if re.search(rf"\b{vendor}\b", content):
+                profile.vendor = vendor
+                model_match = re.search(rf"\b{vendor}\s+([a-z]{{0,3}}\d[\w\-]*)", content)
+                if model_match:
+                    profile.model = model_match.group(1).upper()
+                break
+
+        if "epson" in content and ("l3250" in content or "l14150" in content or "series" in content):
+            profile.epson_mode = True
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Codificadores PWG Raster (image/pwg-raster) e Apple URF (image/urf)
+"""
+
+import struct
+import logging
+from typing import List
+
+logger = logging.getLogger("PrintManagementSystem.Utils.RasterEncoders")
+
+MIME_JPEG = "image/jpeg"
+MIME_PWG_RASTER = "image/pwg-raster"
+MIME_URF = "image/urf"
+
+FILE_EXTENSIONS = {
+    MIME_JPEG: ".jpg",
+    MIME_PWG_RASTER: ".pwg",
+    MIME_URF: ".urf",
+}
+
+# Espaços de cor (cupsColorSpace) do PWG Raster
+PWG_COLORSPACE_SGRAY = 18
+PWG_COLORSPACE_SRGB = 19
+
+# Espaços de cor do cabeçalho de página URF
+URF_COLORSPACE_SGRAY = 0
+URF_COLORSPACE_SRGB = 1
+
+# Tipos de bitmap anunciados em pwg-raster-document-type-supported / urf-supported
+PWG_TYPE_SGRAY = "sgray_8"
+PWG_TYPE_SRGB = "srgb_8"
+URF_TYPE_SGRAY = "W8"
+URF_TYPE_SRGB = "SRGB24"
+
+PWG_PAGE_HEADER_SIZE = 1796
+URF_PAGE_HEADER_SIZE = 32
+
+_numpy = None
+
+
+def _get_numpy():
+    """Importa o NumPy sob demanda (dependência opcional)"""
+    global _numpy
+    if _numpy is None:
+        import numpy
+        _numpy = numpy
+    return _numpy
+
+
+def is_available() -> bool:
+    """Indica se os codificadores podem ser usados (NumPy instalado)"""
+    try:
+        _get_numpy()
+        return True
+    except ImportError:
+        return False
+
+
+def _image_to_array(image, color: bool):
+    """Converte a imagem PIL para um array (altura, largura[, 3]) de uint8"""
+    np = _get_numpy()
+    mode = 'RGB' if color else 'L'
+    if image.mode != mode:
+        image = image.convert(mode)
+    return np.ascontiguousarray(np.asarray(image, dtype=np.uint8))
+
+
+def _pixel_keys(pixels):
+    """Um inteiro por pixel, para comparar pixels inteiros de forma vetorizada"""
+    np = _get_numpy()
+    if pixels.ndim == 2:
+        return pixels
+    return ((pixels[..., 0].astype(np.uint32) << 16) |
+            (pixels[..., 1].astype(np.uint32) << 8) |
+            pixels[..., 2].astype(np.uint32))
+
+
+def _encode_line(out: bytearray, keys, row_bytes: bytes, bytes_per_pixel: int):
+    """
+    Codifica uma linha no esquema PackBits do PWG/URF
+
+    Byte de controle 0-127: o próximo pixel se repete (n + 1) vezes;
+    129-255: seguem (257 - n) pixels literais.
+    """
+    np = _get_numpy()
+    width = len(keys)
+    boundaries = (np.flatnonzero(keys[1:] != keys[:-1]) + 1).tolist()
+    starts = [0] + boundaries
+    ends = boundaries + [width]
+
+    literal_start = None
+    for start, end in zip(starts, ends):
+        if end - start == 1:
+            if literal_start is None:
+                literal_start = start
+            continue
+
+        if literal_start is not None:
+            _emit_literals(out, row_bytes, literal_start, start, bytes_per_pixel)
+            literal_start = None
+
+        while start < end:
+            count = min(end - start, 128)
+            out.append(count - 1)
+            out += row_bytes[start * bytes_per_pixel:(start + 1) * bytes_per_pixel]
+            start += count
+
+    if literal_start is not None:
+        _emit_literals(out, row_bytes, literal_start, width, bytes_per_pixel)
+
+
+def _emit_literals(out: bytearray, row_bytes: bytes, start: int, end: int, bytes_per_pixel: int):
+    """Emite pixels diferentes entre si em grupos de até 128"""
+    while start < end:
+        count = min(end - start, 128)
+        # Um único pixel é codificado como repetição de 1 (controle 0)
+        out.append(257 - count if count > 1 else 0)
+        out += row_bytes[start * bytes_per_pixel:(start + count) * bytes_per_pixel]
+        start += count
+
+
+def compress_bitmap(pixels) -> bytes:
+    """Comprime o bitmap inteiro: repetição de linhas + PackBits por linha"""
+    np = _get_numpy()
+    keys = _pixel_keys(pixels)
+    height = keys.shape[0]
+    bytes_per_pixel = 1 if pixels.ndim == 2 else pixels.shape[2]
+
+    # Linhas idênticas à seguinte, calculado de uma vez para a página toda
+    same_as_next = np.all(keys[1:] == keys[:-1], axis=1).tolist() if height > 1 else []
+
+    out = bytearray()
+    y = 0
+    while y < height:
+        repeat = 0
+        while repeat < 255 and y + repeat < height - 1 and same_as_next[y + repeat]:
+            repeat += 1
+
+        out.append(repeat)
+        _encode_line(out, keys[y], pixels[y].tobytes(), bytes_per_pixel)
+        y += repeat + 1
+
+    return bytes(out)
+
+
+def _fixed_string(value: str, size: int = 64) -> bytes:
+    return value.encode('ascii', 'ignore')[:size - 1].ljust(size, b'\0')
+
+
+def pwg_file_header() -> bytes:
+    """Palavra de sincronismo do PWG Raster"""
+    return b"RaS2"
+
+
+def encode_pwg_page(image, dpi: int, color: bool, duplex: bool = False, tumble: bool = False,
+                    quality: int = 4, page_size_name: str = "", total_pages: int = 1) -> bytes:
+    """
+    Codifica uma página PWG Raster (cabeçalho de 1796 bytes + bitmap comprimido)
+
+    Args:
+        image: Imagem PIL da página
+        dpi: Resolução em que a página foi rasterizada
+        color: True para sRGB 24 bits, False para sGray 8 bits
+        quality: print-quality IPP (3, 4 ou 5)
+        page_size_name: Nome PWG da mídia (ex.: iso_a4_210x297mm)
+    """
+    pixels = _image_to_array(image, color)
+    height, width = pixels.shape[:2]
+    num_colors = 3 if color else 1
+
+    header = bytearray(PWG_PAGE_HEADER_SIZE)
+    header[0:64] = _fixed_string("PwgRaster")
+    struct.pack_into('>I', header, 272, 1 if duplex else 0)
+    struct.pack_into('>II', header, 276, dpi, dpi)
+    struct.pack_into('>II', header, 352, round(width * 72 / dpi), round(height * 72 / dpi))
+    struct.pack_into('>I', header, 368, 1 if tumble else 0)
+    struct.pack_into('>II', header, 372, width, height)
+    struct.pack_into('>IIII', header, 384, 8, 8 * num_colors, width * num_colors, 0)
+    struct.pack_into('>I', header, 400, PWG_COLORSPACE_SRGB if color else PWG_COLORSPACE_SGRAY)
+    struct.pack_into('>I', header, 420, num_colors)
+    # cupsInteger: TotalPageCount, CrossFeedTransform, FeedTransform, ..., PrintQuality
+    struct.pack_into('>III', header, 452, total_pages, 1, 1)
+    struct.pack_into('>I', header, 452 + 8 * 4, quality)
+    header[1732:1796] = _fixed_string(page_size_name)
+
+    return bytes(header) + compress_bitmap(pixels)
+
+
+def _jpeg_components(data) -> int:
+    """Número de componentes do quadro JPEG (1 = tons de cinza; 0 se não encontrado)"""
+    pos = 2
+    size = len(data)
+    while pos + 4 <= size:
+        if data[pos] != 0xFF:
+            return 0
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        # SOF0-SOF15 (exceto DHT, JPG e DAC): comprimento, precisão, altura, largura, componentes
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            return data[pos + 9] if pos + 9 < size else 0
+        pos += 2 + ((data[pos + 2] << 8) | data[pos + 3])
+    return 0
+
+
+def is_grayscale(data, mime_type: str) -> bool:
+    """Indica se uma página já codificada tem um único canal (sGray / JPEG de 1 componente)"""
+    if mime_type == MIME_PWG_RASTER:
+        offset = len(pwg_file_header()) + 400
+        return len(data) >= offset + 4 and struct.unpack_from('>I', data, offset)[0] == PWG_COLORSPACE_SGRAY
+    if mime_type == MIME_URF:
+        # Cabeçalho do arquivo (12 bytes) + bits por pixel + espaço de cor
+        return len(data) > 13 and data[13] == URF_COLORSPACE_SGRAY
+    return _jpeg_components(data) == 1
+
+
+def urf_file_header(page_count: int) -> bytes:
+    """Cabeçalho do arquivo URF"""
+    return b"UNIRAST\0" + struct.pack('>I', page_count)
+
+
+def encode_urf_page(image, dpi: int, color: bool, duplex: bool = False, tumble: bool = False,
+                    quality: int = 4) -> bytes:
+    """Codifica uma página URF (cabeçalho de 32 bytes + bitmap comprimido)"""
+    pixels = _image_to_array(image, color)
+    height, width = pixels.shape[:2]
+
+    if duplex:
+        urf_duplex = 2 if tumble else 3
+    else:
+        urf_duplex = 1
+
+    header = bytearray(URF_PAGE_HEADER_SIZE)
+    header[0] = 24 if color else 8
+    header[1] = URF_COLORSPACE_SRGB if color else URF_COLORSPACE_SGRAY
+    header[2] = urf_duplex
+    header[3] = quality
+    struct.pack_into('>III', header, 12, width, height, dpi)
+
+    return bytes(header) + compress_bitmap(pixels)
+
+
+def urf_resolutions(urf_supported: List[str]) -> List[int]:
+    """Resoluções (dpi) da palavra-chave RS de urf-supported (ex.: "RS300-600")"""
+    for keyword in urf_supported:
+        if keyword.startswith("RS"):
+            return sorted(int(value) for value in keyword[2:].split("-") if value.isdigit())
+    return []
+
+
+def supports_color_space(mime_type: str, types: List[str], color: bool) -> bool:
+    """
+    Indica se a impressora aceita páginas sRGB (color) ou sGray de 8 bits no formato
+
+    Args:
+        types: pwg-raster-document-type-supported (PWG) ou urf-supported (URF)
+    """
+    if mime_type == MIME_PWG_RASTER:
+        return (PWG_TYPE_SRGB if color else PWG_TYPE_SGRAY) in types
+    if mime_type == MIME_URF:
+        return (URF_TYPE_SRGB if color else URF_TYPE_SGRAY) in types
+    return True
+
+
+def encode_document(image, mime_type: str, dpi: int, color: bool, duplex: bool = False,
+                    tumble: bool = False, quality: int = 4, page_size_name: str = "") -> bytes:
+    """Codifica uma página como documento completo (uma página por documento)"""
+    if mime_type == MIME_PWG_RASTER:
+        return pwg_file_header() + encode_pwg_page(
+            image, dpi, color, duplex, tumble, quality, page_size_name
+        )
+    if mime_type == MIME_URF:
+        return urf_file_header(1) + encode_urf_page(image, dpi, color, duplex, tumble, quality)
+    raise ValueError(f"Formato raster não suportado: {mime_type}")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Rasterização em vários núcleos: pool de processos com retorno das páginas por memória compartilhada
+"""
+
+import os
+import io
+import logging
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils import raster_encoders
+from src.utils import blank_pages
+from src.utils import page_color
+from src.utils import jpeg_budget
+from src.utils.rasterizers import PopplerRasterizer
+
+logger = logging.getLogger("PrintManagementSystem.Utils.RasterPool")
+
+
+@dataclass(frozen=True)
+class PageEncoding:
+    """Parâmetros de codificação de uma página (enviados aos processos do pool)"""
+    mime_type: str = raster_encoders.MIME_JPEG
+    dpi: int = 200
+    color_mode: str = "auto"
+    epson_mode: bool = False
+    jpg_quality: int = 75
+    duplex: bool = False
+    tumble: bool = False
+    quality: int = 4
+    page_size_name: str = ""
+    # Fração mínima de tinta de uma página; abaixo dela a página é descartada (0 = desativado)
+    blank_threshold: float = 0.0
+    # Fração máxima de cor de uma página "auto" enviada em tons de cinza (0 = desativado)
+    grayscale_threshold: float = 0.0
+    # Tamanho máximo desejado de uma página JPEG (0 = qualidade fixa) e qualidade mais baixa aceitável
+    byte_budget: int = 0
+    min_jpg_quality: int = 40
+
+    @property
+    def detects_grayscale(self) -> bool:
+        """Indica se páginas sem cor do modo automático são convertidas para tons de cinza"""
+        # Epson L3250 funciona melhor com RGB
+        return self.grayscale_threshold > 0 and self.color_mode == "auto" and not self.epson_mode
+
+    def encode(self, image, save: Optional[Callable] = None) -> bytes:
+        """
+        Converte o modo de cor da imagem e a codifica no formato escolhido
+
+        Args:
+            image: Imagem PIL da página
+            save: Função (image, **save_kwargs) -> bytes para reaproveitar um buffer
+
+        Returns:
+            Dados codificados, ou blank_pages.BLANK_PAGE para uma página em branco
+        """
+        if self.blank_threshold > 0 and blank_pages.is_blank_page(image, self.blank_threshold):
+            return blank_pages.BLANK_PAGE
+
+        color_mode = self.color_mode
+        if self.detects_grayscale and page_color.is_grayscale_page(image, self.grayscale_threshold):
+            # Página sem cor: um canal só (1/3 dos dados) e enviada como monocromática
+            color_mode = "monochrome"
+
+        if self.mime_type != raster_encoders.MIME_JPEG:
+            return raster_encoders.encode_document(
+                image,
+                self.mime_type,
+                self.dpi,
+                color=color_mode != "monochrome",
+                duplex=self.duplex,
+                tumble=self.tumble,
+                quality=self.quality,
+                page_size_name=self.page_size_name
+            )
+
+        if self.epson_mode:
+            # Epson L3250 funciona melhor com RGB
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+
+            # Remove transparência se existir (Epson não lida bem)
+            if image.mode == 'RGBA':
+                from PIL import Image
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.split()[-1])
+                image = background
+
+            # Epson L3250 funciona melhor sem otimização e sem JPEG progressivo
+            save_kwargs = {'format': 'JPEG', 'quality': self.jpg_quality, 'optimize': False, 'progressive': False}
+        else:
+            if color_mode == "monochrome":
+                image = image.convert('L')
+            elif image.mode not in ['RGB', 'L']:
+                image = image.convert('RGB')
+
+            save_kwargs = {'format': 'JPEG', 'quality': self.jpg_quality, 'optimize': True}
+
+        if self.byte_budget > 0:
+            save_kwargs['quality'] = jpeg_budget.fit_quality(image, self.byte_budget, self.jpg_quality,
+                                                             self.min_jpg_quality, save_kwargs)
+
+        if save is not None:
+            return save(image, **save_kwargs)
+
+        buffer = io.BytesIO()
+        image.save(buffer, **save_kwargs)
+        return buffer.getvalue()
+
+
+def _rasterize_range(pdf_path: str, first_page: int, last_page: int, convert_kwargs: Dict,
+                     encoding: PageEncoding, rasterizer=None) -> List[Tuple[int, Optional[str], object]]:
+    """
+    Executado no processo do pool: rasteriza e codifica um intervalo de páginas
+
+    POSIX: cada página codificada vai para um bloco de memória compartilhada; só
+    o nome e o tamanho do bloco voltam pelo pipe (page_num, nome, tamanho) e o
+    processo principal lê e remove o bloco. Windows: um bloco nomeado deixa de
+    existir quando o último handle é fechado, antes de o processo principal
+    abri-lo, então os dados voltam pelo próprio pipe (page_num, None, dados).
+    """
+    if rasterizer is None:
+        rasterizer = PopplerRasterizer(convert_kwargs.get('poppler_path'))
+
+    results = []
+    blocks = []
+    try:
+        # O paralelismo vem dos processos do pool: o backend roda com uma thread só
+        for page_num, data in rasterizer.single_threaded().render(pdf_path, first_page, last_page,
+                                                                  convert_kwargs, encoding):
+            if os.name != "posix":
+                results.append((page_num, None, data))
+                continue
+
+            block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+            blocks.append(block)
+            block.buf[:len(data)] = data
+            results.append((page_num, block.name, len(data)))
+    except BaseException:
+        # Falha no meio do intervalo: os blocos já criados não chegam ao processo principal
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+
+    if blocks:
+        from multiprocessing import resource_tracker
+
+        for block in blocks:
+            block.close()
+            # O bloco passa a pertencer ao processo principal (que o remove após a leitura)
+            resource_tracker.unregister(block._name, "shared_memory")
+
+    return results
+
+
+def _read_block(name: str, size: int) -> bytes:
+    """Copia e remove um bloco de memória compartilhada criado por um processo do pool"""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(block.buf[:size])
+    finally:
+        block.close()
+        block.unlink()
+
+
+def split_ranges(pages: List[int], parts: int) -> List[Tuple[int, int]]:
+    """Divide páginas em até `parts` intervalos contíguos de tamanho parecido"""
+    pages = sorted(pages)
+    if not pages:
+        return []
+
+    # Primeiro separa em trechos contíguos (páginas puladas quebram o intervalo)
+    runs = []
+    start = previous = pages[0]
+    for page_num in pages[1:]:
+        if page_num != previous + 1:
+            runs.append((start, previous))
+            start = page_num
+        previous = page_num
+    runs.append((start, previous))
+
+    chunk = max(1, -(-len(pages) // max(1, parts)))
+    ranges = []
+    for start, end in runs:
+        while start <= end:
+            ranges.append((start, min(end, start + chunk - 1)))
+            start += chunk
+    return ranges
+
+
+class RasterProcessPool:
+    """
+    Pool de processos para rasterização e codificação de páginas
+
+    pdftocairo, conversão de modo de cor e codificação JPEG/PWG rodam fora do
+    processo principal (sem disputar o GIL com as filas de envio). O documento é
+    dividido em intervalos de páginas, um por processo; as páginas codificadas
+    voltam por multiprocessing.shared_memory, sem serializar os buffers (no
+    Windows, pelo pipe do pool; ver _rasterize_range). O número
+    de processos é global e por isso também limita a rasterização entre filas.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = RasterProcessPool()
+            return cls._instance
+
+    def __init__(self, workers: int = 0, enabled: bool = True):
+        self.workers = self._resolve_workers(workers)
+        self.enabled = enabled
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resolve_workers(workers: int) -> int:
+        """0 = automático: um processo por núcleo, deixando um livre para a interface e o envio"""
+        if workers and workers > 0:
+            return int(workers)
+        return max(1, (os.cpu_count() or 2) - 1)
+
+    def configure(self, workers: Optional[int] = None, enabled: Optional[bool] = None):
+        """Atualiza o número de processos e/ou ativa/desativa o pool"""
+        with self._lock:
+            if workers is not None:
+                resolved = self._resolve_workers(workers)
+                if resolved != self.workers:
+                    self._shutdown_executor()
+                    self.workers = resolved
+            if enabled is not None:
+                self.enabled = bool(enabled)
+                if not self.enabled:
+                    self._shutdown_executor()
+
+    @property
+    def is_active(self) -> bool:
+        """Indica se vale usar o pool (ativado e com mais de um processo)"""
+        return self.enabled and self.workers > 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: fork de um processo com várias threads pode travar
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"Pool de rasterização iniciado com {self.workers} processo(s)")
+            return self._executor
+
+    def rasterize(self, pdf_path: str, pages: List[int], convert_kwargs: Dict,
+                  encoding: PageEncoding, rasterizer=None) -> Dict[int, bytes]:
+        """
+        Rasteriza e codifica as páginas em paralelo
+
+        Args:
+            rasterizer: Backend de rasterização (padrão: Poppler)
+
+        Returns:
+            dict página -> dados codificados
+
+        Raises:
+            Exception: se um processo falhar (o chamador pode usar a conversão local)
+        """
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_rasterize_range, pdf_path, first_page, last_page, convert_kwargs, encoding, rasterizer)
+            for first_page, last_page in split_ranges(pages, self.workers)
+        ]
+
+        encoded = {}
+        error = None
+        # Lê todos os resultados (mesmo após um erro) para não deixar blocos órfãos
+        for future in futures:
+            try:
+                for page_num, name, payload in future.result():
+                    encoded[page_num] = _read_block(name, payload) if name is not None else payload
+            except Exception as e:
+                error = error or e
+
+        if error is not None:
+            if isinstance(error, (OSError, RuntimeError)) or "BrokenProcessPool" in type(error).__name__:
+                with self._lock:
+                    self._shutdown_executor()
+            raise error
+        return encoded
+
+    def _shutdown_executor(self):
+        """Encerra os processos (chamado com o lock)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        """Encerra o pool"""
+        with self._lock:
+            self._shutdown_executor()
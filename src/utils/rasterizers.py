@@ -0,0 +1,845 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Backends de rasterização de PDF (Poppler e Ghostscript) e escolha do mais rápido
+"""
+
+import io
+import os
+import re
+import time
+import glob
+import shutil
+import struct
+import logging
+import platform
+import tempfile
+import threading
+import subprocess
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils import raster_encoders
+from src.utils import blank_pages
+from src.utils import page_color
+from src.utils.subprocess_utils import popen_hidden
+
+logger = logging.getLogger("PrintManagementSystem.Utils.Rasterizers")
+
+RASTERIZER_POPPLER = "poppler"
+RASTERIZER_GHOSTSCRIPT = "ghostscript"
+
+# Argumentos de convert_kwargs aceitos pelo pdf2image
+_PDF2IMAGE_ARGS = ("dpi", "fmt", "thread_count", "use_pdftocairo", "grayscale", "poppler_path")
+
+# Executáveis do Ghostscript que interpretam PDF (gpcl6/gspcl só leem PCL)
+_GHOSTSCRIPT_NAMES_WINDOWS = ("gswin64c.exe", "gswin32c.exe", "gs.exe")
+_GHOSTSCRIPT_NAMES_UNIX = ("gs",)
+
+_PIPE_CHUNK = 1 << 16
+
+
+class RasterizerError(Exception):
+    """Falha de um backend de rasterização"""
+    pass
+
+
+class Rasterizer:
+    """
+    Interface dos backends de rasterização
+
+    render() produz (página, dados codificados) na ordem das páginas, à medida
+    que cada uma fica pronta; os dados seguem o PageEncoding recebido.
+    """
+
+    name = ""
+
+    def render(self, pdf_path: str, first_page: int, last_page: int, convert_kwargs: Dict, encoding,
+               save=None, skip: Iterable[int] = ()) -> Iterator[Tuple[int, bytes]]:
+        """
+        Rasteriza e codifica um intervalo de páginas
+
+        Args:
+            convert_kwargs: Parâmetros da conversão (dpi, grayscale, poppler_path...)
+            encoding: PageEncoding das páginas
+            save: Função (image, **save_kwargs) -> bytes para reaproveitar um buffer
+            skip: Páginas do intervalo que não precisam ser codificadas
+        """
+        raise NotImplementedError
+
+    def single_threaded(self) -> "Rasterizer":
+        """Versão do backend para rodar dentro de um processo do pool (sem threads próprias)"""
+        return self
+
+
+class PopplerRasterizer(Rasterizer):
+    """
+    Poppler com as páginas lidas direto do stdout do pdftoppm
+
+    Sem prefixo de saída o pdftoppm escreve as páginas em sequência (PPM/PGM)
+    no stdout. Cada quadro é lido para um buffer pré-alocado e vai direto para o
+    codificador, sem a escrita e releitura dos arquivos temporários do pdf2image
+    (~25 MB por página A4 a 200 DPI). O pdftocairo só escreve no stdout com uma
+    página por execução e sem formato raw, por isso o pdftoppm. Sem ele (ou com
+    stream=False) a conversão usa o pdf2image.
+    """
+
+    name = RASTERIZER_POPPLER
+
+    def __init__(self, poppler_path: Optional[str] = None, stream: bool = True, timeout: float = 300.0):
+        self.poppler_path = poppler_path
+        self.stream = stream
+        self.timeout = timeout
+
+    def render(self, pdf_path: str, first_page: int, last_page: int, convert_kwargs: Dict, encoding,
+               save=None, skip: Iterable[int] = ()) -> Iterator[Tuple[int, bytes]]:
+        poppler_path = convert_kwargs.get("poppler_path") or self.poppler_path
+        executable = _poppler_executable(poppler_path, "pdftoppm") if self.stream else None
+        if executable is None:
+            yield from self._render_pdf2image(pdf_path, first_page, last_page, convert_kwargs, encoding, save, skip)
+            return
+
+        from PIL import Image
+
+        command = [executable, '-r', str(convert_kwargs.get('dpi', encoding.dpi)),
+                   '-f', str(first_page), '-l', str(last_page)]
+        if convert_kwargs.get('grayscale'):
+            command.append('-gray')
+        command.append(pdf_path)
+
+        skip = set(skip)
+        frames = _stream_process(command, _read_pnm_frames, last_page - first_page + 1, self.timeout, "pdftoppm")
+        for page_num, (mode, size, pixels) in enumerate(frames, first_page):
+            if page_num in skip:
+                continue
+            # A imagem aponta para o buffer do quadro: é codificada antes de ler o próximo
+            image = Image.frombuffer(mode, size, pixels, "raw", mode, 0, 1)
+            try:
+                yield page_num, encoding.encode(image, save)
+            finally:
+                image.close()
+
+    def _render_pdf2image(self, pdf_path: str, first_page: int, last_page: int, convert_kwargs: Dict, encoding,
+                          save, skip: Iterable[int]) -> Iterator[Tuple[int, bytes]]:
+        """Conversão pelo pdf2image (páginas em arquivos temporários)"""
+        import pdf2image
+
+        kwargs = {key: value for key, value in convert_kwargs.items() if key in _PDF2IMAGE_ARGS}
+        if self.poppler_path and not kwargs.get("poppler_path"):
+            kwargs["poppler_path"] = self.poppler_path
+
+        skip = set(skip)
+        images = pdf2image.convert_from_path(pdf_path, first_page=first_page, last_page=last_page, **kwargs)
+        for page_num, image in enumerate(images, first_page):
+            try:
+                if page_num not in skip:
+                    yield page_num, encoding.encode(image, save)
+            finally:
+                image.close()
+
+
+class _JpegStreamSplitter:
+    """Separa os JPEGs concatenados na saída dos dispositivos jpeg/jpeggray"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0
+        self._in_scan = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> List[bytes]:
+        buf = self._buffer
+        buf += data
+        pages = []
+
+        while True:
+            if self._in_scan:
+                # Nos dados comprimidos, 0xFF só é marcador se não vier seguido de 0x00 ou RSTn
+                index = buf.find(b'\xff', self._pos)
+                while index != -1 and index + 1 < len(buf) and (buf[index + 1] == 0 or 0xD0 <= buf[index + 1] <= 0xD7):
+                    index = buf.find(b'\xff', index + 2)
+                if index == -1:
+                    self._pos = len(buf)
+                    break
+                self._pos = index
+                if index + 1 >= len(buf):
+                    break
+                self._in_scan = False
+
+            pos = self._pos
+            if pos + 2 > len(buf):
+                break
+            if buf[pos] != 0xFF:
+                raise RasterizerError("Saída JPEG do Ghostscript inválida")
+
+            marker = buf[pos + 1]
+            if marker == 0xFF:
+                self._pos += 1
+            elif marker == 0xD9:
+                # Fim da imagem: a página está completa
+                pages.append(bytes(buf[:pos + 2]))
+                del buf[:pos + 2]
+                self._pos = 0
+            elif marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+                self._pos += 2
+            else:
+                if pos + 4 > len(buf):
+                    break
+                length = (buf[pos + 2] << 8) | buf[pos + 3]
+                if pos + 2 + length > len(buf):
+                    break
+                self._pos = pos + 2 + length
+                self._in_scan = marker == 0xDA
+
+        return pages
+
+
+class _PwgStreamSplitter:
+    """
+    Separa as páginas do PWG Raster gerado pelo dispositivo pwgraster
+
+    O tamanho comprimido de uma página só é conhecido percorrendo o bitmap
+    (repetição de linhas + PackBits), então cada linha é percorrida sem ser
+    descomprimida até a página fechar.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._synced = False
+        self._header = None
+        self._pos = 0
+        self._lines_left = 0
+        self._line_filled = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer) if self._synced else len(self._buffer) + 1
+
+    def feed(self, data: bytes) -> List[Tuple[bytes, bytes]]:
+        buf = self._buffer
+        buf += data
+        pages = []
+
+        if not self._synced:
+            if len(buf) < 4:
+                return pages
+            if buf[:4] != raster_encoders.pwg_file_header():
+                raise RasterizerError("Saída PWG do Ghostscript inválida")
+            del buf[:4]
+            self._synced = True
+
+        header_size = raster_encoders.PWG_PAGE_HEADER_SIZE
+        while True:
+            if self._header is None:
+                if len(buf) < header_size:
+                    break
+                self._header = bytes(buf[:header_size])
+                self._lines_left = struct.unpack_from('>I', self._header, 376)[0]
+                self._pos = header_size
+                self._line_filled = None
+
+            bits_per_pixel, bytes_per_line = struct.unpack_from('>II', self._header, 388)
+            bytes_per_pixel = max(1, bits_per_pixel // 8)
+            pos, size = self._pos, len(buf)
+            lines_left, filled = self._lines_left, self._line_filled
+            complete = True
+
+            # A última linha pode ter ficado pela metade no pedaço anterior
+            while lines_left > 0 or filled is not None:
+                if filled is None:
+                    if pos >= size:
+                        complete = False
+                        break
+                    # Byte de repetição: a linha vale por (n + 1) linhas
+                    lines_left -= buf[pos] + 1
+                    pos += 1
+                    filled = 0
+                while filled < bytes_per_line:
+                    if pos >= size:
+                        complete = False
+                        break
+                    control = buf[pos]
+                    if control == 128:
+                        # Preenche o restante da linha com branco
+                        step, pixels_bytes = 1, bytes_per_line - filled
+                    elif control < 128:
+                        step, pixels_bytes = 1 + bytes_per_pixel, (control + 1) * bytes_per_pixel
+                    else:
+                        pixels_bytes = (257 - control) * bytes_per_pixel
+                        step = 1 + pixels_bytes
+                    if pos + step > size:
+                        complete = False
+                        break
+                    pos += step
+                    filled += pixels_bytes
+                if not complete:
+                    break
+                filled = None
+
+            self._pos, self._lines_left, self._line_filled = pos, lines_left, filled
+            if not complete:
+                break
+
+            pages.append((self._header, bytes(buf[header_size:pos])))
+            del buf[:pos]
+            self._header = None
+
+        return pages
+
+
+def _read_pnm_header(stdout) -> Optional[Tuple[str, Tuple[int, int]]]:
+    """Lê o cabeçalho P5/P6 do próximo quadro (None no fim da saída)"""
+    tokens = []
+    token = bytearray()
+    while len(tokens) < 4:
+        byte = stdout.read(1)
+        if not byte:
+            if tokens or token:
+                raise EOFError
+            return None
+        if byte == b"#" and not token:
+            stdout.readline()
+        elif byte.isspace():
+            if token:
+                tokens.append(bytes(token))
+                token.clear()
+        else:
+            token += byte
+    # O espaço que encerrou o último campo é o separador único antes dos pixels
+
+    magic, width, height, max_value = tokens
+    if magic not in (b"P5", b"P6") or max_value != b"255":
+        raise RasterizerError(f"Saída PNM inválida ({magic.decode('ascii', 'replace')}, máximo {max_value!r})")
+    return ("RGB" if magic == b"P6" else "L"), (int(width), int(height))
+
+
+def _read_pnm_frames(stdout) -> Iterator[Tuple[str, Tuple[int, int], bytearray]]:
+    """
+    Lê as imagens P5/P6 concatenadas no pipe, cada uma direto para um buffer pré-alocado
+
+    O buffer é reaproveitado enquanto o tamanho da página não muda: cada quadro
+    só é válido até o próximo ser pedido. Retorna False se a saída terminar no
+    meio de um quadro.
+    """
+    buffer = None
+    while True:
+        try:
+            header = _read_pnm_header(stdout)
+        except EOFError:
+            return False
+        if header is None:
+            return True
+
+        mode, (width, height) = header
+        length = width * height * (3 if mode == "RGB" else 1)
+        if buffer is None or len(buffer) != length:
+            buffer = bytearray(length)
+        view = memoryview(buffer)
+        filled = 0
+        while filled < length:
+            count = stdout.readinto(view[filled:])
+            if not count:
+                return False
+            filled += count
+        yield mode, (width, height), buffer
+
+
+def _split_stream(splitter):
+    """Leitor de stdout que separa as páginas com um *StreamSplitter"""
+    def read_pages(stdout):
+        while True:
+            chunk = stdout.read1(_PIPE_CHUNK)
+            if not chunk:
+                break
+            yield from splitter.feed(chunk)
+        return not splitter.pending
+    return read_pages
+
+
+# setpagedevice que ignora o NumCopies do documento (o operador original é ligado pelo bind)
+_LOCK_NUM_COPIES = ("/setpagedevice { dup /NumCopies known "
+                    "{ dup length dict copy dup /NumCopies 1 put } if setpagedevice } bind def")
+
+
+def _stream_process(command: List[str], read_pages, expected_pages: Optional[int], timeout: float,
+                    tool: str) -> Iterator:
+    """
+    Executa um rasterizador e produz cada página assim que ela sai do pipe
+
+    Args:
+        read_pages: Gerador (stdout) -> páginas; retorna False se a saída terminou incompleta
+        expected_pages: Páginas que a execução deve produzir (None = desconhecido)
+    """
+    with tempfile.TemporaryFile() as stderr:
+        process = popen_hidden(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr)
+        # Um processo travado é encerrado; a leitura do pipe termina e o erro é informado
+        watchdog = threading.Timer(timeout, process.kill)
+        watchdog.daemon = True
+        watchdog.start()
+        produced = 0
+        try:
+            pages = read_pages(process.stdout)
+            while True:
+                try:
+                    page = next(pages)
+                except StopIteration as stop:
+                    complete = stop.value is not False
+                    break
+                if expected_pages is not None and produced == expected_pages:
+                    # Página a mais: a numeração não corresponde ao documento, nada além é enviado
+                    raise RasterizerError(f"{tool} gerou mais páginas que as {expected_pages} do documento")
+                produced += 1
+                yield page
+
+            returncode = process.wait()
+            if (returncode != 0 or not complete or
+                    (expected_pages is not None and produced != expected_pages)):
+                stderr.seek(0)
+                message = stderr.read().decode('utf-8', 'replace').strip()[-500:]
+                raise RasterizerError(f"{tool} terminou com código {returncode} após "
+                                      f"{produced} de {expected_pages or '?'} página(s): {message}")
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+
+class GhostscriptRasterizer(Rasterizer):
+    """
+    Ghostscript com a saída de várias páginas lida continuamente de um pipe
+
+    JPEG e PWG Raster saem prontos dos dispositivos jpeg/jpeggray e pwgraster,
+    sem decodificar nem recodificar em Python; os demais formatos (e o JPEG RGB
+    de páginas monocromáticas da Epson ou o PWG com a detecção de páginas em
+    branco ativa) passam por pgmraw/ppmraw e pelo PageEncoding. Com mais de
+    uma thread, o modo de faixas é forçado para que -dNumRenderingThreads
+    tenha efeito.
+    """
+
+    name = RASTERIZER_GHOSTSCRIPT
+
+    def __init__(self, executable: str, rendering_threads: int = 1, timeout: float = 300.0):
+        self.executable = executable
+        self.rendering_threads = max(1, int(rendering_threads))
+        self.timeout = timeout
+
+    def single_threaded(self) -> "GhostscriptRasterizer":
+        if self.rendering_threads == 1:
+            return self
+        return GhostscriptRasterizer(self.executable, 1, self.timeout)
+
+    def _command(self, source_path: str, page_range: Optional[Tuple[int, int]], dpi: int,
+                 device_args: List[str]) -> List[str]:
+        command = [
+            self.executable,
+            '-q', '-dSAFER', '-dBATCH', '-dNOPAUSE', '-dNOPROMPT',
+            '-sstdout=%stderr',
+            f'-r{dpi}',
+            # Suavização equivalente à do pdftocairo
+            '-dTextAlphaBits=4', '-dGraphicsAlphaBits=4',
+        ]
+        if page_range is not None:
+            command += [f'-dFirstPage={page_range[0]}', f'-dLastPage={page_range[1]}']
+        if self.rendering_threads > 1:
+            command += [f'-dNumRenderingThreads={self.rendering_threads}', '-dMaxBitmap=0']
+        # Cópias pedidas pelo próprio documento (#copies, NumCopies) repetiriam as páginas
+        # na saída e deslocariam a numeração: as cópias são sempre as do trabalho IPP
+        return command + device_args + ['-dNumCopies=1', '-sOutputFile=-', '-c', _LOCK_NUM_COPIES,
+                                        '-f', source_path]
+
+    def render(self, pdf_path: str, first_page: int, last_page: int, convert_kwargs: Dict, encoding,
+               save=None, skip: Iterable[int] = ()) -> Iterator[Tuple[int, bytes]]:
+        return self._render(pdf_path, (first_page, last_page), convert_kwargs.get('dpi', encoding.dpi),
+                            encoding, save, skip, last_page - first_page + 1)
+
+    def render_document(self, source_path: str, dpi: int, encoding, save=None, skip: Iterable[int] = (),
+                        expected_pages: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """
+        Rasteriza o documento inteiro numa única interpretação
+
+        Aceita qualquer entrada do Ghostscript (PDF ou PostScript), inclusive
+        PostScript, que não permite pular para uma página sem interpretar as anteriores.
+        """
+        return self._render(source_path, None, dpi, encoding, save, skip, expected_pages)
+
+    def _render(self, source_path: str, page_range: Optional[Tuple[int, int]], dpi: int, encoding, save,
+                skip: Iterable[int], expected_pages: Optional[int]) -> Iterator[Tuple[int, bytes]]:
+        from PIL import Image
+
+        skip = set(skip)
+        first_page = page_range[0] if page_range else 1
+        grayscale = encoding.color_mode == "monochrome"
+
+        if encoding.mime_type == raster_encoders.MIME_JPEG and not (encoding.epson_mode and grayscale):
+            device_args = [f"-sDEVICE={'jpeggray' if grayscale else 'jpeg'}", f'-dJPEGQ={encoding.jpg_quality}']
+            pages = self._stream(self._command(source_path, page_range, dpi, device_args),
+                                 _split_stream(_JpegStreamSplitter()), expected_pages)
+            for page_num, data in enumerate(pages, first_page):
+                if page_num in skip:
+                    continue
+                if encoding.blank_threshold > 0 or encoding.detects_grayscale:
+                    data = self._inspect_jpeg(data, encoding, save)
+                if encoding.byte_budget > 0 and len(data) > encoding.byte_budget:
+                    # Página acima do orçamento: recodificada com a qualidade ajustada
+                    with Image.open(io.BytesIO(data)) as image:
+                        data = encoding.encode(image, save)
+                yield page_num, data
+            return
+
+        # Com a análise das páginas (branco/cor) o PWG é codificado a partir do bitmap decodificado
+        if (encoding.mime_type == raster_encoders.MIME_PWG_RASTER and
+                not (encoding.blank_threshold > 0 or encoding.detects_grayscale)):
+            color_space = raster_encoders.PWG_COLORSPACE_SGRAY if grayscale else raster_encoders.PWG_COLORSPACE_SRGB
+            device_args = ['-sDEVICE=pwgraster', f'-dcupsColorSpace={color_space}', '-dcupsBitsPerColor=8']
+            pages = self._stream(self._command(source_path, page_range, dpi, device_args),
+                                 _split_stream(_PwgStreamSplitter()), expected_pages)
+            for page_num, (header, bitmap) in enumerate(pages, first_page):
+                if page_num not in skip:
+                    yield page_num, self._pwg_document(header, bitmap, encoding, color_space)
+            return
+
+        device_args = [f"-sDEVICE={'pgmraw' if grayscale else 'ppmraw'}"]
+        pages = self._stream(self._command(source_path, page_range, dpi, device_args),
+                             _read_pnm_frames, expected_pages)
+        for page_num, (mode, size, pixels) in enumerate(pages, first_page):
+            if page_num not in skip:
+                # A imagem aponta para o buffer do quadro: é codificada antes de ler o próximo
+                image = Image.frombuffer(mode, size, pixels, "raw", mode, 0, 1)
+                try:
+                    yield page_num, encoding.encode(image, save)
+                finally:
+                    image.close()
+
+    @staticmethod
+    def _inspect_jpeg(data: bytes, encoding, save) -> bytes:
+        """
+        Detecção de páginas em branco/sem cor num JPEG pronto do Ghostscript
+
+        A análise usa a decodificação reduzida (draft, até 1/8), quase sem
+        custo; só páginas sem cor são decodificadas por inteiro e recodificadas
+        em tons de cinza.
+        """
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            image.draft(image.mode, (max(1, image.width // 8), max(1, image.height // 8)))
+            if encoding.blank_threshold > 0 and blank_pages.is_blank_page(image, encoding.blank_threshold):
+                return blank_pages.BLANK_PAGE
+            keep_color = (not encoding.detects_grayscale or image.mode == "L" or
+                          not page_color.is_grayscale_page(image, encoding.grayscale_threshold))
+            if keep_color:
+                return data
+
+        with Image.open(io.BytesIO(data)) as image:
+            return encoding.encode(image.convert("L"), save)
+
+    @staticmethod
+    def _pwg_document(header: bytes, bitmap: bytes, encoding, color_space: int) -> bytes:
+        """Documento PWG de uma página com os campos do trabalho no cabeçalho"""
+        if struct.unpack_from('>I', header, 400)[0] != color_space:
+            raise RasterizerError("Ghostscript gerou PWG Raster com espaço de cor diferente do pedido")
+
+        header = bytearray(header)
+        struct.pack_into('>I', header, 272, 1 if encoding.duplex else 0)
+        struct.pack_into('>I', header, 368, 1 if encoding.tumble else 0)
+        # Cada página é enviada como um documento próprio
+        struct.pack_into('>I', header, 452, 1)
+        struct.pack_into('>I', header, 452 + 8 * 4, encoding.quality)
+        header[1732:1796] = raster_encoders._fixed_string(encoding.page_size_name)
+        return raster_encoders.pwg_file_header() + bytes(header) + bitmap
+
+    def _stream(self, command: List[str], read_pages, expected_pages: Optional[int]) -> Iterator:
+        """Executa o Ghostscript e produz cada página assim que ela sai do pipe"""
+        return _stream_process(command, read_pages, expected_pages, self.timeout, "Ghostscript")
+
+
+def find_ghostscript() -> Optional[str]:
+    """Localiza um executável do Ghostscript capaz de ler PDF (PATH ou pasta portátil gs/)"""
+    is_windows = platform.system() == 'Windows'
+    names = _GHOSTSCRIPT_NAMES_WINDOWS if is_windows else _GHOSTSCRIPT_NAMES_UNIX
+
+    # Pasta portátil instalada pela impressora virtual
+    portable_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'gs')
+    if os.path.isdir(portable_dir):
+        for root, dirs, files in os.walk(portable_dir):
+            lower_files = {name.lower(): name for name in files}
+            for name in names:
+                if name in lower_files:
+                    return os.path.join(root, lower_files[name])
+
+    for name in names:
+        path = shutil.which(name)
+        if path:
+            return path
+
+    if is_windows:
+        for base in (os.environ.get('ProgramFiles', r'C:\Program Files'),
+                     os.environ.get('ProgramFiles(x86)', r'C:\Program Files (x86)')):
+            for name in names:
+                matches = sorted(glob.glob(os.path.join(base, 'gs', '*', 'bin', name)), reverse=True)
+                if matches:
+                    return matches[0]
+    return None
+
+
+_DSC_PAGES = re.compile(rb"^%%Pages:\s*(\d+|\(atend\))", re.MULTILINE)
+
+
+def postscript_page_count(data: bytes) -> Optional[int]:
+    """
+    Número de páginas de um PostScript pelo comentário DSC %%Pages
+
+    Procura no cabeçalho e, para "(atend)", no trailer. Sem o comentário
+    (PostScript não-DSC) retorna None: só é possível contar interpretando.
+    """
+    match = _DSC_PAGES.search(data[:65536])
+    if match and match.group(1) != b"(atend)":
+        return int(match.group(1)) or None
+
+    for match in reversed(list(_DSC_PAGES.finditer(data[-65536:]))):
+        if match.group(1) != b"(atend)":
+            return int(match.group(1)) or None
+    return None
+
+
+def _poppler_executable(poppler_path: Optional[str], name: str) -> Optional[str]:
+    """Caminho de um utilitário do Poppler (na pasta informada ou no PATH)"""
+    if platform.system() == 'Windows':
+        name += ".exe"
+    if poppler_path:
+        path = os.path.join(poppler_path, name)
+        return path if os.path.exists(path) else None
+    return shutil.which(name)
+
+
+def _poppler_available(poppler_path: Optional[str]) -> bool:
+    """Indica se o Poppler está instalado (pdftoppm para o stdout ou pdftocairo do pdf2image)"""
+    return any(_poppler_executable(poppler_path, name) for name in ("pdftoppm", "pdftocairo"))
+
+
+def write_sample_pdf(path: str, pages: int = 3):
+    """Gera um PDF vetorial pequeno (texto e preenchimentos) para comparar os backends"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for page_num in range(1, pages + 1):
+        lines = [f"BT /F1 9 Tf 40 {800 - row * 12} Td (Pagina {page_num} linha {row} - "
+                 f"amostra de texto para medir a rasterizacao do documento) Tj ET"
+                 for row in range(60)]
+        lines += [f"0.{row % 9} 0.3 0.{(row * 3) % 9} rg {40 + row * 25} 60 20 {40 + row * 7} re f"
+                  for row in range(20)]
+        content = "\n".join(lines).encode('ascii')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects)))
+        page_refs.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % ref for ref in page_refs), pages)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+class RasterizerRegistry:
+    """
+    Escolhe o backend de rasterização
+
+    Com só um toolchain instalado (ex.: apenas o Ghostscript da impressora
+    virtual) ele é usado diretamente; com os dois, uma medição única num PDF de
+    amostra decide o mais rápido neste computador. O resultado fica salvo na
+    configuração ("rasterizer_benchmark") e só é refeito quando os backends
+    disponíveis mudam ou a medição expira. Enquanto a medição roda (em segundo
+    plano) o Poppler continua sendo usado.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Obtém instância única (singleton)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = RasterizerRegistry()
+            return cls._instance
+
+    def __init__(self, preference: str = "auto", rendering_threads: int = 0, benchmark_ttl_days: float = 30.0):
+        self.config = None
+        self.preference = preference
+        self.rendering_threads = rendering_threads
+        self.poppler_streaming = True
+        self.benchmark_ttl_seconds = benchmark_ttl_days * 86400
+        self._ghostscript_path = None
+        self._ghostscript_searched = False
+        self._benchmark = None
+        self._benchmark_thread = None
+        self._lock = threading.Lock()
+
+    def configure(self, config=None, preference: Optional[str] = None, rendering_threads: Optional[int] = None,
+                  poppler_streaming: Optional[bool] = None):
+        """
+        Define a configuração (persistência da medição), o backend preferido,
+        as threads do Ghostscript e se o Poppler é lido pelo stdout
+        """
+        with self._lock:
+            if config is not None:
+                self.config = config
+            if preference:
+                self.preference = str(preference).lower()
+            if rendering_threads is not None:
+                self.rendering_threads = int(rendering_threads)
+            if poppler_streaming is not None:
+                self.poppler_streaming = bool(poppler_streaming)
+
+    def set_ghostscript_path(self, path: Optional[str]):
+        """Informa o Ghostscript localizado/instalado pela impressora virtual"""
+        if not path:
+            return
+        directory, name = os.path.split(path)
+        if name.lower().startswith(('gpcl', 'gspcl')):
+            # Interpretador PCL: procura o executável PostScript/PDF da mesma instalação
+            candidates = [os.path.join(directory, candidate) for candidate in _GHOSTSCRIPT_NAMES_WINDOWS]
+            path = next((candidate for candidate in candidates if os.path.exists(candidate)), None)
+            if path is None:
+                return
+        with self._lock:
+            self._ghostscript_path = path
+            self._ghostscript_searched = True
+
+    def _get_ghostscript_path(self) -> Optional[str]:
+        with self._lock:
+            if not self._ghostscript_searched:
+                self._ghostscript_path = find_ghostscript()
+                self._ghostscript_searched = True
+                if self._ghostscript_path:
+                    logger.info(f"Ghostscript disponível para rasterização: {self._ghostscript_path}")
+            return self._ghostscript_path
+
+    def get_ghostscript(self) -> Optional[GhostscriptRasterizer]:
+        """Backend Ghostscript, se houver um executável disponível"""
+        ghostscript_path = self._get_ghostscript_path()
+        if not ghostscript_path:
+            return None
+        return GhostscriptRasterizer(ghostscript_path, self._resolve_threads())
+
+    def _resolve_threads(self) -> int:
+        if self.rendering_threads and self.rendering_threads > 0:
+            return self.rendering_threads
+        return max(1, (os.cpu_count() or 2) // 2)
+
+    def available(self, poppler_path: Optional[str] = None) -> Dict[str, Rasterizer]:
+        """Backends instalados neste computador"""
+        backends = {}
+        if _poppler_available(poppler_path):
+            backends[RASTERIZER_POPPLER] = PopplerRasterizer(poppler_path, self.poppler_streaming)
+        ghostscript = self.get_ghostscript()
+        if ghostscript:
+            backends[RASTERIZER_GHOSTSCRIPT] = ghostscript
+        return backends
+
+    def get_rasterizer(self, poppler_path: Optional[str] = None) -> Rasterizer:
+        """Backend a usar nas próximas conversões"""
+        backends = self.available(poppler_path)
+        if not backends:
+            # Nenhum encontrado: mantém o pdf2image, que informa o erro ao converter
+            return PopplerRasterizer(poppler_path, self.poppler_streaming)
+
+        if self.preference in backends:
+            return backends[self.preference]
+        if len(backends) == 1:
+            return next(iter(backends.values()))
+
+        selected = self._selected_backend(sorted(backends))
+        if selected in backends:
+            return backends[selected]
+
+        self._start_benchmark(backends)
+        return backends[RASTERIZER_POPPLER]
+
+    def _selected_backend(self, names: List[str]) -> Optional[str]:
+        """Backend escolhido por uma medição ainda válida para o mesmo conjunto de backends"""
+        with self._lock:
+            result = self._benchmark
+            if result is None and self.config is not None and hasattr(self.config, 'get'):
+                result = self.config.get("rasterizer_benchmark", None) or None
+                self._benchmark = result
+
+        if not result or sorted(result.get("candidates", [])) != names:
+            return None
+        if time.time() - result.get("measured_at", 0) > self.benchmark_ttl_seconds:
+            return None
+        return result.get("selected")
+
+    def _start_benchmark(self, backends: Dict[str, Rasterizer]):
+        with self._lock:
+            if self._benchmark_thread and self._benchmark_thread.is_alive():
+                return
+            self._benchmark_thread = threading.Thread(target=self.benchmark, args=(backends,), daemon=True)
+            self._benchmark_thread.start()
+
+    def benchmark(self, backends: Dict[str, Rasterizer], pages: int = 4, dpi: int = 150,
+                  repeat: int = 2) -> Optional[Dict]:
+        """Mede cada backend no PDF de amostra e guarda o mais rápido"""
+        from src.utils.raster_pool import PageEncoding
+
+        encoding = PageEncoding(dpi=dpi)
+        convert_kwargs = {'dpi': dpi, 'fmt': 'jpeg', 'thread_count': 1, 'use_pdftocairo': True}
+        timings = {}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sample_path = os.path.join(temp_dir, "amostra.pdf")
+            write_sample_pdf(sample_path, pages)
+
+            for name, backend in backends.items():
+                best = None
+                try:
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        rendered = sum(1 for _ in backend.render(sample_path, 1, pages, convert_kwargs, encoding))
+                        elapsed = time.perf_counter() - start
+                        if rendered != pages:
+                            raise RasterizerError(f"{rendered} de {pages} páginas")
+                        best = elapsed if best is None else min(best, elapsed)
+                except Exception as e:
+                    logger.warning(f"Backend de rasterização {name} falhou na medição: {e}")
+                    continue
+                timings[name] = round(best / pages, 4)
+
+        if not timings:
+            return None
+
+        result = {
+            "candidates": sorted(backends),
+            "timings": timings,
+            "selected": min(timings, key=timings.get),
+            "measured_at": time.time(),
+        }
+        logger.info(f"Rasterização: {', '.join(f'{n}={t * 1000:.0f}ms/página' for n, t in timings.items())} "
+                    f"- usando {result['selected']}")
+
+        with self._lock:
+            self._benchmark = result
+        if self.config is not None and hasattr(self.config, 'set'):
+            try:
+                self.config.set("rasterizer_benchmark", result)
+            except Exception as e:
+                logger.debug(f"Não foi possível salvar a medição de rasterização: {e}")
+        return result
@@ -453,6 +453,10 @@ class AppUpdater:
                 notification_type="info"
             )
             
+            # Garante que a fila de impressão persistente esteja gravada antes do reinício
+            from src.utils.job_store import PrintJobStore
+            PrintJobStore.get_instance().flush()
+            
             # Verifica se o arquivo baixado é um executável do Windows
             if update_file.lower().endswith('.exe') and self.system == "Windows":
                 return self._apply_exe_update(update_file)
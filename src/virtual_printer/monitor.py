@@ -482,6 +482,11 @@ class VirtualPrinterManager:
         if not self.config.get("auto_print", False):
             return
         
+        # PostScript já enviado direto à impressora: o PDF salvo é só o arquivo
+        if FileMonitor.was_printed(document.path):
+            logger.info(f"Auto-impressão ignorada: {document.name} já foi impresso pela impressora virtual")
+            return
+        
         # CORREÇÃO: Controle de duplicação específico para auto-impressão
         if not hasattr(self, '_auto_print_processed'):
             self._auto_print_processed = {}
@@ -21,6 +21,7 @@ from pathlib import Path
 import getpass
 import ctypes
 from src.utils.subprocess_utils import run_hidden, popen_hidden, check_output_hidden
+from src.utils.rasterizers import RasterizerRegistry, postscript_page_count
 
 logger = logging.getLogger("PrintManagementSystem.VirtualPrinter.Server")
 
@@ -71,6 +72,9 @@ class PrinterServer:
                 logger.warning("AVISO: Não foi possível instalar o Ghostscript automaticamente.")
         else:
             logger.info(f"Ghostscript encontrado em: {self.ghostscript_path}")
+        
+        # O mesmo Ghostscript fica disponível como backend de rasterização da impressão
+        RasterizerRegistry.get_instance().set_ghostscript_path(self.ghostscript_path)
     
     def _find_ghostscript(self):
         """Localiza o executável do Ghostscript cross-platform"""
@@ -1159,8 +1163,13 @@ class PrinterServer:
         
         return filename
     
-    def _save_pdf(self, pdf_data, title=None, author=None, filename=None):
-        """Salva os dados PDF com controle rigoroso de duplicatas - VERSÃO CORRIGIDA"""
+    def _save_pdf(self, pdf_data, title=None, author=None, filename=None, already_printed=False):
+        """
+        Salva os dados PDF com controle rigoroso de duplicatas - VERSÃO CORRIGIDA
+        
+        Args:
+            already_printed: O documento já foi enviado à impressora (a auto-impressão ignora o arquivo)
+        """
         if not pdf_data:
             logger.error("Nenhum dado PDF para salvar.")
             return None
@@ -1271,6 +1280,11 @@ class PrinterServer:
             # Garante que o diretório existe
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
+            if already_printed:
+                # Antes de gravar: o monitor de arquivos pode ver o PDF assim que ele aparecer
+                from src.utils.file_monitor import FileMonitor
+                FileMonitor.mark_as_printed(output_path)
+            
             # Operação atômica para salvar
             temp_path = output_path + '.tmp'
             try:
@@ -1534,6 +1548,10 @@ class PrinterServer:
                 logger.info("Usando dados PDF diretamente...")
                 pdf_data = job_data
             else:
+                # Impressora só-raster: PostScript vai direto para a fila, sem passar por PDF
+                if self._print_postscript_directly(job_data, filename):
+                    return
+                
                 # Converter para PDF
                 logger.info("Convertendo PostScript para PDF...")
                 pdf_data = self._postscript_to_pdf(job_data)
@@ -1544,4 +1562,75 @@ class PrinterServer:
                 logger.info(f"Trabalho de impressão processado: {os.path.basename(saved_path)}")
             
         except Exception as e:
-            logger.error(f"Erro ao processar trabalho de impressão: {e}")
\ No newline at end of file
+            logger.error(f"Erro ao processar trabalho de impressão: {e}")
+    
+    def _print_postscript_directly(self, job_data, filename):
+        """
+        Envia o PostScript direto para a auto-impressão quando a impressora só aceita raster
+        
+        O Ghostscript rasteriza o PostScript numa única passada (sem o PDF
+        intermediário e a segunda interpretação pelo Poppler). O PDF para o
+        arquivo é gerado em segundo plano e não é impresso de novo.
+        
+        Returns:
+            bool: True se o trabalho foi enfileirado (caso contrário segue o caminho via PDF)
+        """
+        if not self.config.get("auto_print", False):
+            return False
+        
+        performance = self.config.get("print_performance", {}) or {}
+        if not performance.get("postscript_fast_path", True):
+            return False
+        
+        # Sem %%Pages não dá para acompanhar/retomar as páginas: usa o caminho via PDF
+        if not postscript_page_count(job_data[:65536]) and not postscript_page_count(job_data[-65536:]):
+            logger.debug("PostScript sem %%Pages: usando conversão para PDF")
+            return False
+        
+        try:
+            from src.utils.file_monitor import FileMonitor
+            from src.utils.printer_profile import PrinterProfileRegistry
+            
+            target = FileMonitor.get_auto_print_target(self.config)
+            if target is None:
+                return False
+            printer, options = target
+            
+            profile = PrinterProfileRegistry.get_instance().get_profile(printer.ip, self.config)
+            if not profile.raster_only or RasterizerRegistry.get_instance().get_ghostscript() is None:
+                return False
+            
+            display_name = self._clean_filename(filename or "") or f"documento_{time.strftime('%d-%m-%Y_%H-%M-%S')}"
+            base_name = os.path.splitext(display_name)[0]
+            timestamp = int(time.time() * 1000)
+            
+            # O arquivo de spool é removido pela fila quando o trabalho termina com sucesso
+            spool_dir = os.path.join(self.config.temp_dir, "spool")
+            os.makedirs(spool_dir, exist_ok=True)
+            spool_path = os.path.join(spool_dir, f"{base_name}_{timestamp}.ps")
+            with open(spool_path, 'wb') as f:
+                f.write(job_data)
+            
+            job_id = f"auto_{timestamp}_ps"
+            if not FileMonitor.submit_auto_print_job(self.config, printer, options, job_id,
+                                                     spool_path, f"{base_name}.pdf"):
+                os.remove(spool_path)
+                return False
+            
+        except Exception as e:
+            logger.warning(f"Impressão direta do PostScript indisponível, usando PDF: {e}")
+            return False
+        
+        logger.info(f"PostScript enviado direto para {printer.name} (impressora só-raster): {display_name}")
+        threading.Thread(target=self._archive_postscript, args=(job_data, filename), daemon=True).start()
+        return True
+    
+    def _archive_postscript(self, job_data, filename):
+        """Converte o PostScript já impresso para PDF e o salva na pasta de documentos"""
+        try:
+            pdf_data = self._postscript_to_pdf(job_data)
+            saved_path = self._save_pdf(pdf_data, None, None, filename, already_printed=True)
+            if saved_path:
+                logger.info(f"PDF do trabalho impresso salvo: {os.path.basename(saved_path)}")
+        except Exception as e:
+            logger.error(f"Erro ao salvar o PDF do trabalho impresso: {e}")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark da montagem de requisições IPP: codificação completa a cada
+requisição versus template pré-codificado (IPPRequestTemplate)
+"""
+
+import os
+import sys
+import struct
+import timeit
+import argparse
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.print_system import (
+    IPPEncoder, IPPRequestTemplate, IPPOperation, IPPTag, IPPVersion
+)
+
+
+def build_attributes(page_num: int):
+    """Atributos típicos de um Print-Job JPG por página"""
+    job_name = f"relatorio_mensal_p{page_num:02d}"
+    return {
+        "printer-uri": "ipp://192.168.1.50:631/ipp/print",
+        "requesting-user-name": "usuario",
+        "job-name": job_name,
+        "document-name": job_name,
+        "document-format": "image/jpeg",
+        "ipp-attribute-fidelity": False,
+        "job-priority": 50,
+        "copies": 1,
+        "orientation-requested": 3,
+        "print-quality": 4,
+        "media": "iso_a4_210x297mm",
+        "print-color-mode": "monochrome",
+    }
+
+
+def encode_full(request_id: int, attributes) -> bytes:
+    """Codificação completa (um struct.pack + concatenação por atributo)"""
+    packet = struct.pack('>HHI', IPPVersion.IPP_1_1, IPPOperation.PRINT_JOB, request_id)
+    packet += struct.pack('>B', IPPTag.OPERATION)
+    packet += IPPEncoder.encode_string(IPPTag.CHARSET, "attributes-charset", "utf-8")
+    packet += IPPEncoder.encode_string(IPPTag.LANGUAGE, "attributes-natural-language", "en-us")
+    for name, value in attributes.items():
+        packet += IPPEncoder.encode_attribute(name, value)
+    packet += struct.pack('>B', IPPTag.JOB)
+    packet += struct.pack('>B', IPPTag.END)
+    return packet
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da montagem de requisições IPP")
+    parser.add_argument("--requests", type=int, default=20000, help="Requisições por rodada")
+    parser.add_argument("--repeat", type=int, default=5, help="Número de rodadas")
+    args = parser.parse_args()
+
+    pages = [build_attributes(page_num) for page_num in range(1, 11)]
+    templates = {}
+
+    def encode_with_template(request_id: int, attributes) -> bytes:
+        key = IPPRequestTemplate.cache_key(IPPOperation.PRINT_JOB, attributes)
+        template = templates.get(key)
+        if template is None:
+            template = templates[key] = IPPRequestTemplate(IPPOperation.PRINT_JOB, attributes)
+        return bytes(template.render(request_id, attributes))
+
+    # Os dois caminhos precisam produzir exatamente os mesmos bytes
+    for request_id, attributes in enumerate(pages, 1):
+        assert encode_full(request_id, attributes) == encode_with_template(request_id, attributes)
+
+    def run_full():
+        for i in range(args.requests):
+            encode_full(i, pages[i % len(pages)])
+
+    def run_template():
+        for i in range(args.requests):
+            encode_with_template(i, pages[i % len(pages)])
+
+    full = min(timeit.repeat(run_full, number=1, repeat=args.repeat))
+    template = min(timeit.repeat(run_template, number=1, repeat=args.repeat))
+
+    print(f"Requisições por rodada: {args.requests}")
+    print(f"Codificação completa: {full / args.requests * 1e6:8.2f} µs/requisição")
+    print(f"Template:             {template / args.requests * 1e6:8.2f} µs/requisição")
+    print(f"Ganho:                {full / template:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
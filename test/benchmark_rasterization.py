@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da rasterização em vários núcleos: RasterProcessPool com 1, 2, 4...
+processos num documento de 100+ páginas (requer poppler e Pillow)
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from src.utils.raster_pool import RasterProcessPool, PageEncoding
+
+
+def build_document(path: str, pages: int):
+    """Gera um PDF A4 com texto e blocos em todas as páginas"""
+    images = []
+    for page_num in range(1, pages + 1):
+        image = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(image)
+        for line in range(60):
+            draw.text((80, 80 + line * 26), f"Página {page_num} - linha {line} " * 4, fill="black")
+        draw.rectangle((80, 1500, 80 + (page_num * 37) % 1000, 1650), fill=(30, 90, 160))
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=150)
+
+
+def worker_counts(max_workers: int):
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da rasterização com pool de processos")
+    parser.add_argument("--pages", type=int, default=120, help="Páginas do documento gerado")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolução da rasterização")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Maior número de processos")
+    args = parser.parse_args()
+
+    convert_kwargs = {"dpi": args.dpi, "fmt": "ppm", "thread_count": 1, "use_pdftocairo": True}
+    encoding = PageEncoding(dpi=args.dpi, jpg_quality=75)
+    pages = list(range(1, args.pages + 1))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf_path = os.path.join(temp_dir, "benchmark.pdf")
+        build_document(pdf_path, args.pages)
+
+        print(f"Documento: {args.pages} páginas a {args.dpi} DPI")
+        baseline = None
+        for workers in worker_counts(max(1, args.max_workers)):
+            pool = RasterProcessPool(workers=workers)
+            try:
+                # Aquece os processos (spawn + importações) fora da medição
+                pool.rasterize(pdf_path, pages[:workers], convert_kwargs, encoding)
+
+                start = time.perf_counter()
+                encoded = pool.rasterize(pdf_path, pages, convert_kwargs, encoding)
+                elapsed = time.perf_counter() - start
+            finally:
+                pool.shutdown()
+
+            assert sorted(encoded) == pages
+            baseline = baseline or elapsed
+            print(f"{workers:3d} processo(s): {elapsed:7.2f}s  {args.pages / elapsed:7.1f} páginas/s  "
+                  f"ganho {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da detecção de páginas em branco
+"""
+
+import os
+import sys
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from src.utils import blank_pages, raster_encoders
+from src.utils.raster_pool import PageEncoding
+
+# A4 a 300 dpi e limite padrão da configuração (blank_page_ink_threshold)
+A4_300DPI = (2480, 3508)
+THRESHOLD = 0.0001
+
+
+@unittest.skipUnless(raster_encoders.is_available(), "NumPy não instalado")
+class TestBlankPages(unittest.TestCase):
+    """Tinta medida numa amostra reduzida da página"""
+
+    def test_white_and_near_white_pages_are_blank(self):
+        for mode, color in (("RGB", "white"), ("L", 255), ("L", 240), ("RGB", (250, 245, 235))):
+            with Image.new(mode, A4_300DPI, color) as image:
+                self.assertEqual(blank_pages.ink_coverage(image), 0.0)
+                self.assertTrue(blank_pages.is_blank_page(image, THRESHOLD))
+
+    def test_thin_line_is_ink(self):
+        with Image.new("L", A4_300DPI, 255) as image:
+            ImageDraw.Draw(image).line((200, 1700, 2200, 1700), fill=0, width=1)
+            self.assertGreater(blank_pages.ink_coverage(image), 0.0)
+            self.assertFalse(blank_pages.is_blank_page(image, THRESHOLD))
+
+    def test_colored_ink_counts_by_darkest_channel(self):
+        # Amarelo puro: claro em tons de cinza, mas é tinta
+        with Image.new("RGB", (1000, 1000), "white") as image:
+            ImageDraw.Draw(image).rectangle((0, 0, 999, 249), fill=(255, 255, 0))
+            self.assertAlmostEqual(blank_pages.ink_coverage(image), 0.25, delta=0.01)
+
+    def test_other_modes(self):
+        with Image.new("RGBA", (600, 600), (255, 255, 255, 255)) as image:
+            self.assertTrue(blank_pages.is_blank_page(image, THRESHOLD))
+        with Image.new("1", (600, 600), 1) as image:
+            ImageDraw.Draw(image).rectangle((0, 0, 299, 599), fill=0)
+            self.assertAlmostEqual(blank_pages.ink_coverage(image), 0.5, delta=0.01)
+
+    def test_page_encoding_skips_blank_pages(self):
+        encoding = PageEncoding(blank_threshold=THRESHOLD)
+        with Image.new("RGB", (1240, 1754), "white") as image:
+            self.assertEqual(encoding.encode(image), blank_pages.BLANK_PAGE)
+            # Uma linha curta (assinatura, número de página) já basta
+            ImageDraw.Draw(image).line((100, 1600, 400, 1600), fill="black", width=3)
+            self.assertNotEqual(encoding.encode(image), blank_pages.BLANK_PAGE)
+            # Desativado: a página em branco é codificada normalmente
+            image.paste("white", (0, 0, 1240, 1754))
+            self.assertNotEqual(PageEncoding().encode(image), blank_pages.BLANK_PAGE)
+
+
+if __name__ == "__main__":
+    unittest.main()
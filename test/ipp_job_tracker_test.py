@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do acompanhamento de trabalhos na impressora
+"""
+
+import os
+import sys
+import time
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.ipp_job_tracker import (
+    IPPJobTracker, JOB_STATE_PENDING, JOB_STATE_PROCESSING, JOB_STATE_COMPLETED
+)
+
+
+class FakePrinter:
+    """Cliente IPP de teste: estados definidos pelo teste, sem rede"""
+
+    def __init__(self, printer_ip="10.0.0.1"):
+        self.printer_ip = printer_ip
+        self.states = {}
+        self.online = True
+        self.get_jobs_calls = 0
+
+    def get_job_attributes(self, job_id):
+        if not self.online:
+            return None
+        if job_id not in self.states:
+            return {"gone": True}
+        return {"state": self.states[job_id], "impressions_completed": 1}
+
+    def get_active_jobs(self):
+        self.get_jobs_calls += 1
+        if not self.online:
+            return None
+        return {job_id: {"state": state} for job_id, state in self.states.items()
+                if state != JOB_STATE_COMPLETED}
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestIPPJobTracker(unittest.TestCase):
+    """Consulta dos trabalhos e recuperação de impressoras sem resposta"""
+
+    def setUp(self):
+        self.tracker = IPPJobTracker(poll_interval=0.01, max_failures=2, unsupported_cooldown=0.2)
+        self.printer = FakePrinter()
+
+    def tearDown(self):
+        self.tracker.stop()
+
+    def test_state_updates_and_queue(self):
+        self.printer.states = {1: JOB_STATE_PENDING, 2: JOB_STATE_PENDING}
+        self.tracker.track(self.printer, 1, "local")
+        self.tracker.track(self.printer, 2, "local")
+        self.assertEqual(self.tracker.queued_count(self.printer.printer_ip), 2)
+
+        self.printer.states = {1: JOB_STATE_COMPLETED, 2: JOB_STATE_PROCESSING}
+        self.assertTrue(wait_until(lambda: self.tracker.queued_count(self.printer.printer_ip) == 0))
+        self.assertTrue(self.printer.get_jobs_calls > 0)
+        self.assertTrue(self.tracker.wait_for_capacity(self.printer.printer_ip, timeout=1.0, max_queued=1))
+
+        summary = self.tracker.get_summary("local")
+        self.assertEqual(summary["jobs_completed"], 1)
+        self.assertEqual(summary["jobs_pending"], 1)
+
+    def test_poller_stops_with_only_terminal_jobs(self):
+        self.printer.states = {1: JOB_STATE_COMPLETED}
+        self.tracker.track(self.printer, 1, "local")
+        self.assertTrue(wait_until(lambda: self.tracker._poll_thread is None))
+        # O trabalho terminado continua consultável até o tempo de retenção
+        self.assertEqual(self.tracker.get_jobs("local")[0].state, JOB_STATE_COMPLETED)
+
+    def test_unresponsive_printer_recovers_after_cooldown(self):
+        self.printer.online = False
+        self.tracker.track(self.printer, 1)
+        self.assertTrue(wait_until(lambda: not self.tracker.is_tracking(self.printer.printer_ip)))
+        self.assertIsNone(self.tracker.track(self.printer, 2))
+        self.assertIsNone(self.tracker.queued_count(self.printer.printer_ip))
+
+        self.printer.online = True
+        self.printer.states = {3: JOB_STATE_PENDING}
+        time.sleep(0.25)
+        self.assertIsNotNone(self.tracker.track(self.printer, 3))
+        self.assertTrue(self.tracker.is_tracking(self.printer.printer_ip))
+        self.assertEqual(self.tracker.queued_count(self.printer.printer_ip), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
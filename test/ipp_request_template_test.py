@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes das requisições IPP pré-codificadas
+"""
+
+import os
+import sys
+import struct
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.print_system import IPPEncoder, IPPOperation, IPPRequestTemplate, IPPResponse, IPPTag, IPPVersion
+
+
+def print_attributes(**overrides) -> dict:
+    attributes = {
+        "attributes-charset": "utf-8",
+        "attributes-natural-language": "en-us",
+        "printer-uri": "ipp://192.168.1.100:631/ipp/print",
+        "requesting-user-name": "Usuario",
+        "job-name": "relatório - página 1",
+        "document-format": "image/jpeg",
+        "copies": 1,
+        "print-color-mode": "color",
+        "print-quality": 4,
+        "media": ["iso_a4_210x297mm"],
+    }
+    attributes.update(overrides)
+    return attributes
+
+
+def encode_request(operation: int, request_id: int, attributes: dict) -> bytes:
+    """Codificação completa de referência, atributo por atributo"""
+    data = struct.pack('>HHIB', IPPVersion.IPP_1_1, operation, request_id, IPPTag.OPERATION)
+    data += IPPEncoder.encode_string(IPPTag.CHARSET, "attributes-charset", "utf-8")
+    data += IPPEncoder.encode_string(IPPTag.LANGUAGE, "attributes-natural-language", "en-us")
+    for name, value in attributes.items():
+        if name not in ("attributes-charset", "attributes-natural-language"):
+            data += IPPEncoder.encode_attribute(name, value)
+    return data + struct.pack('>BB', IPPTag.JOB, IPPTag.END)
+
+
+class TestIPPRequestTemplate(unittest.TestCase):
+    """Mesmos bytes da codificação completa, com request-id e atributos variáveis atualizados"""
+
+    def test_render_matches_full_encoding(self):
+        attributes = print_attributes()
+        template = IPPRequestTemplate(IPPOperation.PRINT_JOB, attributes)
+
+        for request_id, job_name in ((1, "relatório - página 1"), (2, "relatório - página 2"), (70000, "x")):
+            attributes["job-name"] = job_name
+            self.assertEqual(bytes(template.render(request_id, attributes)),
+                             encode_request(IPPOperation.PRINT_JOB, request_id, attributes))
+
+    def test_send_document_variables(self):
+        attributes = {
+            "attributes-charset": "utf-8",
+            "attributes-natural-language": "en-us",
+            "printer-uri": "ipp://192.168.1.100:631/ipp/print",
+            "job-id": 17,
+            "requesting-user-name": "Usuario",
+            "document-name": "pagina_1.jpg",
+            "document-format": "image/jpeg",
+            "last-document": False,
+        }
+        template = IPPRequestTemplate(IPPOperation.SEND_DOCUMENT, attributes)
+        attributes.update({"job-id": 18, "document-name": "pagina_2.jpg", "last-document": True})
+
+        request = IPPResponse.parse(template.render(5, attributes))
+        # A requisição tem o mesmo formato da resposta: o campo de status é a operação
+        self.assertEqual((request.status_code, request.request_id), (IPPOperation.SEND_DOCUMENT, 5))
+        operation = request.group(IPPTag.OPERATION)
+        self.assertEqual(list(operation), [name for name in attributes])
+        self.assertEqual(operation["job-id"], [18])
+        self.assertEqual(operation["document-name"], ["pagina_2.jpg"])
+        self.assertEqual(operation["last-document"], [True])
+
+    def test_cache_key(self):
+        key = IPPRequestTemplate.cache_key(IPPOperation.PRINT_JOB, print_attributes())
+        hash(key)  # Usada como chave do cache de templates
+        # Atributos variáveis não mudam a chave
+        self.assertEqual(key, IPPRequestTemplate.cache_key(IPPOperation.PRINT_JOB,
+                                                           print_attributes(**{"job-name": "outro"})))
+        self.assertNotEqual(key, IPPRequestTemplate.cache_key(IPPOperation.PRINT_JOB, print_attributes(copies=2)))
+        self.assertNotEqual(key, IPPRequestTemplate.cache_key(IPPOperation.VALIDATE_JOB, print_attributes()))
+        # A ordem dos atributos faz parte da requisição
+        reordered = dict(reversed(list(print_attributes().items())))
+        self.assertNotEqual(key, IPPRequestTemplate.cache_key(IPPOperation.PRINT_JOB, reordered))
+
+
+if __name__ == "__main__":
+    unittest.main()
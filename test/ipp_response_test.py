@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da decodificação de respostas IPP
+"""
+
+import os
+import sys
+import struct
+import unittest
+from types import SimpleNamespace
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.print_system import IPPEncoder, IPPJobState, IPPResponse, IPPTag
+
+
+def attribute(tag: int, name: str, value: bytes) -> bytes:
+    """Atributo IPP com o valor já codificado (nome vazio = valor adicional do anterior)"""
+    name = name.encode('utf-8')
+    return struct.pack('>BH', tag, len(name)) + name + struct.pack('>H', len(value)) + value
+
+
+def response_bytes(status_code: int = 0x0000, request_id: int = 7, *groups: bytes) -> bytes:
+    data = struct.pack('>HHI', 0x0200, status_code, request_id)
+    data += struct.pack('>B', IPPTag.OPERATION)
+    data += IPPEncoder.encode_string(IPPTag.CHARSET, "attributes-charset", "utf-8")
+    data += IPPEncoder.encode_string(IPPTag.LANGUAGE, "attributes-natural-language", "en-us")
+    for group in groups:
+        data += group
+    return data + struct.pack('>B', IPPTag.END)
+
+
+def job_group(job_id: int, state: int, *reasons: str) -> bytes:
+    group = struct.pack('>B', IPPTag.JOB)
+    group += IPPEncoder.encode_integer(IPPTag.INTEGER, "job-id", job_id)
+    group += IPPEncoder.encode_enum("job-state", state)
+    if reasons:
+        group += IPPEncoder.encode_strings(IPPTag.KEYWORD, "job-state-reasons", list(reasons))
+    return group
+
+
+class TestIPPResponse(unittest.TestCase):
+    """Grupos, tipos de valor, atributos multivalorados e respostas inválidas"""
+
+    def test_printer_attributes(self):
+        printer = struct.pack('>B', IPPTag.PRINTER)
+        printer += IPPEncoder.encode_strings(IPPTag.MIMETYPE, "document-format-supported",
+                                             ["application/pdf", "image/jpeg", "image/pwg-raster"])
+        printer += IPPEncoder.encode_boolean("color-supported", True)
+        printer += IPPEncoder.encode_integer(IPPTag.INTEGER, "queued-job-count", 2)
+        printer += attribute(IPPTag.RESOLUTION, "printer-resolution-supported", struct.pack('>iiB', 300, 300, 3))
+        printer += attribute(IPPTag.RESOLUTION, "", struct.pack('>iiB', 600, 1200, 3))
+        printer += attribute(IPPTag.RANGE_OF_INTEGER, "copies-supported", struct.pack('>ii', 1, 99))
+        # no-value (out-of-band)
+        printer += attribute(0x13, "printer-info", b"")
+        printer += attribute(IPPTag.OCTET_STRING, "printer-opaque", b"\x00\x01")
+        printer += IPPEncoder.encode_string(IPPTag.TEXT, "printer-location", "Sala 2 – recepção")
+        data = bytearray(response_bytes(0x0000, 42, printer))
+
+        response = IPPResponse.parse(memoryview(data))
+
+        self.assertEqual((response.version, response.status_code, response.request_id), (0x0200, 0, 42))
+        self.assertTrue(response.is_success)
+        self.assertEqual(response.status_name, "successful-ok")
+        self.assertEqual([tag for tag, _attributes in response.groups], [IPPTag.OPERATION, IPPTag.PRINTER])
+        self.assertEqual(response.get("attributes-charset"), "utf-8")
+        self.assertEqual(response.get_all("document-format-supported"),
+                         ["application/pdf", "image/jpeg", "image/pwg-raster"])
+        self.assertIs(response.get("color-supported"), True)
+        self.assertEqual(response.get("queued-job-count"), 2)
+        self.assertEqual(response.get_all("printer-resolution-supported"), [(300, 300, 3), (600, 1200, 3)])
+        self.assertEqual(response.get("copies-supported"), (1, 99))
+        self.assertEqual(response.group(IPPTag.PRINTER)["printer-info"], [None])
+        self.assertEqual(response.get("printer-opaque"), b"\x00\x01")
+        self.assertEqual(response.get("printer-location"), "Sala 2 – recepção")
+        self.assertIsNone(response.get("printer-name"))
+        self.assertEqual(response.get_all("printer-name"), [])
+        self.assertEqual(response.unsupported_attributes, {})
+
+    def test_job_groups(self):
+        data = response_bytes(0x0000, 3,
+                              job_group(11, IPPJobState.PROCESSING, "job-printing"),
+                              job_group(12, IPPJobState.PENDING))
+        response = IPPResponse.parse(data)
+
+        self.assertEqual([group["job-id"][0] for group in response.groups_of(IPPTag.JOB)], [11, 12])
+        # Propriedades usam o primeiro grupo de trabalho
+        self.assertEqual(response.job_id, 11)
+        self.assertEqual(response.job_state, IPPJobState.PROCESSING)
+        self.assertEqual(response.job_state_reasons, ["job-printing"])
+
+    def test_error_status_and_unsupported_group(self):
+        unsupported = struct.pack('>B', IPPTag.UNSUPPORTED)
+        unsupported += IPPEncoder.encode_string(IPPTag.KEYWORD, "print-color-mode", "color")
+        response = IPPResponse.parse(response_bytes(0x0509, 1, unsupported))
+
+        self.assertFalse(response.is_success)
+        self.assertEqual(response.status_name, "server-error-multiple-document-jobs-not-supported")
+        self.assertEqual(response.unsupported_attributes, {"print-color-mode": ["color"]})
+        self.assertIsNone(response.job_id)
+        self.assertIsNone(response.job_state)
+        self.assertEqual(IPPResponse.parse(response_bytes(0x0777)).status_name, "0x0777")
+
+    def test_invalid_responses(self):
+        with self.assertRaises(ValueError):
+            IPPResponse.parse(b"\x02\x00\x00")
+        data = response_bytes(0x0000, 1, job_group(5, IPPJobState.COMPLETED))
+        for cut in (11, 20, len(data) - 3):
+            with self.assertRaises(ValueError):
+                IPPResponse.parse(data[:cut])
+
+    def test_from_http_response(self):
+        data = response_bytes(0x0000, 9, job_group(5, IPPJobState.COMPLETED))
+        response = IPPResponse.from_http_response(SimpleNamespace(status_code=200, content=data))
+        self.assertEqual(response.job_id, 5)
+
+        self.assertIsNone(IPPResponse.from_http_response(None))
+        self.assertIsNone(IPPResponse.from_http_response(SimpleNamespace(status_code=500, content=data)))
+        self.assertIsNone(IPPResponse.from_http_response(SimpleNamespace(status_code=200, content=b"<html>")))
+
+
+if __name__ == "__main__":
+    unittest.main()
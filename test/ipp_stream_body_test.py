@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do corpo IPP transmitido em blocos (Content-Length e chunked)
+"""
+
+import os
+import sys
+import mmap
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import requests
+
+from src.utils.print_system import IPPStreamBody, close_document_buffer, open_document_buffer
+
+HEADER = b"\x01\x01\x00\x02\x00\x00\x00\x01\x01\x03"
+DOCUMENT = bytes(range(256)) * 1000 + b"fim"
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Guarda os cabeçalhos e o corpo recebido (Content-Length ou chunked)"""
+
+    requests_seen = []
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.requests_seen.append((dict(self.headers), bytes(body)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/ipp")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestIPPStreamBody(unittest.TestCase):
+    """Iteração do corpo e envio real por HTTP"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), RecordingHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/ipp/print"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.document_path = os.path.join(self.test_dir, "documento.pdf")
+        with open(self.document_path, "wb") as f:
+            f.write(DOCUMENT)
+        RecordingHandler.requests_seen.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def assert_body(self, body):
+        self.assertEqual(len(body), len(HEADER) + len(DOCUMENT))
+        # Arquivos reutilizam o buffer: cada bloco é copiado antes de ler o próximo
+        chunks = [bytes(chunk) for chunk in body]
+        self.assertEqual(chunks[0], HEADER)
+        self.assertTrue(all(len(chunk) <= body.chunk_size for chunk in chunks[1:]))
+        self.assertEqual(b"".join(chunks), HEADER + DOCUMENT)
+        # Reiterável: uma nova conexão pode reenviar o corpo
+        self.assertEqual(b"".join(bytes(chunk) for chunk in body.chunked()), HEADER + DOCUMENT)
+        self.assertEqual(b"".join(bytes(chunk) for chunk in body.chunked()), HEADER + DOCUMENT)
+
+    def test_iterate_bytes_mmap_and_file(self):
+        self.assert_body(IPPStreamBody(HEADER, DOCUMENT, chunk_size=4096))
+
+        document_file, document_buffer = open_document_buffer(self.document_path)
+        try:
+            self.assertIsInstance(document_buffer, mmap.mmap)
+            self.assert_body(IPPStreamBody(HEADER, document_buffer, chunk_size=4096))
+        finally:
+            close_document_buffer(document_file, document_buffer)
+
+        with open(self.document_path, "rb") as document_file:
+            self.assert_body(IPPStreamBody(HEADER, document_file, chunk_size=4096))
+
+    def test_post_with_content_length_and_chunked(self):
+        document_file, document_buffer = open_document_buffer(self.document_path)
+        try:
+            body = IPPStreamBody(HEADER, document_buffer, chunk_size=8192)
+            with requests.Session() as session:
+                self.assertEqual(session.post(self.url, data=body, timeout=10).status_code, 200)
+                self.assertEqual(session.post(self.url, data=body.chunked(), timeout=10).status_code, 200)
+        finally:
+            close_document_buffer(document_file, document_buffer)
+
+        (sized_headers, sized_body), (chunked_headers, chunked_body) = RecordingHandler.requests_seen
+        self.assertEqual(sized_headers.get("Content-Length"), str(len(HEADER) + len(DOCUMENT)))
+        self.assertEqual(chunked_headers.get("Transfer-Encoding"), "chunked")
+        self.assertEqual(sized_body, HEADER + DOCUMENT)
+        self.assertEqual(chunked_body, HEADER + DOCUMENT)
+
+
+if __name__ == "__main__":
+    unittest.main()
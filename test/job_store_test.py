@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da fila de impressão persistente (SQLite)
+"""
+
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.job_store import (
+    PrintJobStore, STATE_QUEUED, STATE_PROCESSING, STATE_COMPLETED, STATE_FAILED
+)
+
+
+def job_data(job_id: str, **extra) -> dict:
+    data = {"job_id": job_id, "document_name": f"{job_id}.pdf", "printer_ip": "10.0.0.1"}
+    data.update(extra)
+    return data
+
+
+class TestPrintJobStore(unittest.TestCase):
+    """Escritas em lote, leituras consistentes, retomada e limpeza"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "print_queue.db")
+        self.store = PrintJobStore(db_path=self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_disabled_without_path(self):
+        store = PrintJobStore()
+        self.assertFalse(store.enabled)
+        store.save_job(job_data("a"))
+        self.assertEqual(store.get_unfinished_jobs(), [])
+        self.assertIsNone(store.get_job("a"))
+
+    def test_reads_see_pending_writes(self):
+        self.store.save_job(job_data("a"))
+        self.store.update_state("a", STATE_PROCESSING, increment_attempts=True)
+        job = self.store.get_job("a")
+        self.assertEqual(job["state"], STATE_PROCESSING)
+        self.assertEqual(job["attempts"], 1)
+        self.assertEqual(job["job_data"]["document_name"], "a.pdf")
+
+    def test_many_writes_in_one_batch(self):
+        for index in range(600):
+            self.store.save_job(job_data(f"job{index:03d}"))
+        self.assertTrue(self.store.flush())
+        unfinished = self.store.get_unfinished_jobs()
+        self.assertEqual(len(unfinished), 600)
+        # Ordem de chegada
+        self.assertEqual(unfinished[0]["job_id"], "job000")
+
+    def test_resave_resets_attempts(self):
+        self.store.save_job(job_data("a"))
+        self.store.update_state("a", STATE_PROCESSING, increment_attempts=True)
+        self.store.update_state("a", STATE_PROCESSING, increment_attempts=True)
+        self.assertEqual(self.store.get_job("a")["attempts"], 2)
+
+        self.store.save_job(job_data("a", copies=2))
+        job = self.store.get_job("a")
+        self.assertEqual(job["attempts"], 0)
+        self.assertEqual(job["state"], STATE_QUEUED)
+        self.assertEqual(job["job_data"]["copies"], 2)
+
+    def test_checkpoints(self):
+        self.store.save_job(job_data("a"))
+        for page_key in ("p1_c1", "p2_c1", "p1_c1"):
+            self.store.checkpoint_page("a", page_key)
+        self.assertEqual(self.store.get_completed_pages("a"), {"p1_c1", "p2_c1"})
+        self.assertEqual(self.store.get_job("a")["completed_pages"], ["p1_c1", "p2_c1"])
+
+        self.store.clear_pages("a")
+        self.assertEqual(self.store.get_completed_pages("a"), set())
+
+        self.store.checkpoint_page("a", "p3_c1")
+        self.store.delete_job("a")
+        self.assertIsNone(self.store.get_job("a"))
+        self.assertEqual(self.store.get_completed_pages("a"), set())
+
+    def test_unfinished_jobs_survive_reopen(self):
+        self.store.save_job(job_data("queued"))
+        self.store.save_job(job_data("printing"))
+        self.store.save_job(job_data("done"))
+        self.store.update_state("printing", STATE_PROCESSING)
+        self.store.checkpoint_page("printing", "p1_c1")
+        self.store.update_state("done", STATE_COMPLETED)
+        self.store.close()
+
+        reopened = PrintJobStore(db_path=self.db_path)
+        try:
+            jobs = {job["job_id"]: job for job in reopened.get_unfinished_jobs()}
+            self.assertEqual(set(jobs), {"queued", "printing"})
+            self.assertEqual(reopened.get_completed_pages("printing"), {"p1_c1"})
+        finally:
+            reopened.close()
+
+    def test_finished_jobs_are_purged_on_open(self):
+        self.store.save_job(job_data("old"))
+        self.store.save_job(job_data("recent"))
+        self.store.save_job(job_data("pending"))
+        self.store.update_state("old", STATE_FAILED)
+        self.store.update_state("recent", STATE_COMPLETED)
+        self.store.checkpoint_page("old", "p1_c1")
+        self.store.close()
+
+        # Envelhece os trabalhos "old" e "pending" além da retenção
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE job_id IN ('old', 'pending')",
+                         (time.time() - 30 * 86400,))
+        conn.close()
+
+        reopened = PrintJobStore(db_path=self.db_path, retention_days=7)
+        try:
+            self.assertIsNone(reopened.get_job("old"))
+            self.assertEqual(reopened.get_completed_pages("old"), set())
+            self.assertIsNotNone(reopened.get_job("recent"))
+            # Trabalhos não terminados nunca são removidos
+            self.assertIsNotNone(reopened.get_job("pending"))
+        finally:
+            reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
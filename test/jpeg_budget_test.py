@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da qualidade JPEG ajustada ao orçamento de bytes por página
+"""
+
+import io
+import os
+import sys
+import random
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from src.utils import jpeg_budget
+from src.utils.raster_pool import PageEncoding
+
+SAVE_KWARGS = {'format': 'JPEG', 'optimize': True}
+
+
+def noisy_page(size=(2400, 1800)) -> Image.Image:
+    """Página "fotográfica": ruído em blocos, cara de codificar em qualquer qualidade"""
+    rng = random.Random(7)
+    small = Image.frombytes("RGB", (size[0] // 4, size[1] // 4), rng.randbytes(size[0] * size[1] * 3 // 16))
+    return small.resize(size, Image.BILINEAR)
+
+
+def text_page(size=(2400, 1800)) -> Image.Image:
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for line in range(40):
+        draw.text((100, 40 + line * 40), f"linha {line} do documento de teste", fill="black")
+    return image
+
+
+def encoded_size(image: Image.Image, quality: int) -> int:
+    buffer = io.BytesIO()
+    image.save(buffer, **dict(SAVE_KWARGS, quality=quality))
+    return buffer.tell()
+
+
+class TestQuantizeBudget(unittest.TestCase):
+    """Orçamento arredondado em passos de 256 KiB"""
+
+    def test_steps(self):
+        step = jpeg_budget.BUDGET_STEP
+        self.assertEqual(step, 256 * 1024)
+        self.assertEqual(jpeg_budget.quantize_budget(0), 0)
+        self.assertEqual(jpeg_budget.quantize_budget(-5), 0)
+        # Nunca abaixo de um passo
+        self.assertEqual(jpeg_budget.quantize_budget(10), step)
+        self.assertEqual(jpeg_budget.quantize_budget(1.3e6), 4 * step)
+        self.assertEqual(jpeg_budget.quantize_budget(4 * step), 4 * step)
+
+
+class TestFitQuality(unittest.TestCase):
+    """Maior qualidade que cabe no orçamento"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.noisy = noisy_page()
+        cls.text = text_page()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.noisy.close()
+        cls.text.close()
+
+    def test_page_within_budget_keeps_quality(self):
+        quality = jpeg_budget.fit_quality(self.text, 1024 * 1024, 90, 40, SAVE_KWARGS)
+        self.assertEqual(quality, 90)
+
+    def test_large_page_gets_lower_quality(self):
+        budget = encoded_size(self.noisy, 90) // 2
+        quality = jpeg_budget.fit_quality(self.noisy, budget, 90, 40, SAVE_KWARGS)
+        self.assertLess(quality, 90)
+        self.assertGreaterEqual(quality, 40)
+        # A estimativa pela amostra reduzida erra para o lado seguro
+        self.assertLessEqual(encoded_size(self.noisy, quality), budget)
+
+    def test_tiny_budget_returns_minimum(self):
+        self.assertEqual(jpeg_budget.fit_quality(self.noisy, 1000, 90, 40, SAVE_KWARGS), 40)
+        # Mínima acima da máxima: vale a máxima
+        self.assertEqual(jpeg_budget.fit_quality(self.noisy, 1000, 30, 40, SAVE_KWARGS), 30)
+
+
+class TestPageEncodingBudget(unittest.TestCase):
+    """PageEncoding com orçamento de bytes"""
+
+    def test_budget_limits_page_size(self):
+        page = noisy_page()
+        try:
+            unlimited = PageEncoding(jpg_quality=90).encode(page)
+            budget = len(unlimited) // 2
+            limited = PageEncoding(jpg_quality=90, byte_budget=budget, min_jpg_quality=30).encode(page)
+        finally:
+            page.close()
+        self.assertLessEqual(len(limited), budget)
+        with Image.open(io.BytesIO(limited)) as image:
+            self.assertEqual(image.size, (2400, 1800))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do cache em disco de páginas rasterizadas
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.page_cache import RasterPageCache
+
+PAGE_SIZE = 300 * 1024
+
+
+def page_data(page_num: int) -> bytes:
+    return bytes([page_num % 256]) * PAGE_SIZE
+
+
+class TestRasterPageCache(unittest.TestCase):
+    """Leitura/gravação, remoção LRU e índice reconstruído do disco"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        # 1 MB: cabem três páginas de 300 KB
+        self.cache = RasterPageCache(cache_dir=self.cache_dir, max_size_mb=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def key(self, page_num: int) -> str:
+        return RasterPageCache.make_key("digest", page_num, 200, "auto", 85, "default")
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.cache.get(self.key(1)))
+        self.cache.put(self.key(1), page_data(1))
+        self.assertEqual(self.cache.get(self.key(1)), page_data(1))
+        # Regravar a mesma chave não duplica o tamanho contabilizado
+        self.cache.put(self.key(1), page_data(1))
+        self.assertEqual(self.cache._total_bytes, PAGE_SIZE)
+
+    def test_least_recently_used_is_evicted(self):
+        for page_num in (1, 2, 3):
+            self.cache.put(self.key(page_num), page_data(page_num))
+        # A página 1 passa a ser a mais recente
+        self.assertIsNotNone(self.cache.get(self.key(1)))
+        self.cache.put(self.key(4), page_data(4))
+
+        self.assertIsNone(self.cache.get(self.key(2)))
+        for page_num in (1, 3, 4):
+            self.assertEqual(self.cache.get(self.key(page_num)), page_data(page_num))
+
+        self.cache.configure(max_size_mb=0)
+        self.assertEqual(self.cache._total_bytes, 0)
+        self.assertEqual([name for _root, _dirs, files in os.walk(self.cache_dir) for name in files], [])
+
+    def test_index_is_rebuilt_from_disk(self):
+        for page_num in (1, 2, 3):
+            self.cache.put(self.key(page_num), page_data(page_num))
+        # Acessos antigos: a ordem vem da data de modificação dos arquivos
+        for age, page_num in ((30, 2), (20, 3), (10, 1)):
+            path = self.cache._path_for(self.key(page_num))
+            os.utime(path, (time.time() - age, time.time() - age))
+
+        reopened = RasterPageCache(cache_dir=self.cache_dir, max_size_mb=1)
+        reopened.put(self.key(4), page_data(4))
+        self.assertIsNone(reopened.get(self.key(2)))
+        self.assertEqual(reopened.get(self.key(3)), page_data(3))
+
+    def test_disabled_and_oversized(self):
+        self.cache.put(self.key(1), bytes(2 * 1024 * 1024))
+        self.assertIsNone(self.cache.get(self.key(1)))
+
+        self.cache.configure(enabled=False)
+        self.cache.put(self.key(2), page_data(2))
+        self.cache.configure(enabled=True)
+        self.assertIsNone(self.cache.get(self.key(2)))
+
+    def test_missing_file_is_a_miss(self):
+        self.cache.put(self.key(1), page_data(1))
+        os.remove(self.cache._path_for(self.key(1)))
+        self.assertIsNone(self.cache.get(self.key(1)))
+        self.assertEqual(self.cache._total_bytes, 0)
+
+    def test_clear(self):
+        self.cache.put(self.key(1), page_data(1))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(self.key(1)))
+        self.assertFalse(os.path.exists(self.cache._path_for(self.key(1))))
+
+    def test_keys_and_digest(self):
+        base = ("digest", 1, 200, "auto", 85, "default")
+        key = RasterPageCache.make_key(*base)
+        self.assertEqual(key, RasterPageCache.make_key(*base, document_format="image/jpeg"))
+        for index, value in enumerate(("other", 2, 300, "monochrome", 70, "epson")):
+            changed = list(base)
+            changed[index] = value
+            self.assertNotEqual(key, RasterPageCache.make_key(*changed))
+        self.assertNotEqual(key, RasterPageCache.make_key(*base, document_format="image/pwg-raster"))
+
+        path = os.path.join(self.test_dir, "documento.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4 versao 1")
+        digest = self.cache.file_digest(path)
+        self.assertEqual(self.cache.file_digest(path), digest)
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4 versao 2, maior")
+        self.assertNotEqual(self.cache.file_digest(path), digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da detecção de páginas sem cor
+"""
+
+import io
+import os
+import sys
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from src.utils import page_color, raster_encoders
+from src.utils.raster_pool import PageEncoding
+
+# Limite padrão da configuração (grayscale_color_threshold)
+THRESHOLD = 0.0002
+
+
+def text_page(size=(1240, 1754)) -> Image.Image:
+    """Página de texto preto com tons de cinza, em RGB"""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for line in range(30):
+        draw.text((100, 100 + line * 50), f"linha {line} do relatório", fill="black")
+    draw.rectangle((100, 1650, 1100, 1700), fill=(128, 128, 128))
+    return image
+
+
+def jpeg_round_trip(image: Image.Image, quality: int = 60) -> Image.Image:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return Image.open(io.BytesIO(buffer.getvalue())).convert("RGB")
+
+
+@unittest.skipUnless(raster_encoders.is_available(), "NumPy não instalado")
+class TestPageColor(unittest.TestCase):
+    """Cor medida numa amostra reduzida da página"""
+
+    def test_gray_pages(self):
+        with text_page() as image:
+            self.assertEqual(page_color.color_coverage(image), 0.0)
+            self.assertTrue(page_color.is_grayscale_page(image, THRESHOLD))
+            # Ruído de cor da compressão JPEG não conta
+            with jpeg_round_trip(image) as decoded:
+                self.assertTrue(page_color.is_grayscale_page(decoded, THRESHOLD))
+            with image.convert("L") as gray:
+                self.assertTrue(page_color.is_grayscale_page(gray, THRESHOLD))
+
+    def test_small_color_mark(self):
+        with text_page() as image:
+            # Logotipo vermelho pequeno no canto
+            ImageDraw.Draw(image).rectangle((1100, 40, 1160, 100), fill=(200, 20, 20))
+            coverage = page_color.color_coverage(image)
+            self.assertGreater(coverage, THRESHOLD)
+            self.assertLess(coverage, 0.01)
+            self.assertFalse(page_color.is_grayscale_page(image, THRESHOLD))
+
+    def test_page_encoding_sends_gray_pages_as_grayscale(self):
+        encoding = PageEncoding(color_mode="auto", grayscale_threshold=THRESHOLD)
+        with text_page() as image:
+            with Image.open(io.BytesIO(encoding.encode(image))) as encoded:
+                self.assertEqual(encoded.mode, "L")
+
+            ImageDraw.Draw(image).rectangle((1100, 40, 1160, 100), fill=(200, 20, 20))
+            with Image.open(io.BytesIO(encoding.encode(image))) as encoded:
+                self.assertEqual(encoded.mode, "RGB")
+
+    def test_detection_only_in_auto_mode(self):
+        with text_page() as image:
+            for encoding in (PageEncoding(color_mode="color", grayscale_threshold=THRESHOLD),
+                             PageEncoding(color_mode="auto", grayscale_threshold=THRESHOLD, epson_mode=True),
+                             PageEncoding(color_mode="auto")):
+                self.assertFalse(encoding.detects_grayscale)
+                with Image.open(io.BytesIO(encoding.encode(image))) as encoded:
+                    self.assertEqual(encoded.mode, "RGB")
+
+
+if __name__ == "__main__":
+    unittest.main()
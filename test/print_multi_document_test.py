@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do envio multi-documento (Create-Job + Send-Document) com páginas sem cor
+"""
+
+import os
+import sys
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils import raster_encoders
+from src.utils.printer_profile import PrinterProfile
+from src.utils.print_system import ColorMode, IPPPrinter, PageJob, PrintOptions
+
+
+def make_printer() -> IPPPrinter:
+    """IPPPrinter sem discovery, com as operações IPP registradas em vez de enviadas"""
+    printer = IPPPrinter.__new__(IPPPrinter)
+    printer.printer_ip = "192.168.1.100"
+    printer.base_url = "http://192.168.1.100:631"
+    printer.known_endpoint = "/ipp/print"
+    printer.use_https = False
+    printer.config = None
+    printer.endpoint_cache = None
+    printer.profile = PrinterProfile(printer.printer_ip)
+    printer.raster_format = raster_encoders.MIME_JPEG
+    printer.last_printer_job_id = None
+
+    printer.operations = []
+    job_ids = iter(range(100, 200))
+
+    def create_job(url, job_name, options, grayscale=False):
+        job_id = next(job_ids)
+        printer.operations.append(("create", job_id, grayscale))
+        return job_id, 0x0000
+
+    def send_document(url, job_id, document_name, document_data, last_document):
+        printer.operations.append(("send", job_id, document_name, last_document))
+        return 0x0000
+
+    printer._create_job = create_job
+    printer._send_document = send_document
+    printer._close_job = lambda url, job_id, name: printer.operations.append(("close", job_id))
+    printer._track_printer_job = lambda job_id, job_info=None: None
+    printer._get_pacer = lambda: None
+    printer._wait_for_printer = lambda max_delay, reason: None
+    return printer
+
+
+def page_jobs(*grayscale_flags) -> list:
+    return [PageJob(page_num, "", b"\xff\xd8 pagina", f"p{page_num}", grayscale=grayscale)
+            for page_num, grayscale in enumerate(grayscale_flags, 1)]
+
+
+class TestMultiDocumentColorMode(unittest.TestCase):
+    """print-color-mode=monochrome chega à impressora nas páginas sem cor"""
+
+    def test_all_gray_pages_in_one_monochrome_job(self):
+        printer = make_printer()
+        ok, result = printer._process_pages_multi_document(page_jobs(True, True, True), PrintOptions(),
+                                                            job_name="doc")
+        self.assertTrue(ok, result)
+        self.assertEqual(result["grayscale_pages"], [1, 2, 3])
+        self.assertEqual([op for op in printer.operations if op[0] == "create"], [("create", 100, True)])
+        # O último Send-Document fecha o trabalho
+        self.assertEqual(printer.operations[-1], ("send", 100, "p3", True))
+
+    def test_gray_and_color_runs_are_separate_jobs(self):
+        printer = make_printer()
+        ok, result = printer._process_pages_multi_document(page_jobs(True, True, False, True),
+                                                            PrintOptions(copies=2), job_name="doc")
+        self.assertTrue(ok, result)
+        self.assertEqual(result["successful_pages"], 8)
+        self.assertEqual(printer.operations[:8], [
+            ("create", 100, True), ("send", 100, "p1", False), ("send", 100, "p2", False), ("close", 100),
+            ("create", 101, False), ("send", 101, "p3", False), ("close", 101),
+            ("create", 102, True),
+        ])
+        self.assertEqual(printer.operations[8], ("send", 102, "p4", True))
+        # Segunda cópia com as mesmas sequências
+        self.assertEqual([op[2] for op in printer.operations if op[0] == "create"], [True, False, True] * 2)
+
+    def test_color_pages_keep_one_job(self):
+        printer = make_printer()
+        ok, _result = printer._process_pages_multi_document(page_jobs(False, False), PrintOptions(), job_name="doc")
+        self.assertTrue(ok)
+        self.assertEqual(printer.operations, [("create", 100, False), ("send", 100, "p1", False),
+                                              ("send", 100, "p2", True)])
+
+    def test_job_attributes(self):
+        printer = make_printer()
+        url = "ipp://192.168.1.100:631/ipp/print"
+        self.assertNotIn("print-color-mode", printer._build_jpg_job_attributes(url, "doc", PrintOptions()))
+        self.assertEqual(printer._build_jpg_job_attributes(url, "doc", PrintOptions(), grayscale=True)
+                         ["print-color-mode"], "monochrome")
+        # Modo de cor explícito prevalece
+        options = PrintOptions(color_mode=ColorMode.COLORIDO)
+        self.assertEqual(printer._build_jpg_job_attributes(url, "doc", options, grayscale=True)
+                         ["print-color-mode"], "color")
+
+
+if __name__ == "__main__":
+    unittest.main()
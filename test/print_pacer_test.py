@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do ritmo adaptativo de envio (AIMD)
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.print_pacer import PrinterPacer, PrintPacerRegistry
+
+
+def make_profile(**overrides):
+    """Perfil com os campos usados pelo pacer"""
+    values = dict(printer_ip="10.0.0.1", min_send_interval=0.0, max_send_interval=5.0, page_delay=2.0,
+                  send_interval_step=0.25, target_accept_latency=3.0, max_queued_jobs=1,
+                  retry_delays=[0.5, 1.0, 2.0])
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestPrinterPacer(unittest.TestCase):
+    """Aumento aditivo e redução multiplicativa do ritmo"""
+
+    def test_fast_accepts_shrink_interval_to_minimum(self):
+        pacer = PrinterPacer("ip", min_interval=0.5, initial_interval=1.0, step=0.25)
+        pacer.on_accepted(0.1, queued=0)
+        self.assertAlmostEqual(pacer.interval, 0.75)
+        for _ in range(10):
+            pacer.on_accepted(0.1, queued=0)
+        self.assertAlmostEqual(pacer.interval, 0.5)
+
+    def test_congestion_and_rejection_back_off(self):
+        pacer = PrinterPacer("ip", max_interval=5.0, initial_interval=1.0, target_latency=2.0, max_queued=1)
+        pacer.on_accepted(3.0)
+        self.assertAlmostEqual(pacer.interval, 2.0)
+        pacer.on_accepted(0.1, queued=2)
+        self.assertAlmostEqual(pacer.interval, 4.0)
+        pacer.on_rejected()
+        self.assertAlmostEqual(pacer.interval, 5.0)
+
+    def test_retry_delay_grows_from_interval(self):
+        pacer = PrinterPacer("ip", initial_interval=0.0, retry_base=0.5, retry_cap=3.0)
+        self.assertAlmostEqual(pacer.retry_delay(0), 0.5)
+        self.assertAlmostEqual(pacer.retry_delay(2), 2.0)
+        self.assertAlmostEqual(pacer.retry_delay(5), 3.0)
+
+    def test_throughput_ignores_small_sends(self):
+        pacer = PrinterPacer("ip")
+        pacer.on_accepted(0.5, sent_bytes=1000)
+        self.assertIsNone(pacer.throughput)
+        pacer.on_accepted(2.0, sent_bytes=2_000_000)
+        self.assertAlmostEqual(pacer.throughput, 1_000_000)
+        pacer.on_accepted(1.0, sent_bytes=2_000_000)
+        self.assertAlmostEqual(pacer.throughput, 1_300_000)
+
+
+class TestPrintPacerRegistry(unittest.TestCase):
+    """Um pacer por impressora, recriado quando os limites do perfil mudam"""
+
+    def test_reuse_and_recreate(self):
+        registry = PrintPacerRegistry()
+        profile = make_profile()
+        pacer = registry.get_pacer(profile)
+        self.assertIs(registry.get_pacer(profile), pacer)
+        self.assertAlmostEqual(pacer.interval, 2.0)
+
+        profile.min_send_interval = 2.5
+        recreated = registry.get_pacer(profile)
+        self.assertIsNot(recreated, pacer)
+        self.assertAlmostEqual(recreated.interval, 2.5)
+
+        registry.reset(profile.printer_ip)
+        self.assertIsNot(registry.get_pacer(profile), recreated)
+
+
+if __name__ == "__main__":
+    unittest.main()
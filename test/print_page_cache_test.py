@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do cache de rasterização na conversão JPG (páginas em branco)
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from src.utils import raster_encoders
+from src.utils.page_cache import RasterPageCache
+from src.utils.printer_profile import PrinterProfile
+from src.utils.rasterizers import Rasterizer
+from src.utils import print_system
+from src.utils.print_system import IPPPrinter, PrintOptions
+
+
+class FakeRasterizer(Rasterizer):
+    """Página 1 em branco, página 2 com uma linha; registra as páginas rasterizadas"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.rendered = []
+
+    def render(self, pdf_path, first_page, last_page, convert_kwargs, encoding, save=None, skip=()):
+        for page_num in range(first_page, last_page + 1):
+            self.rendered.append(page_num)
+            with Image.new("RGB", (620, 877), "white") as image:
+                if page_num == 2:
+                    ImageDraw.Draw(image).line((50, 400, 550, 400), fill="black", width=3)
+                yield page_num, encoding.encode(image, save=save)
+
+
+@unittest.skipUnless(raster_encoders.is_available(), "NumPy não instalado")
+class TestBlankPagesInPageCache(unittest.TestCase):
+    """Páginas do cache respeitam o limite de páginas em branco configurado"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.test_dir, "documento.pdf")
+        with open(self.pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4 documento")
+        self.cache = RasterPageCache(cache_dir=os.path.join(self.test_dir, "cache"), max_size_mb=16)
+        self.rasterizer = FakeRasterizer()
+
+        registry = mock.Mock()
+        registry.get_rasterizer.return_value = self.rasterizer
+        raster_pool = mock.Mock(is_active=False)
+        for target, value in ((print_system.RasterPageCache, self.cache),
+                              (print_system.RasterizerRegistry, registry),
+                              (print_system.RasterProcessPool, raster_pool)):
+            patcher = mock.patch.object(target, "get_instance", return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(print_system.PopplerManager, "setup_poppler", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def convert(self, skip_blank_pages: bool) -> list:
+        """Converte o documento e retorna (página, em branco) de cada PageJob"""
+        printer = IPPPrinter.__new__(IPPPrinter)
+        printer.printer_ip = "192.168.1.100"
+        printer.config = {"print_performance": {"skip_blank_pages": skip_blank_pages, "raster_format": "jpeg"}}
+        printer.profile = PrinterProfile(printer.printer_ip)
+        printer._get_pdf_page_count = lambda pdf_path, poppler_path=None: 2
+        printer._process_pages = lambda pipeline, options, progress_callback, job_info, job_name: (
+            True, {"pages": [(page_job.page_num, page_job.blank) for page_job in pipeline]})
+
+        self.rasterizer.rendered.clear()
+        ok, result = printer._convert_and_print_as_jpg_optimized(self.pdf_path, "doc", PrintOptions())
+        self.assertTrue(ok, result)
+        return result["pages"]
+
+    def test_blank_threshold_is_part_of_the_key(self):
+        self.assertEqual(self.convert(skip_blank_pages=False), [(1, False), (2, False)])
+        self.assertEqual(self.rasterizer.rendered, [1, 2])
+
+        # Páginas guardadas sem a detecção não servem: a página 1 é rasterizada de novo e descartada
+        self.assertEqual(self.convert(skip_blank_pages=True), [(1, True), (2, False)])
+        self.assertEqual(self.rasterizer.rendered, [1, 2])
+
+        # O veredito de página em branco também vem do cache
+        self.assertEqual(self.convert(skip_blank_pages=True), [(1, True), (2, False)])
+        self.assertEqual(self.rasterizer.rendered, [])
+
+        self.assertEqual(self.convert(skip_blank_pages=False), [(1, False), (2, False)])
+        self.assertEqual(self.rasterizer.rendered, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
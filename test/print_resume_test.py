@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da retomada de trabalhos da fila de impressão
+"""
+
+import os
+import sys
+import queue
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.job_store import PrintJobStore, STATE_QUEUED, STATE_PROCESSING, STATE_FAILED
+from src.utils.print_system import IPPPrinter, PrintJobInfo, PrintOptions, PrintQueueManager
+
+
+class TestAlreadyPrintedPages(unittest.TestCase):
+    """Páginas/cópias já impressas numa execução anterior"""
+
+    def test_order_and_filter(self):
+        completed = {"p2_c1", "p1_c2", "p1_c1", "p9_c1", "p1_c3"}
+        self.assertEqual(
+            IPPPrinter._already_printed_pages(completed, total_pages=2, total_copies=2),
+            ["p1_c1", "p2_c1", "p1_c2"]
+        )
+        self.assertEqual(IPPPrinter._already_printed_pages(set(), 3, 1), [])
+
+
+class TestResume(unittest.TestCase):
+    """Retomada automática (início do programa) e manual (resume_job)"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.document_path = os.path.join(self.test_dir, "documento.pdf")
+        with open(self.document_path, "wb") as f:
+            f.write(b"%PDF-1.4\n")
+
+        self.manager = PrintQueueManager()
+        self.manager.job_store = PrintJobStore(db_path=os.path.join(self.test_dir, "print_queue.db"))
+        self.printer_patch = mock.patch("src.utils.print_system.IPPPrinter")
+        self.printer_patch.start()
+
+    def tearDown(self):
+        self.printer_patch.stop()
+        self.manager.job_store.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def make_job(self, job_id: str, status: str = "pending", **overrides) -> PrintJobInfo:
+        values = dict(
+            job_id=job_id,
+            document_path=self.document_path,
+            document_name=f"{job_id}.pdf",
+            printer_name="Impressora de Teste",
+            printer_id="printer1",
+            printer_ip="192.168.1.100",
+            options=PrintOptions(),
+            start_time=datetime.now(),
+            status=status,
+        )
+        values.update(overrides)
+        return PrintJobInfo(**values)
+
+    def queued_job_ids(self):
+        return [item["info"].job_id for item in list(self.manager.print_queue.queue)]
+
+    def test_resume_unfinished_jobs(self):
+        store = self.manager.job_store
+        store.save_job(self.make_job("ok").to_dict())
+        store.save_job(self.make_job("crashing").to_dict())
+        for _ in range(self.manager.max_resume_attempts):
+            store.update_state("crashing", STATE_PROCESSING, increment_attempts=True)
+        store.save_job(self.make_job("missing", document_path=os.path.join(self.test_dir, "x.pdf")).to_dict())
+        store.save_job(self.make_job("no_ip", printer_ip="").to_dict())
+
+        self.manager._resume_unfinished_jobs()
+
+        self.assertEqual(self.queued_job_ids(), ["ok"])
+        self.assertEqual(store.get_job("ok")["state"], STATE_QUEUED)
+        for job_id in ("crashing", "missing", "no_ip"):
+            self.assertEqual(store.get_job(job_id)["state"], STATE_FAILED)
+
+    def test_resume_job_from_store(self):
+        store = self.manager.job_store
+        store.save_job(self.make_job("a", status="failed").to_dict(), STATE_FAILED)
+        store.checkpoint_page("a", "p1_c1")
+        store.save_job(self.make_job("b").to_dict())
+
+        with mock.patch.object(self.manager, "start"):
+            ok, message = self.manager.resume_job("a")
+            self.assertTrue(ok, message)
+            self.assertIn("1 página", message)
+            # Ainda na fila (estado queued)
+            self.assertFalse(self.manager.resume_job("a")[0])
+            self.assertFalse(self.manager.resume_job("b")[0])
+
+        self.assertEqual(self.queued_job_ids(), ["a"])
+
+    def test_resume_job_from_history(self):
+        self.manager.job_store.close()
+        self.manager.job_store = PrintJobStore()
+        self.manager.job_history = [
+            self.make_job("failed", status="failed").to_dict(),
+            self.make_job("completed", status="completed").to_dict(),
+            self.make_job("processing", status="processing").to_dict(),
+            self.make_job("canceled", status="canceled").to_dict(),
+        ]
+
+        with mock.patch.object(self.manager, "start"):
+            self.assertFalse(self.manager.resume_job("completed")[0])
+            self.assertFalse(self.manager.resume_job("processing")[0])
+            self.assertFalse(self.manager.resume_job("unknown")[0])
+            self.assertTrue(self.manager.resume_job("failed")[0])
+            # Aguardando na fila de entrada: não é enfileirado de novo
+            self.assertFalse(self.manager.resume_job("failed")[0])
+
+            # Aguardando na fila de uma impressora
+            lane = {"queue": queue.Queue()}
+            lane["queue"].put({"info": self.make_job("canceled")})
+            self.manager.lanes["192.168.1.100"] = lane
+            self.assertFalse(self.manager.resume_job("canceled")[0])
+
+        self.assertEqual(self.queued_job_ids(), ["failed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
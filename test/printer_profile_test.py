@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do perfil de capacidades e particularidades das impressoras
+"""
+
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils import raster_encoders
+from src.utils.printer_profile import PrinterProfile, PrinterProfileRegistry
+
+
+class MemoryConfig:
+    """Configuração em memória com a interface get/set da AppConfig"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class TestPrinterProfile(unittest.TestCase):
+    """Resolução e formatos escolhidos a partir das capacidades anunciadas"""
+
+    def test_best_dpi(self):
+        profile = PrinterProfile("10.0.0.1", preferred_dpi=300)
+        # Capacidades desconhecidas: menor entre a pedida e a preferida
+        self.assertEqual(profile.best_dpi(600), 300)
+        self.assertEqual(profile.best_dpi(150), 150)
+
+        profile.resolutions_dpi = [150, 250, 600]
+        self.assertEqual(profile.best_dpi(600), 250)
+        self.assertEqual(profile.best_dpi(100), 150)
+
+    def test_best_dpi_for_pwg_and_urf(self):
+        profile = PrinterProfile("10.0.0.1", preferred_dpi=600, resolutions_dpi=[150, 300, 600],
+                                 pwg_resolutions_dpi=[300], urf_supported=["V1.4", "W8", "SRGB24", "RS300-600"])
+        self.assertEqual(profile.best_dpi(600, raster_encoders.MIME_PWG_RASTER), 300)
+        self.assertEqual(profile.best_dpi(200, raster_encoders.MIME_PWG_RASTER), 300)
+        self.assertEqual(profile.best_dpi(600, raster_encoders.MIME_URF), 600)
+        self.assertEqual(profile.best_dpi(400, raster_encoders.MIME_URF), 300)
+        self.assertEqual(profile.best_dpi(400, raster_encoders.MIME_JPEG), 300)
+
+    def test_supports_raster(self):
+        profile = PrinterProfile("10.0.0.1", pwg_resolutions_dpi=[300], pwg_types=["srgb_8"],
+                                 urf_supported=["W8", "RS300"])
+        self.assertTrue(profile.supports_raster(raster_encoders.MIME_PWG_RASTER, color=True))
+        self.assertFalse(profile.supports_raster(raster_encoders.MIME_PWG_RASTER, color=False))
+        self.assertTrue(profile.supports_raster(raster_encoders.MIME_URF, color=False))
+        self.assertFalse(profile.supports_raster(raster_encoders.MIME_URF, color=True))
+        # Sem resolução anunciada o formato não é usado
+        profile.pwg_resolutions_dpi = []
+        self.assertFalse(profile.supports_raster(raster_encoders.MIME_PWG_RASTER, color=True))
+
+    def test_formats_and_sides(self):
+        profile = PrinterProfile("10.0.0.1")
+        self.assertIsNone(profile.supports_format("application/pdf"))
+        self.assertFalse(profile.raster_only)
+        self.assertTrue(profile.supports_sides("two-sided-long-edge"))
+
+        profile.document_formats = ["image/jpeg", "image/urf"]
+        profile.sides_supported = ["one-sided"]
+        self.assertFalse(profile.supports_format("application/pdf"))
+        self.assertTrue(profile.raster_only)
+        self.assertFalse(profile.supports_sides("two-sided-long-edge"))
+
+    def test_vendor_quirks(self):
+        profile = PrinterProfile("10.0.0.1")
+        profile.apply_vendor_quirks()
+        self.assertEqual(profile, PrinterProfile("10.0.0.1"))
+
+        profile.epson_mode = True
+        profile.apply_vendor_quirks()
+        self.assertTrue(profile.is_epson)
+        self.assertTrue(profile.jpg_only)
+        self.assertTrue(profile.raster_only)
+        self.assertEqual(profile.profile_name, "epson")
+        self.assertEqual(profile.best_dpi(300), 150)
+        self.assertFalse(profile.use_chunked_transfer)
+        self.assertEqual(profile.max_page_bytes, 1024 * 1024)
+        self.assertGreaterEqual(profile.min_send_interval, 2.0)
+
+    def test_dict_round_trip(self):
+        profile = PrinterProfile("10.0.0.1", vendor="brother", document_formats=["image/pwg-raster"],
+                                 pwg_types=["sgray_8"], multiple_document_jobs=False)
+        data = profile.to_dict()
+        self.assertEqual(PrinterProfile.from_dict(data), profile)
+        # Campos de versões futuras/antigas são ignorados
+        data["obsolete_field"] = 1
+        del data["pwg_types"]
+        restored = PrinterProfile.from_dict(data)
+        self.assertEqual(restored.pwg_types, [])
+        self.assertIs(restored.multiple_document_jobs, False)
+
+
+class TestPrinterProfileRegistry(unittest.TestCase):
+    """Detecção única por impressora, persistência e expiração"""
+
+    def setUp(self):
+        self.config = MemoryConfig()
+        self.registry = PrinterProfileRegistry(config=self.config)
+
+    def test_known_epson_is_not_probed(self):
+        with mock.patch("src.utils.printer_profile.requests.get") as get:
+            profile = self.registry.get_profile("10.148.1.192")
+        get.assert_not_called()
+        self.assertTrue(profile.is_epson)
+        self.assertEqual(profile.model, "L3250 Series")
+        self.assertIs(self.registry.get_profile("10.148.1.192"), profile)
+
+    def test_probe_web_interface(self):
+        page = "<html><title>Brother MFC7860DW</title></html>"
+        with mock.patch("src.utils.printer_profile.requests.get",
+                        return_value=SimpleNamespace(status_code=200, text=page)) as get:
+            profile = self.registry.get_profile("10.0.0.5")
+            self.registry.get_profile("10.0.0.5")
+        get.assert_called_once()
+        self.assertEqual((profile.vendor, profile.model), ("brother", "MFC7860DW"))
+        self.assertFalse(profile.is_epson)
+
+        epson_page = "<html>EPSON L4260 Series</html>"
+        with mock.patch("src.utils.printer_profile.requests.get",
+                        return_value=SimpleNamespace(status_code=200, text=epson_page)):
+            self.assertTrue(self.registry.get_profile("10.0.0.6").is_epson)
+
+    def test_saved_profile_and_ttl(self):
+        with mock.patch("src.utils.printer_profile.requests.get", side_effect=OSError):
+            profile = self.registry.get_profile("10.0.0.7")
+        profile.document_formats = ["image/jpeg"]
+        self.registry.update_profile(profile)
+        self.assertEqual(self.config.values["printer_profiles"]["10.0.0.7"]["document_formats"], ["image/jpeg"])
+
+        # Outra execução lê o perfil salvo sem sondar
+        registry = PrinterProfileRegistry(config=self.config)
+        with mock.patch("src.utils.printer_profile.requests.get") as get:
+            self.assertEqual(registry.get_profile("10.0.0.7").document_formats, ["image/jpeg"])
+        get.assert_not_called()
+
+        # Perfil salvo expirado é detectado de novo
+        self.config.values["printer_profiles"]["10.0.0.7"]["resolved_at"] = time.time() - 2 * 86400
+        registry = PrinterProfileRegistry(config=self.config)
+        with mock.patch("src.utils.printer_profile.requests.get", side_effect=OSError) as get:
+            self.assertEqual(registry.get_profile("10.0.0.7").document_formats, [])
+        get.assert_called_once()
+
+        registry.invalidate("10.0.0.7")
+        self.assertNotIn("10.0.0.7", self.config.values["printer_profiles"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes dos codificadores PWG Raster e URF
+"""
+
+import os
+import sys
+import struct
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from src.utils import raster_encoders
+
+
+def decode_bitmap(data: bytes, width: int, height: int, bytes_per_pixel: int) -> bytes:
+    """Decodifica o bitmap comprimido (repetição de linhas + PackBits) de volta para bytes crus"""
+    rows = []
+    pos = 0
+    while len(rows) < height:
+        repeat = data[pos]
+        pos += 1
+        line = bytearray()
+        while len(line) < width * bytes_per_pixel:
+            control = data[pos]
+            pos += 1
+            if control < 128:
+                line += data[pos:pos + bytes_per_pixel] * (control + 1)
+                pos += bytes_per_pixel
+            else:
+                count = 257 - control
+                line += data[pos:pos + count * bytes_per_pixel]
+                pos += count * bytes_per_pixel
+        rows.extend([bytes(line)] * (repeat + 1))
+    assert pos == len(data), "sobraram bytes no bitmap"
+    return b"".join(rows)
+
+
+def sample_page(width: int = 300, height: int = 400) -> Image.Image:
+    """Página com áreas lisas, linhas repetidas e pixels variados"""
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 120, 80), fill=(200, 30, 30))
+    draw.text((10, 150), "PWG Raster 0123456789", fill="black")
+    for x in range(width):
+        image.putpixel((x, height - 1), (x % 256, (x * 7) % 256, (x * 13) % 256))
+    return image
+
+
+@unittest.skipUnless(raster_encoders.is_available(), "NumPy não instalado")
+class TestPackBits(unittest.TestCase):
+    """Compressão do bitmap"""
+
+    def test_round_trip_rgb(self):
+        image = sample_page()
+        pixels = raster_encoders._image_to_array(image, color=True)
+        data = raster_encoders.compress_bitmap(pixels)
+        self.assertEqual(decode_bitmap(data, image.width, image.height, 3), image.tobytes())
+
+    def test_round_trip_gray(self):
+        image = sample_page().convert("L")
+        pixels = raster_encoders._image_to_array(image, color=False)
+        data = raster_encoders.compress_bitmap(pixels)
+        self.assertEqual(decode_bitmap(data, image.width, image.height, 1), image.tobytes())
+
+    def test_long_runs_are_split(self):
+        # Linha de 300 pixels iguais e 260 linhas iguais: limites de 128 pixels e 256 linhas
+        image = Image.new("L", (300, 260), 255)
+        pixels = raster_encoders._image_to_array(image, color=False)
+        data = raster_encoders.compress_bitmap(pixels)
+        self.assertEqual(data[0], 255)
+        self.assertEqual(decode_bitmap(data, 300, 260, 1), image.tobytes())
+
+    def test_single_pixel_runs(self):
+        image = Image.frombytes("L", (5, 1), bytes([1, 2, 3, 3, 4]))
+        data = raster_encoders.compress_bitmap(raster_encoders._image_to_array(image, color=False))
+        # Sem repetição de linha; 2 literais, repetição de 2, pixel único (controle 0)
+        self.assertEqual(data, bytes([0, 255, 1, 2, 1, 3, 0, 4]))
+
+
+@unittest.skipUnless(raster_encoders.is_available(), "NumPy não instalado")
+class TestPwgHeader(unittest.TestCase):
+    """Campos do cabeçalho de página PWG"""
+
+    def setUp(self):
+        self.image = sample_page()
+        self.page = raster_encoders.encode_pwg_page(
+            self.image, 300, color=True, duplex=True, tumble=True, quality=5,
+            page_size_name="iso_a4_210x297mm", total_pages=1
+        )
+        self.header = self.page[:raster_encoders.PWG_PAGE_HEADER_SIZE]
+
+    def uint(self, offset: int) -> int:
+        return struct.unpack_from(">I", self.header, offset)[0]
+
+    def test_fields(self):
+        self.assertEqual(self.header[:9], b"PwgRaster")
+        self.assertEqual(self.uint(272), 1)  # Duplex
+        self.assertEqual((self.uint(276), self.uint(280)), (300, 300))  # HWResolution
+        self.assertEqual(self.uint(368), 1)  # Tumble
+        self.assertEqual((self.uint(372), self.uint(376)), (300, 400))  # Width, Height
+        self.assertEqual((self.uint(384), self.uint(388), self.uint(392)), (8, 24, 900))
+        self.assertEqual(self.uint(400), raster_encoders.PWG_COLORSPACE_SRGB)
+        self.assertEqual(self.uint(420), 3)  # NumColors
+        self.assertEqual(self.uint(452), 1)  # TotalPageCount
+        self.assertEqual(self.uint(452 + 8 * 4), 5)  # PrintQuality
+        self.assertEqual(self.header[1732:1748], b"iso_a4_210x297mm")
+        self.assertEqual(self.header[1748:1796], b"\0" * 48)
+
+    def test_bitmap_round_trip(self):
+        bitmap = self.page[raster_encoders.PWG_PAGE_HEADER_SIZE:]
+        self.assertEqual(decode_bitmap(bitmap, 300, 400, 3), self.image.tobytes())
+
+    def test_grayscale_document(self):
+        document = raster_encoders.encode_document(self.image, raster_encoders.MIME_PWG_RASTER, 300, color=False)
+        self.assertTrue(document.startswith(b"RaS2"))
+        self.assertTrue(raster_encoders.is_grayscale(document, raster_encoders.MIME_PWG_RASTER))
+        self.assertEqual(struct.unpack_from(">I", document, 4 + 392)[0], 300)  # BytesPerLine
+
+
+@unittest.skipUnless(raster_encoders.is_available(), "NumPy não instalado")
+class TestUrf(unittest.TestCase):
+    """Cabeçalhos URF"""
+
+    def test_document(self):
+        image = sample_page()
+        document = raster_encoders.encode_document(image, raster_encoders.MIME_URF, 600, color=True,
+                                                   duplex=True, tumble=False, quality=4)
+        self.assertEqual(document[:12], b"UNIRAST\0" + struct.pack(">I", 1))
+        header = document[12:12 + raster_encoders.URF_PAGE_HEADER_SIZE]
+        self.assertEqual(list(header[:4]), [24, raster_encoders.URF_COLORSPACE_SRGB, 3, 4])
+        self.assertEqual(struct.unpack_from(">III", header, 12), (300, 400, 600))
+        self.assertFalse(raster_encoders.is_grayscale(document, raster_encoders.MIME_URF))
+        bitmap = document[12 + raster_encoders.URF_PAGE_HEADER_SIZE:]
+        self.assertEqual(decode_bitmap(bitmap, 300, 400, 3), image.tobytes())
+
+
+class TestCapabilities(unittest.TestCase):
+    """Leitura das capacidades PWG/URF anunciadas"""
+
+    def test_urf_resolutions(self):
+        self.assertEqual(raster_encoders.urf_resolutions(["V1.4", "W8", "SRGB24", "RS600-300"]), [300, 600])
+        self.assertEqual(raster_encoders.urf_resolutions(["W8", "SRGB24"]), [])
+
+    def test_supported_color_spaces(self):
+        pwg = raster_encoders.MIME_PWG_RASTER
+        urf = raster_encoders.MIME_URF
+        self.assertTrue(raster_encoders.supports_color_space(pwg, ["sgray_8", "srgb_8"], color=True))
+        self.assertFalse(raster_encoders.supports_color_space(pwg, ["sgray_8"], color=True))
+        self.assertTrue(raster_encoders.supports_color_space(urf, ["W8", "RS300"], color=False))
+        self.assertFalse(raster_encoders.supports_color_space(urf, ["SRGB24", "RS300"], color=False))
+
+    def test_jpeg_components(self):
+        import io
+        for mode, components in (("L", 1), ("RGB", 3)):
+            buffer = io.BytesIO()
+            Image.new(mode, (16, 16)).save(buffer, format="JPEG")
+            self.assertEqual(raster_encoders._jpeg_components(buffer.getvalue()), components)
+        self.assertEqual(raster_encoders._jpeg_components(b"\xff\xd8\x00"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
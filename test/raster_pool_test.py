@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes do pool de rasterização (processos reais, retorno das páginas ao processo principal)
+"""
+
+import io
+import os
+import sys
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image
+
+from src.utils.raster_pool import PageEncoding, RasterProcessPool, split_ranges
+
+
+class SyntheticRasterizer:
+    """
+    Backend de teste: "rasteriza" páginas de cor fixa por número, sem Poppler
+
+    Precisa ficar no nível do módulo para ser enviado aos processos do pool (spawn).
+    """
+
+    name = "synthetic"
+
+    def __init__(self, fail_on_page: int = 0):
+        self.fail_on_page = fail_on_page
+
+    def single_threaded(self):
+        return self
+
+    def render(self, pdf_path, first_page, last_page, convert_kwargs, encoding, save=None, skip=()):
+        for page_num in range(first_page, last_page + 1):
+            if page_num == self.fail_on_page:
+                raise RuntimeError(f"falha simulada na página {page_num}")
+            image = Image.new("RGB", (120, 160), (page_num * 20 % 256, 40, 200))
+            yield page_num, encoding.encode(image, save)
+
+
+class TestSplitRanges(unittest.TestCase):
+    """Divisão das páginas em intervalos por processo"""
+
+    def test_contiguous_runs(self):
+        self.assertEqual(split_ranges([1, 2, 3, 4, 5, 6], 2), [(1, 3), (4, 6)])
+        self.assertEqual(split_ranges([5, 1, 2, 7], 4), [(1, 1), (2, 2), (5, 5), (7, 7)])
+        self.assertEqual(split_ranges([1, 2, 4, 5], 1), [(1, 2), (4, 5)])
+        self.assertEqual(split_ranges([], 3), [])
+
+
+class TestRasterProcessPool(unittest.TestCase):
+    """Rasterização de ponta a ponta em processos do pool"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = RasterProcessPool(workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_pages_come_back_from_workers(self):
+        pages = [1, 2, 3, 5, 6]
+        encoded = self.pool.rasterize("documento.pdf", pages, {}, PageEncoding(jpg_quality=90),
+                                      SyntheticRasterizer())
+        self.assertEqual(sorted(encoded), pages)
+        for page_num, data in encoded.items():
+            with Image.open(io.BytesIO(data)) as image:
+                self.assertEqual(image.format, "JPEG")
+                self.assertEqual(image.size, (120, 160))
+                red, _green, blue = image.convert("RGB").getpixel((60, 80))
+                self.assertAlmostEqual(red, page_num * 20 % 256, delta=6)
+                self.assertAlmostEqual(blue, 200, delta=6)
+
+    def test_worker_error_is_raised(self):
+        with self.assertRaises(RuntimeError):
+            self.pool.rasterize("documento.pdf", [1, 2, 3, 4], {}, PageEncoding(),
+                                SyntheticRasterizer(fail_on_page=4))
+        # O pool continua utilizável depois da falha
+        encoded = self.pool.rasterize("documento.pdf", [1], {}, PageEncoding(), SyntheticRasterizer())
+        self.assertEqual(list(encoded), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Testes da separação das páginas na saída dos rasterizadores (JPEG, PWG e PNM)
+"""
+
+import io
+import os
+import sys
+import random
+import unittest
+
+# Adiciona o diretório raiz ao path para importação
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageDraw
+
+from src.utils import raster_encoders
+from src.utils.rasterizers import (
+    GhostscriptRasterizer, RasterizerError, _JpegStreamSplitter, _PwgStreamSplitter, _read_pnm_frames,
+    _split_stream, _stream_process
+)
+
+
+def page_image(page_num: int) -> Image.Image:
+    image = Image.new("RGB", (160, 200), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((10, 10, 10 + page_num * 15, 60), fill=(page_num * 40 % 256, 90, 20))
+    draw.text((10, 100), f"pagina {page_num}", fill="black")
+    return image
+
+
+def feed_in_chunks(splitter, data: bytes, seed: int = 0) -> list:
+    """Alimenta o separador em pedaços de tamanho aleatório (como chegam do pipe)"""
+    rng = random.Random(seed)
+    pages = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, 700)
+        pages += splitter.feed(data[pos:pos + size])
+        pos += size
+    return pages
+
+
+class TestJpegStreamSplitter(unittest.TestCase):
+    """JPEGs concatenados (dispositivos jpeg/jpeggray)"""
+
+    def setUp(self):
+        self.pages = []
+        for page_num, kwargs in enumerate(({}, {"progressive": True}, {"optimize": True}), 1):
+            buffer = io.BytesIO()
+            image = page_image(page_num)
+            (image.convert("L") if page_num == 3 else image).save(buffer, format="JPEG", quality=90, **kwargs)
+            self.pages.append(buffer.getvalue())
+
+    def test_split_chunked_stream(self):
+        for seed in range(5):
+            splitter = _JpegStreamSplitter()
+            self.assertEqual(feed_in_chunks(splitter, b"".join(self.pages), seed), self.pages)
+            self.assertEqual(splitter.pending, 0)
+
+    def test_truncated_stream_is_pending(self):
+        splitter = _JpegStreamSplitter()
+        pages = splitter.feed(self.pages[0] + self.pages[1][:-10])
+        self.assertEqual(pages, [self.pages[0]])
+        self.assertGreater(splitter.pending, 0)
+
+    def test_garbage_is_rejected(self):
+        with self.assertRaises(RasterizerError):
+            _JpegStreamSplitter().feed(b"not a jpeg")
+
+
+@unittest.skipUnless(raster_encoders.is_available(), "NumPy não instalado")
+class TestPwgStreamSplitter(unittest.TestCase):
+    """Páginas do dispositivo pwgraster"""
+
+    def test_split_chunked_stream(self):
+        encoded = [raster_encoders.encode_pwg_page(page_image(page_num), 100, color=page_num != 2)
+                   for page_num in (1, 2, 3)]
+        stream = raster_encoders.pwg_file_header() + b"".join(encoded)
+        header_size = raster_encoders.PWG_PAGE_HEADER_SIZE
+        expected = [(page[:header_size], page[header_size:]) for page in encoded]
+
+        for seed in range(5):
+            splitter = _PwgStreamSplitter()
+            self.assertEqual(feed_in_chunks(splitter, stream, seed), expected)
+            self.assertEqual(splitter.pending, 0)
+
+    def test_missing_sync_word(self):
+        with self.assertRaises(RasterizerError):
+            _PwgStreamSplitter().feed(b"XXXX" + bytes(10))
+
+    def test_split_stream_reader(self):
+        page = raster_encoders.encode_pwg_page(page_image(1), 100, color=True)
+        stdout = io.BufferedReader(io.BytesIO(raster_encoders.pwg_file_header() + page))
+        read_pages = _split_stream(_PwgStreamSplitter())(stdout)
+        self.assertEqual(len(list(read_pages)), 1)
+
+
+class TestPnmFrames(unittest.TestCase):
+    """Quadros P5/P6 lidos direto do pipe (pdftoppm, ppmraw/pgmraw)"""
+
+    @staticmethod
+    def frame(image: Image.Image, comment: bool = False) -> bytes:
+        magic = b"P6" if image.mode == "RGB" else b"P5"
+        header = magic + b"\n" + (b"# gerado no teste\n" if comment else b"")
+        header += b"%d %d\n255\n" % image.size
+        return header + image.tobytes()
+
+    def test_frames(self):
+        images = [page_image(1), page_image(2), page_image(3).convert("L")]
+        stdout = io.BytesIO(b"".join(self.frame(image, comment=index == 1) for index, image in enumerate(images)))
+
+        frames = []
+        reader = _read_pnm_frames(stdout)
+        try:
+            while True:
+                mode, size, pixels = next(reader)
+                # O buffer é reaproveitado: copia antes de pedir o próximo quadro
+                frames.append((mode, size, bytes(pixels)))
+        except StopIteration as stop:
+            complete = stop.value
+
+        self.assertTrue(complete)
+        self.assertEqual(frames, [(image.mode, image.size, image.tobytes()) for image in images])
+
+    def test_truncated_frame(self):
+        data = self.frame(page_image(1))
+        reader = _read_pnm_frames(io.BytesIO(data + data[:-5]))
+        next(reader)
+        with self.assertRaises(StopIteration) as stop:
+            next(reader)
+        self.assertFalse(stop.exception.value)
+
+    def test_invalid_header(self):
+        with self.assertRaises(RasterizerError):
+            next(_read_pnm_frames(io.BytesIO(b"P3\n2 2\n255\n0 0 0")))
+
+
+
+class TestGhostscriptPages(unittest.TestCase):
+    """Uma página de saída por página do documento"""
+
+    def test_document_copies_are_ignored(self):
+        command = GhostscriptRasterizer("gs")._command("doc.ps", None, 150, ["-sDEVICE=jpeg"])
+        self.assertIn("-dNumCopies=1", command)
+        self.assertEqual(command[-2:], ["-f", "doc.ps"])
+        self.assertEqual(command[command.index("-c") + 1].split()[0], "/setpagedevice")
+
+    def test_extra_pages_are_not_produced(self):
+        buffer = io.BytesIO()
+        page_image(1).save(buffer, format="JPEG")
+        script = f"import sys; sys.stdout.buffer.write({buffer.getvalue()!r} * 3)"
+
+        pages = _stream_process([sys.executable, "-c", script], _split_stream(_JpegStreamSplitter()),
+                                expected_pages=2, timeout=30, tool="Teste")
+        self.assertEqual(next(pages), buffer.getvalue())
+        self.assertEqual(next(pages), buffer.getvalue())
+        with self.assertRaises(RasterizerError):
+            next(pages)
+
+
+if __name__ == "__main__":
+    unittest.main()